@@ -0,0 +1,32 @@
+"""inventory keyset indexes
+
+Revision ID: 4e1d7a9c2b60
+Revises: c5b297af3ba0
+Create Date: 2026-10-17 11:04:27.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1d7a9c2b60'
+down_revision: Union[str, Sequence[str], None] = 'c5b297af3ba0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_inventory_recent', 'inventory', [sa.text('coalesce(updated_at, created_at)'), 'id'], unique=False)
+    op.create_index('ix_inventory_shop_recent', 'inventory', ['shop_id', sa.text('coalesce(updated_at, created_at)'), 'id'], unique=False)
+    op.create_index('ix_inventory_shop_quantity', 'inventory', ['shop_id', 'quantity', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_shop_quantity', table_name='inventory')
+    op.drop_index('ix_inventory_shop_recent', table_name='inventory')
+    op.drop_index('ix_inventory_recent', table_name='inventory')
@@ -0,0 +1,48 @@
+"""media objects
+
+Revision ID: 6c1f8e3a0b47
+Revises: d2e8b5f16a93
+Create Date: 2026-10-17 18:05:41.392817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1f8e3a0b47'
+down_revision: Union[str, Sequence[str], None] = 'd2e8b5f16a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_objects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.Column('extension', sa.String(length=10), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('path')
+    )
+    op.create_index(op.f('ix_media_objects_id'), 'media_objects', ['id'], unique=False)
+    op.create_index(op.f('ix_media_objects_sha256'), 'media_objects', ['sha256'], unique=True)
+    op.create_index(
+        'ix_media_objects_unreferenced_last_used_at', 'media_objects', ['last_used_at'],
+        unique=False, postgresql_where=sa.text('ref_count = 0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_media_objects_unreferenced_last_used_at', table_name='media_objects')
+    op.drop_index(op.f('ix_media_objects_sha256'), table_name='media_objects')
+    op.drop_index(op.f('ix_media_objects_id'), table_name='media_objects')
+    op.drop_table('media_objects')
@@ -0,0 +1,34 @@
+"""sales date range indexes
+
+Revision ID: 9b3f06d41e27
+Revises: 4e1d7a9c2b60
+Create Date: 2026-10-17 12:21:08.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f06d41e27'
+down_revision: Union[str, Sequence[str], None] = '4e1d7a9c2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_sales_shop_id_sale_date', 'sales', ['shop_id', sa.text('sale_date DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_sales_status_sale_date', 'sales', ['status', sa.text('sale_date DESC'), sa.text('id DESC')], unique=False)
+    op.create_index(op.f('ix_returns_return_date'), 'returns', ['return_date'], unique=False)
+    op.create_index('ix_returns_status_return_date', 'returns', ['status', sa.text('return_date DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_returns_status_return_date', table_name='returns')
+    op.drop_index(op.f('ix_returns_return_date'), table_name='returns')
+    op.drop_index('ix_sales_status_sale_date', table_name='sales')
+    op.drop_index('ix_sales_shop_id_sale_date', table_name='sales')
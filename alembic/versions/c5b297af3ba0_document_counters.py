@@ -0,0 +1,54 @@
+"""document counters
+
+Revision ID: c5b297af3ba0
+Revises: 68749be2a2e3
+Create Date: 2026-10-17 09:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5b297af3ba0'
+down_revision: Union[str, Sequence[str], None] = '68749be2a2e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('period', sa.String(length=8), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name', 'period', name='uq_document_counters_name_period')
+    )
+    op.create_index(op.f('ix_document_counters_id'), 'document_counters', ['id'], unique=False)
+
+    # Continue numbering from what was already issued (INV-YYYYMMDD-XXXXXX / RET-YYYYMMDD-XXXX)
+    op.execute("""
+        INSERT INTO document_counters (name, period, value)
+        SELECT 'invoice', split_part(invoice_number, '-', 2), max(split_part(invoice_number, '-', 3)::int)
+        FROM sales
+        WHERE invoice_number ~ '^INV-[0-9]{8}-[0-9]+$'
+        GROUP BY split_part(invoice_number, '-', 2)
+    """)
+    op.execute("""
+        INSERT INTO document_counters (name, period, value)
+        SELECT 'return', split_part(return_number, '-', 2), max(split_part(return_number, '-', 3)::int)
+        FROM returns
+        WHERE return_number ~ '^RET-[0-9]{8}-[0-9]+$'
+        GROUP BY split_part(return_number, '-', 2)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_document_counters_id'), table_name='document_counters')
+    op.drop_table('document_counters')
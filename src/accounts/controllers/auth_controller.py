@@ -3,12 +3,12 @@ from datetime import timedelta
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
 from src.accounts.models import User, UserRole, Role
+from src.accounts.principal import Principal, principal_cache
 from src.accounts.schemas.user import UserCreate, UserLogin
-from src.accounts.security import hash_password, verify_password
+from src.accounts.security import hash_password_async, verify_password_async
 from src.accounts.jwt import (
     create_access_token,
     create_refresh_token,
@@ -16,9 +16,12 @@ from src.accounts.jwt import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_HOURS
 )
+from src.shop.models import ShopStaff
+from src.core.loading import LoadProfile, load_profile
 from src.core.app_logging import get_app_logger
+from src.core.metrics import LOGIN_SECONDS, timed
 
-logger = get_app_logger()
+logger = get_app_logger(__name__)
 
 
 class AuthController:
@@ -32,46 +35,46 @@ class AuthController:
     ) -> Optional[User]:
         """Authenticate a user by username and password"""
         try:
-            logger.info(f"Authenticating user: {username}")
+            logger.info("Authenticating user: %s", username)
             
             result = await db.execute(
                 select(User)
-                .options(selectinload(User.roles).selectinload(UserRole.role))
+                .options(*load_profile(User, LoadProfile.DETAIL))
                 .where(User.username == username)
             )
             user = result.scalar_one_or_none()
             
             if not user:
-                logger.warning(f"User not found: {username}")
+                logger.warning("User not found: %s", username)
                 return None
                 
-            if not verify_password(password, user.password_hash):
-                logger.warning(f"Invalid password for user: {username}")
+            if not await verify_password_async(password, user.password_hash):
+                logger.warning("Invalid password for user: %s", username)
                 return None
                 
             if not user.is_active:
-                logger.warning(f"Inactive user attempted login: {username}")
+                logger.warning("Inactive user attempted login: %s", username)
                 return None
                 
-            logger.info(f"Successfully authenticated user: {username}")
+            logger.info("Successfully authenticated user: %s", username)
             return user
             
         except Exception as e:
-            logger.error(f"Error authenticating user {username}: {str(e)}")
+            logger.error("Error authenticating user %s: %s", username, e)
             raise
 
     @staticmethod
     async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
         """Register a new user"""
         try:
-            logger.info(f"Registering new user: {user_data.username}")
+            logger.info("Registering new user: %s", user_data.username)
             
             # Check if username exists
             result = await db.execute(
                 select(User).where(User.username == user_data.username)
             )
             if result.scalar_one_or_none():
-                logger.warning(f"Username already exists: {user_data.username}")
+                logger.warning("Username already exists: %s", user_data.username)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Username already registered"
@@ -82,14 +85,14 @@ class AuthController:
                 select(User).where(User.email == user_data.email)
             )
             if result.scalar_one_or_none():
-                logger.warning(f"Email already exists: {user_data.email}")
+                logger.warning("Email already exists: %s", user_data.email)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email already registered"
                 )
 
             # Create user with hashed password
-            hashed_password = hash_password(user_data.password)
+            hashed_password = await hash_password_async(user_data.password)
             db_user = User(
                 username=user_data.username,
                 email=user_data.email,
@@ -103,7 +106,7 @@ class AuthController:
 
             # ✅ ADDED: Assign roles if role_names provided
             if hasattr(user_data, 'role_names') and user_data.role_names:
-                logger.info(f"Assigning roles to user {user_data.username}: {user_data.role_names}")
+                logger.info("Assigning roles to user %s: %s", user_data.username, user_data.role_names)
                 for role_name in user_data.role_names:
                     result = await db.execute(
                         select(Role).where(Role.name == role_name)
@@ -113,24 +116,24 @@ class AuthController:
                         user_role = UserRole(user_id=db_user.id, role_id=role.id)
                         db.add(user_role)
                     else:
-                        logger.warning(f"Role '{role_name}' not found during registration")
+                        logger.warning("Role '%s' not found during registration", role_name)
                 await db.commit()
 
             # Reload user with roles
             result = await db.execute(
                 select(User)
-                .options(selectinload(User.roles).selectinload(UserRole.role))
+                .options(*load_profile(User, LoadProfile.DETAIL))
                 .where(User.id == db_user.id)
             )
             db_user = result.scalar_one()
             
-            logger.info(f"Successfully registered user: {user_data.username} (ID: {db_user.id})")
+            logger.info("Successfully registered user: %s (ID: %s)", user_data.username, db_user.id)
             return db_user
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error registering user {user_data.username}: {str(e)}")
+            logger.error("Error registering user %s: %s", user_data.username, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -138,6 +141,7 @@ class AuthController:
             )
 
     @staticmethod
+    @timed(LOGIN_SECONDS)
     async def login(db: AsyncSession, credentials: UserLogin) -> dict:
         """Login user and return JWT tokens (access + refresh)"""
         try:
@@ -148,7 +152,7 @@ class AuthController:
             )
 
             if not user:
-                logger.warning(f"Failed login attempt for: {credentials.username}")
+                logger.warning("Failed login attempt for: %s", credentials.username)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Incorrect username or password",
@@ -176,7 +180,7 @@ class AuthController:
                 expires_delta=timedelta(hours=REFRESH_TOKEN_EXPIRE_HOURS)
             )
 
-            logger.info(f"User logged in successfully: {user.username}")
+            logger.info("User logged in successfully: %s", user.username)
             
             return {
                 "access_token": access_token,
@@ -188,7 +192,7 @@ class AuthController:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error during login for {credentials.username}: {str(e)}")
+            logger.error("Error during login for %s: %s", credentials.username, e)
             raise
 
     @staticmethod
@@ -221,13 +225,13 @@ class AuthController:
             # Verify user still exists and is active
             result = await db.execute(
                 select(User)
-                .options(selectinload(User.roles).selectinload(UserRole.role))
+                .options(*load_profile(User, LoadProfile.DETAIL))
                 .where(User.id == user_id)
             )
             user = result.scalar_one_or_none()
 
             if not user or not user.is_active:
-                logger.warning(f"Token refresh failed - user {user_id} not found or inactive")
+                logger.warning("Token refresh failed - user %s not found or inactive", user_id)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="User not found or inactive",
@@ -247,7 +251,7 @@ class AuthController:
                 expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
             )
 
-            logger.info(f"Access token refreshed for user ID: {user_id}")
+            logger.info("Access token refreshed for user ID: %s", user_id)
             
             return {
                 "access_token": access_token,
@@ -258,56 +262,85 @@ class AuthController:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error refreshing token: {str(e)}")
+            logger.error("Error refreshing token: %s", e)
             raise
 
     @staticmethod
     async def get_current_user_from_token(
         db: AsyncSession,
         token: str
-    ) -> User:
-        """Get current user from JWT token"""
+    ) -> Principal:
+        """
+        Get the authenticated principal from a JWT token.
+        Served from the principal cache when possible; a miss costs two light queries.
+        """
         try:
-            payload = decode_token(token)
-            if not payload:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Could not validate credentials",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+            principal = principal_cache.get(token)
+            if principal is None:
+                payload = decode_token(token)
+                if not payload:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Could not validate credentials",
+                        headers={"WWW-Authenticate": "Bearer"},
+                    )
 
-            user_id = int(payload.get("sub"))
-            if not user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token payload",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+                user_id = int(payload.get("sub"))
+                if not user_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Invalid token payload",
+                        headers={"WWW-Authenticate": "Bearer"},
+                    )
 
-            result = await db.execute(
-                select(User)
-                .options(selectinload(User.roles).selectinload(UserRole.role))
-                .where(User.id == user_id)
-            )
-            user = result.scalar_one_or_none()
+                principal = await AuthController.load_principal(db, user_id)
+                if not principal:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="User not found",
+                        headers={"WWW-Authenticate": "Bearer"},
+                    )
 
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User not found",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+                principal_cache.set(token, principal, payload.get("exp"))
 
-            if not user.is_active:
+            if not principal.is_active:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Inactive user"
                 )
 
-            return user
+            return principal
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error getting current user from token: {str(e)}")
+            logger.error("Error getting current user from token: %s", e)
             raise
+
+    @staticmethod
+    async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+        """Build a Principal from plain column queries (no ORM relationship loading)"""
+        result = await db.execute(
+            select(User.id, User.username, User.is_active, User.is_staff, Role.name)
+            .outerjoin(UserRole, UserRole.user_id == User.id)
+            .outerjoin(Role, Role.id == UserRole.role_id)
+            .where(User.id == user_id)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+
+        result = await db.execute(
+            select(ShopStaff.shop_id).where(ShopStaff.user_id == user_id)
+        )
+        shop_ids = tuple(sorted(result.scalars().all()))
+
+        first = rows[0]
+        return Principal(
+            id=first.id,
+            username=first.username,
+            is_active=first.is_active,
+            is_staff=first.is_staff,
+            role_names=tuple(sorted({row.name for row in rows if row.name})),
+            shop_ids=shop_ids
+        )
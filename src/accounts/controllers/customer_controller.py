@@ -1,7 +1,6 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
 from src.accounts.models import CustomerProfile, Address
@@ -11,6 +10,7 @@ from src.accounts.schemas.customer import (
     AddressCreate,
     AddressUpdate
 )
+from src.core.loading import LoadProfile, load_profile
 
 
 class CustomerController:
@@ -35,9 +35,8 @@ class CustomerController:
         profile = CustomerProfile(**profile_data.model_dump())
         db.add(profile)
         await db.commit()
-        await db.refresh(profile)
         
-        return profile
+        return await CustomerController._reload_profile(db, profile.id)
     
     @staticmethod
     async def get_customer_profile_by_user_id(
@@ -47,7 +46,7 @@ class CustomerController:
         """Get customer profile by user ID"""
         result = await db.execute(
             select(CustomerProfile)
-            .options(selectinload(CustomerProfile.preferred_address))
+            .options(*load_profile(CustomerProfile, LoadProfile.DETAIL))
             .where(CustomerProfile.user_id == user_id)
         )
         return result.scalar_one_or_none()
@@ -60,7 +59,7 @@ class CustomerController:
         """Get customer profile by ID"""
         result = await db.execute(
             select(CustomerProfile)
-            .options(selectinload(CustomerProfile.preferred_address))
+            .options(*load_profile(CustomerProfile, LoadProfile.DETAIL))
             .where(CustomerProfile.id == profile_id)
         )
         return result.scalar_one_or_none()
@@ -86,9 +85,19 @@ class CustomerController:
             setattr(profile, field, value)
         
         await db.commit()
-        await db.refresh(profile)
         
-        return profile
+        return await CustomerController._reload_profile(db, profile_id)
+
+    @staticmethod
+    async def _reload_profile(db: AsyncSession, profile_id: int) -> CustomerProfile:
+        """Re-read a profile after a write (preferred address may have changed)"""
+        result = await db.execute(
+            select(CustomerProfile)
+            .options(*load_profile(CustomerProfile, LoadProfile.DETAIL))
+            .where(CustomerProfile.id == profile_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
     
     @staticmethod
     async def create_address(db: AsyncSession, address_data: AddressCreate) -> Address:
@@ -2,15 +2,19 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
 from src.accounts.models import User, Role, UserRole
 from src.accounts.schemas.user import UserUpdate, RoleCreate
-from src.accounts.security import hash_password  # ✅ FIXED: Import from security
+from src.accounts.security import hash_password_async
+from src.accounts.principal import principal_cache
+from src.core.loading import LoadProfile, load_profile
+from src.core.pagination import CursorPage, Keyset
 from src.core.app_logging import get_app_logger
 
-logger = get_app_logger()
+logger = get_app_logger(__name__)
+
+USERS_BY_ID = Keyset("users:id", User.id)
 
 
 class UserController:
@@ -22,17 +26,17 @@ class UserController:
         try:
             result = await db.execute(
                 select(User)
-                .options(selectinload(User.roles).selectinload(UserRole.role))
+                .options(*load_profile(User, LoadProfile.DETAIL))
                 .where(User.id == user_id)
             )
             user = result.scalar_one_or_none()
             if user:
-                logger.info(f"Retrieved user ID: {user_id}")
+                logger.debug("Retrieved user ID: %s", user_id)
             else:
-                logger.warning(f"User ID {user_id} not found")
+                logger.warning("User ID %s not found", user_id)
             return user
         except Exception as e:
-            logger.error(f"Error getting user by ID {user_id}: {str(e)}")
+            logger.error("Error getting user by ID %s: %s", user_id, e)
             raise
 
     @staticmethod
@@ -41,17 +45,17 @@ class UserController:
         try:
             result = await db.execute(
                 select(User)
-                .options(selectinload(User.roles).selectinload(UserRole.role))
+                .options(*load_profile(User, LoadProfile.DETAIL))
                 .where(User.username == username)
             )
             user = result.scalar_one_or_none()
             if user:
-                logger.info(f"Retrieved user: {username}")
+                logger.debug("Retrieved user: %s", username)
             else:
-                logger.warning(f"User {username} not found")
+                logger.warning("User %s not found", username)
             return user
         except Exception as e:
-            logger.error(f"Error getting user by username {username}: {str(e)}")
+            logger.error("Error getting user by username %s: %s", username, e)
             raise
 
     @staticmethod
@@ -59,23 +63,28 @@ class UserController:
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-        is_active: Optional[bool] = None
-    ) -> List[User]:
-        """Get all users with pagination"""
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get all users with pagination (cursor or skip/limit, stable id order)"""
         try:
-            query = select(User).options(selectinload(User.roles).selectinload(UserRole.role))
+            query = select(User).options(*load_profile(User, LoadProfile.LIST))
 
             if is_active is not None:
                 query = query.where(User.is_active == is_active)
 
-            query = query.offset(skip).limit(limit)
+            query = USERS_BY_ID.apply(query, cursor, limit)
+            if not cursor:
+                query = query.offset(skip)
             result = await db.execute(query)
-            users = result.scalars().all()
+            users = USERS_BY_ID.page(result.scalars().all(), limit)
             
-            logger.info(f"Retrieved {len(users)} users (skip={skip}, limit={limit}, is_active={is_active})")
+            logger.debug("Retrieved %s users (skip=%s, limit=%s, is_active=%s)", len(users), skip, limit, is_active)
             return users
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error getting users: {str(e)}")
+            logger.error("Error getting users: %s", e)
             raise
 
     @staticmethod
@@ -86,11 +95,11 @@ class UserController:
     ) -> User:
         """Update a user"""
         try:
-            logger.info(f"Attempting to update user ID: {user_id}")
+            logger.info("Attempting to update user ID: %s", user_id)
             
             user = await UserController.get_user_by_id(db, user_id)
             if not user:
-                logger.error(f"User ID {user_id} not found for update")
+                logger.error("User ID %s not found for update", user_id)
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found"
@@ -98,15 +107,15 @@ class UserController:
 
             update_data = user_data.model_dump(exclude_unset=True)
             
-            # ✅ FIXED: Hash password if provided using hash_password from security.py
+            # Hash password if provided (on the hasher pool, off the event loop)
             if "password" in update_data:
-                logger.info(f"Hashing new password for user ID: {user_id}")
-                update_data["password_hash"] = hash_password(update_data.pop("password"))
+                logger.info("Hashing new password for user ID: %s", user_id)
+                update_data["password_hash"] = await hash_password_async(update_data.pop("password"))
 
             # Handle role_names if provided
             if "role_names" in update_data:
                 role_names = update_data.pop("role_names")
-                logger.info(f"Updating roles for user ID {user_id}: {role_names}")
+                logger.info("Updating roles for user ID %s: %s", user_id, role_names)
                 
                 # Remove existing roles
                 await db.execute(
@@ -125,30 +134,31 @@ class UserController:
                         new_user_role = UserRole(user_id=user_id, role_id=role.id)
                         db.add(new_user_role)
                     else:
-                        logger.warning(f"Role '{role_name}' not found, skipping")
+                        logger.warning("Role '%s' not found, skipping", role_name)
 
             # Update other fields
             for field, value in update_data.items():
                 setattr(user, field, value)
 
             await db.commit()
+            principal_cache.invalidate_user(user_id)
             await db.refresh(user)
             
             # Reload with roles
             result = await db.execute(
                 select(User)
-                .options(selectinload(User.roles).selectinload(UserRole.role))
+                .options(*load_profile(User, LoadProfile.DETAIL))
                 .where(User.id == user_id)
             )
             user = result.scalar_one()
             
-            logger.info(f"Successfully updated user ID: {user_id}")
+            logger.info("Successfully updated user ID: %s", user_id)
             return user
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating user ID {user_id}: {str(e)}")
+            logger.error("Error updating user ID %s: %s", user_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -159,11 +169,11 @@ class UserController:
     async def delete_user(db: AsyncSession, user_id: int) -> bool:
         """Delete a user"""
         try:
-            logger.info(f"Attempting to delete user ID: {user_id}")
+            logger.info("Attempting to delete user ID: %s", user_id)
             
             user = await UserController.get_user_by_id(db, user_id)
             if not user:
-                logger.error(f"User ID {user_id} not found for deletion")
+                logger.error("User ID %s not found for deletion", user_id)
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found"
@@ -171,14 +181,15 @@ class UserController:
 
             await db.delete(user)
             await db.commit()
+            principal_cache.invalidate_user(user_id)
             
-            logger.info(f"Successfully deleted user ID: {user_id}")
+            logger.info("Successfully deleted user ID: %s", user_id)
             return True
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error deleting user ID {user_id}: {str(e)}")
+            logger.error("Error deleting user ID %s: %s", user_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -189,7 +200,7 @@ class UserController:
     async def assign_role(db: AsyncSession, user_id: int, role_id: int) -> UserRole:
         """Assign a role to a user"""
         try:
-            logger.info(f"Assigning role ID {role_id} to user ID {user_id}")
+            logger.info("Assigning role ID %s to user ID %s", role_id, user_id)
             
             # Check if user exists
             user = await UserController.get_user_by_id(db, user_id)
@@ -225,15 +236,16 @@ class UserController:
             user_role = UserRole(user_id=user_id, role_id=role_id)
             db.add(user_role)
             await db.commit()
+            principal_cache.invalidate_user(user_id)
             await db.refresh(user_role)
             
-            logger.info(f"Successfully assigned role ID {role_id} to user ID {user_id}")
+            logger.info("Successfully assigned role ID %s to user ID %s", role_id, user_id)
             return user_role
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error assigning role {role_id} to user {user_id}: {str(e)}")
+            logger.error("Error assigning role %s to user %s: %s", role_id, user_id, e)
             await db.rollback()
             raise
 
@@ -241,7 +253,7 @@ class UserController:
     async def remove_role(db: AsyncSession, user_id: int, role_id: int) -> bool:
         """Remove a role from a user"""
         try:
-            logger.info(f"Removing role ID {role_id} from user ID {user_id}")
+            logger.info("Removing role ID %s from user ID %s", role_id, user_id)
             
             result = await db.execute(
                 select(UserRole).where(
@@ -258,14 +270,15 @@ class UserController:
 
             await db.delete(user_role)
             await db.commit()
+            principal_cache.invalidate_user(user_id)
             
-            logger.info(f"Successfully removed role ID {role_id} from user ID {user_id}")
+            logger.info("Successfully removed role ID %s from user ID %s", role_id, user_id)
             return True
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error removing role {role_id} from user {user_id}: {str(e)}")
+            logger.error("Error removing role %s from user %s: %s", role_id, user_id, e)
             await db.rollback()
             raise
 
@@ -273,7 +286,7 @@ class UserController:
     async def create_role(db: AsyncSession, role_data: RoleCreate) -> Role:
         """Create a new role"""
         try:
-            logger.info(f"Creating new role: {role_data.name}")
+            logger.info("Creating new role: %s", role_data.name)
             
             # Check if role name exists
             result = await db.execute(select(Role).where(Role.name == role_data.name))
@@ -288,13 +301,13 @@ class UserController:
             await db.commit()
             await db.refresh(role)
             
-            logger.info(f"Successfully created role: {role.name} (ID: {role.id})")
+            logger.info("Successfully created role: %s (ID: %s)", role.name, role.id)
             return role
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error creating role {role_data.name}: {str(e)}")
+            logger.error("Error creating role %s: %s", role_data.name, e)
             await db.rollback()
             raise
 
@@ -304,8 +317,8 @@ class UserController:
         try:
             result = await db.execute(select(Role))
             roles = result.scalars().all()
-            logger.info(f"Retrieved {len(roles)} roles")
+            logger.debug("Retrieved %s roles", len(roles))
             return roles
         except Exception as e:
-            logger.error(f"Error getting roles: {str(e)}")
+            logger.error("Error getting roles: %s", e)
             raise
@@ -1,8 +1,9 @@
 # src/accounts/models/customer.py
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 from sqlalchemy.sql import func
 from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY, LoadProfile
 
 class Address(Base):
     __tablename__ = "address"
@@ -17,7 +18,7 @@ class Address(Base):
     phone = Column(String(20), nullable=False)
     
     # Relationships - STRING REFERENCE
-    user = relationship("User", back_populates="addresses")
+    user = relationship("User", back_populates="addresses", lazy=DEFAULT_LAZY)
     
     def __repr__(self):
         return f"<Address(id={self.id}, city='{self.city}')>"
@@ -37,15 +38,20 @@ class CustomerProfile(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships - STRING REFERENCES
-    user = relationship("User", back_populates="customer_profile")
-    preferred_address = relationship("Address", foreign_keys=[preferred_address_id], post_update=True)
-    # Add to CustomerProfile class:
+    user = relationship("User", back_populates="customer_profile", lazy=DEFAULT_LAZY)
+    preferred_address = relationship("Address", foreign_keys=[preferred_address_id], post_update=True, lazy=DEFAULT_LAZY)
     sales = relationship(
         "Sale", 
         foreign_keys="Sale.customer_id", 
         back_populates="customer",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy=DEFAULT_LAZY
     )
 
+    # CustomerProfileResponse embeds the preferred address
+    __load_profiles__ = {
+        LoadProfile.DETAIL: lambda: (selectinload(CustomerProfile.preferred_address),),
+    }
+
     def __repr__(self):
         return f"<CustomerProfile(id={self.id}, full_name='{self.full_name}')>"
@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 from sqlalchemy.sql import func
 from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY, LoadProfile
 
 
 class User(Base):
@@ -18,28 +19,36 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships - Use string references
-    roles = relationship("UserRole", back_populates="user", cascade="all, delete-orphan")
-    customer_profile = relationship("CustomerProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
-    addresses = relationship("Address", back_populates="user", cascade="all, delete-orphan")
-    # Add to User class:
+    roles = relationship("UserRole", back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
+    customer_profile = relationship("CustomerProfile", back_populates="user", uselist=False, cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
+    addresses = relationship("Address", back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
     shop_staff = relationship(
         "ShopStaff", 
         back_populates="user", 
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy=DEFAULT_LAZY
     )
     sales = relationship(
         "Sale", 
         foreign_keys="Sale.staff_id", 
         back_populates="staff",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy=DEFAULT_LAZY
     )
     returns_processed = relationship(
         "Return", 
         foreign_keys="Return.processed_by",
         back_populates="processor",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy=DEFAULT_LAZY
     )
+
+    # UserResponse renders role names; login needs them for the token
+    __load_profiles__ = {
+        LoadProfile.LIST: lambda: (selectinload(User.roles).selectinload(UserRole.role),),
+        LoadProfile.DETAIL: lambda: (selectinload(User.roles).selectinload(UserRole.role),),
+    }
     
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}')>"
@@ -54,7 +63,7 @@ class Role(Base):
     description = Column(String(255))
     
     # Relationships
-    user_roles = relationship("UserRole", back_populates="role", cascade="all, delete-orphan")
+    user_roles = relationship("UserRole", back_populates="role", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
     
     def __repr__(self):
         return f"<Role(id={self.id}, name='{self.name}')>"
@@ -69,8 +78,8 @@ class UserRole(Base):
     role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="roles")
-    role = relationship("Role", back_populates="user_roles")
+    user = relationship("User", back_populates="roles", lazy=DEFAULT_LAZY)
+    role = relationship("Role", back_populates="user_roles", lazy=DEFAULT_LAZY)
     
     def __repr__(self):
         return f"<UserRole(user_id={self.user_id}, role_id={self.role_id})>"
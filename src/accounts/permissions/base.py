@@ -1,6 +1,7 @@
-from typing import List
+from typing import List, Union
 
 from src.accounts.models import User
+from src.accounts.principal import Principal
 from src.accounts.permissions.hierarchy import RoleHierarchy
 
 
@@ -10,14 +11,16 @@ class RoleChecker:
     """
     
     @staticmethod
-    def get_user_roles(user: User) -> List[str]:
-        """Extract role names from user's roles relationship."""
+    def get_user_roles(user: Union[Principal, User]) -> List[str]:
+        """Extract role names from a Principal or from the user's roles relationship."""
+        if isinstance(user, Principal):
+            return list(user.role_names)
         if not user.roles:
             return []
         return [user_role.role.name for user_role in user.roles]
     
     @staticmethod
-    def has_role_or_higher(user: User, required_role: str) -> bool:
+    def has_role_or_higher(user: Union[Principal, User], required_role: str) -> bool:
         """
         Check if user has the required role or any higher role in hierarchy.
         
@@ -30,7 +33,7 @@ class RoleChecker:
         return RoleHierarchy.has_sufficient_role(user_roles, required_role)
     
     @staticmethod
-    def get_highest_role(user: User) -> str:
+    def get_highest_role(user: Union[Principal, User]) -> str:
         """Get user's highest role in the hierarchy"""
         user_roles = RoleChecker.get_user_roles(user)
         highest = RoleHierarchy.get_user_highest_role(user_roles)
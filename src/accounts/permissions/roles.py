@@ -1,5 +1,5 @@
 from fastapi import Depends, HTTPException, status
-from src.accounts.models import User
+from src.accounts.principal import Principal
 from src.accounts.dependencies import get_current_active_user
 from src.accounts.permissions.base import RoleChecker
 
@@ -9,10 +9,10 @@ class IsSuperAdmin:
     SuperAdmin permission - highest level (Level 4).
     Only users with SuperAdmin role can access.
     
-    Usage: user: User = Depends(IsSuperAdmin())
+    Usage: user: Principal = Depends(IsSuperAdmin())
     """
     
-    def __call__(self, current_user: User = Depends(get_current_active_user)) -> User:
+    def __call__(self, current_user: Principal = Depends(get_current_active_user)) -> Principal:
         if not RoleChecker.has_role_or_higher(current_user, "superadmin"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -26,10 +26,10 @@ class IsAdmin:
     Admin permission (Level 3).
     Users with Admin or SuperAdmin role can access.
     
-    Usage: user: User = Depends(IsAdmin())
+    Usage: user: Principal = Depends(IsAdmin())
     """
     
-    def __call__(self, current_user: User = Depends(get_current_active_user)) -> User:
+    def __call__(self, current_user: Principal = Depends(get_current_active_user)) -> Principal:
         if not RoleChecker.has_role_or_higher(current_user, "admin"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -43,10 +43,10 @@ class IsManager:
     Manager permission (Level 2).
     Users with Manager, Admin, or SuperAdmin role can access.
     
-    Usage: user: User = Depends(IsManager())
+    Usage: user: Principal = Depends(IsManager())
     """
     
-    def __call__(self, current_user: User = Depends(get_current_active_user)) -> User:
+    def __call__(self, current_user: Principal = Depends(get_current_active_user)) -> Principal:
         if not RoleChecker.has_role_or_higher(current_user, "manager"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -60,10 +60,10 @@ class IsStaff:
     Staff permission - lowest level (Level 1).
     Any user with Staff, Manager, Admin, or SuperAdmin role can access.
     
-    Usage: user: User = Depends(IsStaff())
+    Usage: user: Principal = Depends(IsStaff())
     """
     
-    def __call__(self, current_user: User = Depends(get_current_active_user)) -> User:
+    def __call__(self, current_user: Principal = Depends(get_current_active_user)) -> Principal:
         if not RoleChecker.has_role_or_higher(current_user, "staff"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
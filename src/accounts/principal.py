@@ -0,0 +1,112 @@
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from src.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Compact, immutable view of the authenticated user.
+
+    This is what `get_current_user` hands to routes and permission checks, so
+    authorization never needs to touch the ORM `User` (and its eager relationships).
+    Routes that need the full user load it explicitly via `UserController`.
+    """
+    id: int
+    username: str
+    is_active: bool
+    is_staff: bool
+    role_names: Tuple[str, ...] = ()
+    shop_ids: Tuple[int, ...] = ()
+
+    def has_role(self, role_name: str) -> bool:
+        return role_name in self.role_names
+
+    def works_at(self, shop_id: int) -> bool:
+        return shop_id in self.shop_ids
+
+
+class PrincipalCache:
+    """
+    Per-process TTL + LRU cache of principals keyed by access token.
+
+    Entries expire after `ttl` seconds or when the token itself expires, whichever
+    comes first. Controllers that change a user's roles, status or shop assignments
+    call `invalidate_user()`; other workers pick the change up within `ttl`.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Principal]:
+        if self.ttl <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                self._remove(token)
+                return None
+
+            self._entries.move_to_end(token)
+            return principal
+
+    def set(self, token: str, principal: Principal, token_exp: Optional[float] = None) -> None:
+        if self.ttl <= 0:
+            return
+
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, principal)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token belonging to a user"""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, token: str) -> None:
+        _, principal = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES
+)
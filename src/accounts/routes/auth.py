@@ -4,8 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.db import get_db
 from src.accounts.schemas.user import UserCreate, UserLogin, UserResponse
 from src.accounts.controllers.auth_controller import AuthController
+from src.accounts.controllers.user_controller import UserController
 from src.accounts.dependencies import get_current_user
-from src.accounts.models import User
+from src.accounts.principal import Principal
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import HTTPException
 
@@ -59,9 +60,18 @@ async def refresh_token(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """Get current authenticated user details"""
-    return current_user
+    user = await UserController.get_user_by_id(db, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user
 
 @router.post("/token", summary="Login with username/password (OAuth2)")
 async def login_for_access_token(
@@ -12,7 +12,7 @@ from src.accounts.schemas.customer import (
     AddressResponse
 )
 from src.accounts.controllers.customer_controller import CustomerController
-from src.accounts.models import User
+from src.accounts.principal import Principal
 from src.accounts.permissions.roles import IsAdmin, IsManager, IsStaff
 
 router = APIRouter()
@@ -22,7 +22,7 @@ router = APIRouter()
 async def create_customer_profile(
     profile_data: CustomerProfileCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Create a customer profile"""
     profile = await CustomerController.create_customer_profile(db, profile_data)
@@ -33,7 +33,7 @@ async def create_customer_profile(
 async def get_customer_profile_by_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Get customer profile by user ID"""
     # Users can view their own profile, managers+ can view all
@@ -58,7 +58,7 @@ async def get_customer_profile_by_user(
 async def get_customer_profile(
     profile_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """Get customer profile by ID (Manager+ only)"""
     profile = await CustomerController.get_customer_profile_by_id(db, profile_id)
@@ -75,7 +75,7 @@ async def update_customer_profile(
     profile_id: int,
     profile_data: CustomerProfileUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Update a customer profile"""
     profile = await CustomerController.update_customer_profile(db, profile_id, profile_data)
@@ -86,7 +86,7 @@ async def update_customer_profile(
 async def create_address(
     address_data: AddressCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Create an address"""
     # Users can only create addresses for themselves unless manager+
@@ -106,7 +106,7 @@ async def create_address(
 async def get_user_addresses(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Get all addresses for a user"""
     # Users can view their own addresses, managers+ can view all
@@ -126,7 +126,7 @@ async def get_user_addresses(
 async def get_address(
     address_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Get an address by ID"""
     address = await CustomerController.get_address_by_id(db, address_id)
@@ -143,7 +143,7 @@ async def update_address(
     address_id: int,
     address_data: AddressUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Update an address"""
     address = await CustomerController.update_address(db, address_id, address_data)
@@ -154,7 +154,7 @@ async def update_address(
 async def delete_address(
     address_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsAdmin())
+    current_user: Principal = Depends(IsAdmin())
 ):
     """Delete an address (Admin+ only)"""
     await CustomerController.delete_address(db, address_id)
@@ -1,11 +1,12 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.db import get_db
+from src.core.pagination import set_next_cursor
 from src.accounts.schemas.user import UserResponse, UserUpdate, RoleCreate, RoleResponse
 from src.accounts.controllers.user_controller import UserController
-from src.accounts.models.user import User
+from src.accounts.principal import Principal
 from src.accounts.permissions.roles import IsAdmin, IsStaff, IsSuperAdmin
 
 router = APIRouter()
@@ -13,14 +14,19 @@ router = APIRouter()
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     is_active: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsAdmin())
+    current_user: Principal = Depends(IsAdmin())
 ):
     """Get all users with pagination (Admin+ only)"""
-    users = await UserController.get_users(db, skip=skip, limit=limit, is_active=is_active)
+    users = await UserController.get_users(
+        db, skip=skip, limit=limit, is_active=is_active, cursor=cursor
+    )
+    set_next_cursor(response, users)
     return users
 
 
@@ -28,7 +34,7 @@ async def get_users(
 async def create_role(
     role_data: RoleCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsSuperAdmin())
+    current_user: Principal = Depends(IsSuperAdmin())
 ):
     """Create a new role (SuperAdmin only)"""
     role = await UserController.create_role(db, role_data)
@@ -38,7 +44,7 @@ async def create_role(
 @router.get("/roles", response_model=List[RoleResponse])
 async def get_roles(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Get all roles"""
     roles = await UserController.get_roles(db)
@@ -49,7 +55,7 @@ async def get_roles(
 async def get_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Get a user by ID"""
     # Users can only view their own profile unless they're admin
@@ -76,7 +82,7 @@ async def update_user(
     user_id: int,
     user_data: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """Update a user"""
     # Users can only update their own profile unless they're admin
@@ -96,7 +102,7 @@ async def update_user(
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsAdmin())
+    current_user: Principal = Depends(IsAdmin())
 ):
     """Delete a user (Admin+ only)"""
     await UserController.delete_user(db, user_id)
@@ -108,7 +114,7 @@ async def assign_role_to_user(
     user_id: int,
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsSuperAdmin())
+    current_user: Principal = Depends(IsSuperAdmin())
 ):
     """Assign a role to a user (SuperAdmin only)"""
     user_role = await UserController.assign_role(db, user_id, role_id)
@@ -120,7 +126,7 @@ async def remove_role_from_user(
     user_id: int,
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsSuperAdmin())
+    current_user: Principal = Depends(IsSuperAdmin())
 ):
     """Remove a role from a user (SuperAdmin only)"""
     await UserController.remove_role(db, user_id, role_id)
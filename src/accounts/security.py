@@ -1,24 +1,35 @@
 # src/accounts/security.py
+import asyncio
 import hashlib
+import hmac
 import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from src.core.config import settings
+from src.core.metrics import PASSWORD_HASH_REJECTED, PASSWORD_HASH_SECONDS, PASSWORD_HASH_WAIT_SECONDS
+
+PBKDF2_ITERATIONS = 600_000  # OWASP 2025 recommendation (increased from 100k)
+
+
+def _pbkdf2(password: str, salt: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
 
 
 def hash_password(password: str) -> str:
     """
     Hash password with PBKDF2-HMAC-SHA256 using a unique random salt.
     Returns: salt$hash (both in hex format)
+
+    Blocking - async code should use `hash_password_async`.
     """
     # Generate unique 16-byte salt using cryptographically secure RNG
     salt = secrets.token_bytes(16)
-    
-    # Hash password with 600,000 iterations (OWASP 2025 recommendation)
-    hashed = hashlib.pbkdf2_hmac(
-        "sha256",
-        password.encode(),
-        salt,
-        600_000  # Increased from 100k for 2025 security standards
-    )
-    
+    hashed = _pbkdf2(password, salt)
+
     # Store salt and hash together
     return f"{salt.hex()}${hashed.hex()}"
 
@@ -27,19 +38,136 @@ def verify_password(password: str, stored_hash: str) -> bool:
     """
     Verify password against stored hash.
     stored_hash format: salt$hash
+
+    Blocking - async code should use `verify_password_async`.
     """
     try:
         salt_hex, hash_hex = stored_hash.split("$")
         salt = bytes.fromhex(salt_hex)
-        
-        # Hash provided password with stored salt
-        hashed = hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode(),
-            salt,
-            600_000
-        )
-        
-        return hashed.hex() == hash_hex
+        expected = bytes.fromhex(hash_hex)
+
+        # Hash provided password with stored salt, compare in constant time
+        return hmac.compare_digest(_pbkdf2(password, salt), expected)
     except (ValueError, AttributeError):
         return False
+
+
+# ==================== ASYNC HASHING SERVICE ====================
+
+class PasswordHasher:
+    """
+    Runs PBKDF2 on a dedicated thread pool so logins don't block the event loop.
+
+    hashlib releases the GIL while deriving keys, so `workers` threads hash in
+    parallel. At most `max_queue` calls may wait for a free worker; beyond that
+    callers get a 503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+        # Metrics (seconds)
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker"""
+        return max(0, self._pending - self.workers)
+
+    async def run(self, func, *args):
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            PASSWORD_HASH_REJECTED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted = time.perf_counter()
+        timings = {}
+
+        def timed_call():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                timings["wait"] = started - submitted
+                timings["hash"] = time.perf_counter() - started
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, timed_call)
+        finally:
+            self._pending -= 1
+            if timings:
+                self._record(timings["wait"], timings["hash"])
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, password: str, stored_hash: str) -> bool:
+        return await self.run(verify_password, password, stored_hash)
+
+    def _record(self, wait: float, hash_time: float) -> None:
+        self.completed += 1
+        self.queue_wait_total += wait
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+        self.hash_time_total += hash_time
+        self.hash_time_max = max(self.hash_time_max, hash_time)
+        PASSWORD_HASH_WAIT_SECONDS.observe(wait)
+        PASSWORD_HASH_SECONDS.observe(hash_time)
+
+    def stats(self) -> dict:
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self._pending, self.workers),
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_avg": self.queue_wait_total / completed,
+            "queue_wait_max": self.queue_wait_max,
+            "hash_time_avg": self.hash_time_total / completed,
+            "hash_time_max": self.hash_time_max,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hasher pool"""
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(password: str, stored_hash: str) -> bool:
+    """Verify a password on the hasher pool"""
+    return await password_hasher.verify(password, stored_hash)
@@ -0,0 +1,144 @@
+"""
+Structured access log.
+
+`AccessLogMiddleware` emits one JSON record per request on the "app.access"
+logger:
+
+    {"method": "POST", "route": "/api/sales/", "status": 201, "duration_ms": 41.2,
+     "db_ms": 12.9, "db_statements": 9, "db_rows": 14, "pool_wait_ms": 0.1}
+
+The DB figures come from cursor events on instrumented engines, accumulated
+into a per-request `RequestStats` held in a context variable, and from
+`TimedAsyncAdaptedQueuePool`, which times connection checkouts.
+
+Requests slower than ACCESS_LOG_SLOW_MS are always logged (as WARNING); the
+rest are sampled at ACCESS_LOG_SAMPLE_RATE.
+"""
+import json
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.app_logging import get_app_logger
+from src.core.metrics import DB_POOL_WAIT_SECONDS
+
+logger = get_app_logger("access")
+
+
+@dataclass
+class RequestStats:
+    """Database work done on behalf of one request (times in seconds)"""
+    statements: int = 0
+    db_time: float = 0.0
+    rows: int = 0
+    pool_wait: float = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+# ==================== ENGINE INSTRUMENTATION ====================
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements, time and rows on `engine` (pass `async_engine.sync_engine`)"""
+    if getattr(engine, "_access_log_instrumented", False):
+        return
+    engine._access_log_instrumented = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        stats = _request_stats.get()
+        if stats is None:
+            return
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - started
+        # -1 when the driver doesn't report it (e.g. SQLite SELECTs)
+        if cursor.rowcount and cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that charges the time spent waiting for a connection to the current request"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait = time.perf_counter() - started
+            DB_POOL_WAIT_SECONDS.observe(wait)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.pool_wait += wait
+
+
+# ==================== MIDDLEWARE ====================
+
+class AccessLogMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware, so the context variable reaches the endpoint)"""
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_ms: float = 500.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_stats.reset(token)
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.log(scope, status_code, duration_ms, stats)
+
+    def log(self, scope, status_code: int, duration_ms: float, stats: RequestStats) -> None:
+        slow = duration_ms >= self.slow_ms
+        if not slow and random.random() >= self.sample_rate:
+            return
+
+        # Route template, so /api/products/1 and /api/products/2 aggregate together
+        route = scope.get("route")
+        record = {
+            "method": scope["method"],
+            "route": getattr(route, "path", None) or scope["path"],
+            "status": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "db_ms": round(stats.db_time * 1000, 2),
+            "db_statements": stats.statements,
+            "db_rows": stats.rows,
+            "pool_wait_ms": round(stats.pool_wait * 1000, 2),
+            "slow": slow,
+        }
+        if slow:
+            logger.warning("%s", json.dumps(record))
+        else:
+            logger.info("%s", json.dumps(record))
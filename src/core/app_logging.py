@@ -1,32 +1,124 @@
+"""
+Application logging.
+
+Handlers are attached once per logger tree. Callers log into a QueueHandler
+(a cheap, non-blocking put) and a QueueListener thread formats the records
+and writes them to the rotating file and stdout, so disk I/O never happens on
+the event loop.
+
+Modules get child loggers (`get_app_logger(__name__)` -> "app.shop.controllers...")
+that propagate to "app". Levels come from LOG_LEVEL, with per-logger
+overrides in LOG_LEVELS, e.g. LOG_LEVELS='{"app.shop.controllers": "DEBUG"}'.
+
+Log with %-style arguments (`logger.debug("Fetched %s", product_id)`) so
+messages that are filtered out are never formatted.
+"""
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+from src.core.config import settings
 
 
 LOG_FILE = "logs/app.log"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+_pipelines: Dict[str, "QueueLogging"] = {}
+
+
+class QueueLogging:
+    """A root logger whose records are written by a background listener thread"""
+
+    def __init__(self, name: str, log_file: str):
+        self.name = name
+        self.log_file = log_file
+        self.handler = QueueHandler(queue.SimpleQueue())
+        self.listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        os.makedirs(os.path.dirname(self.log_file) or ".", exist_ok=True)
+        formatter = logging.Formatter(LOG_FORMAT)
+
+        file_handler = RotatingFileHandler(self.log_file, maxBytes=5*1024*1024, backupCount=3)
+        file_handler.setFormatter(formatter)
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+
+        self.listener = QueueListener(
+            self.handler.queue, file_handler, stream_handler, respect_handler_level=True
+        )
+        self.listener.start()
 
+    def stop(self) -> None:
+        """Flush queued records and close the files"""
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
 
-def get_app_logger():
-    # Rotating file handler
-    handler = RotatingFileHandler(LOG_FILE, maxBytes=5*1024*1024, backupCount=3)
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
-    handler.setFormatter(formatter)
+    def restart_in_child(self) -> None:
+        # A forked worker (Celery prefork, gunicorn) inherits the queue but not
+        # the listener thread; give it its own queue and thread
+        self.listener = None
+        self.handler.queue = queue.SimpleQueue()
+        self.start()
 
-    logger = logging.getLogger("app")  # Named logger for app
-    logger.setLevel(logging.INFO)  # ✅ Keep INFO for your application
-    logger.addHandler(handler)
 
-    # Also log to stdout
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+def setup_queue_logging(name: str, log_file: str) -> logging.Logger:
+    """Configure logger `name` once: queue handler, listener thread, levels"""
+    logger = logging.getLogger(name)
+    if name in _pipelines:
+        return logger
 
-    # ✅ Silence SQLAlchemy INFO logs (only warnings/errors)
-    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
-    logging.getLogger('sqlalchemy.pool').setLevel(logging.WARNING)
-    logging.getLogger('sqlalchemy.orm').setLevel(logging.WARNING)
-    
-    # ✅ Optional: Keep Uvicorn access logs at INFO (or change to WARNING)
-    # logging.getLogger('uvicorn.access').setLevel(logging.WARNING)
+    pipeline = QueueLogging(name, log_file)
+    pipeline.start()
+    _pipelines[name] = pipeline
 
+    logger.addHandler(pipeline.handler)
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    logger.propagate = False
+    _apply_level_overrides()
     return logger
+
+
+def stop_logging() -> None:
+    """Flush and stop every listener (app shutdown)"""
+    for pipeline in _pipelines.values():
+        pipeline.stop()
+
+
+def _restart_after_fork() -> None:
+    for pipeline in _pipelines.values():
+        if pipeline.listener is not None:
+            pipeline.restart_in_child()
+
+
+def _apply_level_overrides() -> None:
+    # ✅ Silence SQLAlchemy INFO logs (only warnings/errors) unless overridden
+    for name in ("sqlalchemy.engine", "sqlalchemy.pool", "sqlalchemy.orm"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def get_app_logger(name: Optional[str] = None) -> logging.Logger:
+    """
+    The "app" logger, or its child for module `name` (pass `__name__`).
+    Handlers are only configured on the first call.
+    """
+    setup_queue_logging("app", LOG_FILE)
+    if not name:
+        return logging.getLogger("app")
+    return logging.getLogger(f"app.{name.removeprefix('src.')}")
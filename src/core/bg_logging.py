@@ -1,21 +1,17 @@
 import logging
-from logging.handlers import RotatingFileHandler
-import sys
+from typing import Optional
 
-LOG_FILE = "logs/bg.log"
-
-def get_bg_logger():
-    handler = RotatingFileHandler(LOG_FILE, maxBytes=5*1024*1024, backupCount=3)
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
-    handler.setFormatter(formatter)
+from src.core.app_logging import setup_queue_logging
 
-    logger = logging.getLogger("bg")  # Named logger for background tasks
-    logger.setLevel(logging.INFO)
-    logger.addHandler(handler)
+LOG_FILE = "logs/bg.log"
 
-    # Also log to stdout
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
 
-    return logger
+def get_bg_logger(name: Optional[str] = None) -> logging.Logger:
+    """
+    The "bg" logger for background tasks, or its child for module `name`.
+    Same queue pipeline as the app logger, writing to its own file.
+    """
+    setup_queue_logging("bg", LOG_FILE)
+    if not name:
+        return logging.getLogger("bg")
+    return logging.getLogger(f"bg.{name.removeprefix('src.')}")
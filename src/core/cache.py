@@ -0,0 +1,251 @@
+"""
+Two-tier read cache: an in-process LRU in front of a shared Redis.
+
+Values are JSON documents. Invalidation is by version stamp rather than by
+deleting keys: a cached key embeds the current version of every scope it
+depends on, and a write bumps the versions of the scopes it touched, so
+stale entries are simply never looked up again (and age out by TTL).
+
+    versions = await cache.versions("products", f"product:{product_id}")
+    key = f"product:{product_id}:{versions}"
+    data = await cache.get(key)
+    ...
+    await cache.bump(f"product:{product_id}")   # after the write commits
+
+Versions live in Redis so every worker sees a bump; each worker keeps them
+locally for `version_ttl` seconds, so other workers pick a write up within
+that window while hot keys stay memory hits. If Redis is unreachable the
+cache keeps working on the local tier alone and retries Redis after
+`retry_after` seconds.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.core.app_logging import get_app_logger
+
+logger = get_app_logger(__name__)
+
+
+class LocalCache:
+    """Per-process TTL + LRU map"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TwoTierCache:
+    """Local LRU + Redis, with version-stamped keys"""
+
+    def __init__(
+        self,
+        namespace: str,
+        redis_url: Optional[str],
+        ttl: float,
+        local_ttl: float,
+        version_ttl: float,
+        max_entries: int,
+        retry_after: float = 30
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+        self.retry_after = retry_after
+        self.local = LocalCache(local_ttl, max_entries)
+        self._versions = LocalCache(version_ttl, max_entries)
+        self._local_counters: Dict[str, int] = {}
+        self._redis = (
+            aioredis.from_url(redis_url, socket_timeout=0.25, socket_connect_timeout=0.25)
+            if redis_url else None
+        )
+        self._redis_down_until = 0.0
+
+    # ==================== REDIS ====================
+
+    @property
+    def redis(self) -> Optional[aioredis.Redis]:
+        if self._redis is None or time.monotonic() < self._redis_down_until:
+            return None
+        return self._redis
+
+    def _redis_failed(self, e: Exception) -> None:
+        if self._redis_down_until <= time.monotonic():
+            logger.warning("Cache %s: Redis unavailable, using local tier only (%s)", self.namespace, e)
+        self._redis_down_until = time.monotonic() + self.retry_after
+
+    def disable_redis(self) -> None:
+        """Local tier only (tests, or deployments without Redis)"""
+        self._redis = None
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    # ==================== VERSIONS ====================
+
+    async def versions(self, *scopes: str) -> str:
+        """Current versions of `scopes`, joined for embedding in a key"""
+        values = await self.version_map(*scopes)
+        return ".".join(str(values[scope]) for scope in scopes)
+
+    async def version_map(self, *scopes: str) -> Dict[str, int]:
+        """Current version of each scope; the ones not held locally come from one MGET"""
+        values: Dict[str, int] = {}
+        missing = []
+        for scope in scopes:
+            version = self._versions.get(scope)
+            if version is None:
+                missing.append(scope)
+            else:
+                values[scope] = version
+
+        if missing:
+            fetched = await self._fetch_versions(missing)
+            for scope in missing:
+                values[scope] = fetched[scope]
+                self._versions.set(scope, fetched[scope])
+                self._local_counters[scope] = max(self._local_counters.get(scope, 0), fetched[scope])
+
+        return values
+
+    async def _fetch_versions(self, scopes) -> Dict[str, int]:
+        redis = self.redis
+        if redis is not None:
+            try:
+                raw = await redis.mget([self._key(f"v:{scope}") for scope in scopes])
+                return {scope: int(value or 0) for scope, value in zip(scopes, raw)}
+            except (RedisError, OSError, asyncio.TimeoutError) as e:
+                self._redis_failed(e)
+        return {scope: self._local_counters.get(scope, 0) for scope in scopes}
+
+    async def bump(self, *scopes: str) -> None:
+        """Invalidate everything cached under `scopes` (call after the write commits)"""
+        redis = self.redis
+        for scope in scopes:
+            self._local_counters[scope] = self._local_counters.get(scope, 0) + 1
+            version = self._local_counters[scope]
+            if redis is not None:
+                try:
+                    version = await redis.incr(self._key(f"v:{scope}"))
+                except (RedisError, OSError, asyncio.TimeoutError) as e:
+                    self._redis_failed(e)
+                    redis = None
+            # A version this worker has seen must never be reused locally
+            self._local_counters[scope] = max(self._local_counters[scope], version)
+            self._versions.set(scope, version)
+
+    # ==================== VALUES ====================
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        redis = self.redis
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(self._key(key))
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self._redis_failed(e)
+            return None
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values of `keys` (misses are absent); the local misses come from one MGET"""
+        values: Dict[str, Any] = {}
+        remote = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is None:
+                remote.append(key)
+            else:
+                values[key] = value
+
+        redis = self.redis
+        if not remote or redis is None:
+            return values
+        try:
+            raw = await redis.mget([self._key(key) for key in remote])
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self._redis_failed(e)
+            return values
+
+        for key, item in zip(remote, raw):
+            if item is not None:
+                values[key] = json.loads(item)
+                self.local.set(key, values[key])
+        return values
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serialisable value in both tiers"""
+        self.local.set(key, value)
+        redis = self.redis
+        if redis is None:
+            return
+        try:
+            await redis.set(self._key(key), json.dumps(value), ex=int(self.ttl))
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self._redis_failed(e)
+
+    async def set_many(self, items: Dict[str, Any]) -> None:
+        """Store several values in both tiers (one pipelined round trip to Redis)"""
+        for key, value in items.items():
+            self.local.set(key, value)
+        redis = self.redis
+        if not items or redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self._key(key), json.dumps(value), ex=int(self.ttl))
+                await pipe.execute()
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self._redis_failed(e)
+
+    def clear_local(self) -> None:
+        self.local.clear()
+        self._versions.clear()
+        self._local_counters.clear()
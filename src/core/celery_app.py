@@ -1,16 +1,100 @@
 from celery import Celery
+from celery.signals import worker_process_init
+from kombu import Queue
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
 from src.core.config import settings
 from src.core.bg_logging import get_bg_logger
+from src.core.db import sync_engine
+import src.core.base  # noqa: F401 - register every model so mappers configure in the worker
 
-logger = get_bg_logger()
+logger = get_bg_logger(__name__)
 
 celery = Celery(
     "electronics",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
+    include=["src.shop.tasks"],
+)
+
+# ==================== QUEUES ====================
+# One worker per queue (src/core/commands/run_worker.py), so a burst of image
+# resizing or a long report never delays the reservation sweeper
+REPORTS = "reports"
+MEDIA = "media"
+NOTIFICATIONS = "notifications"
+MAINTENANCE = "maintenance"
+
+QUEUE_CONCURRENCY = {
+    REPORTS: settings.CELERY_REPORTS_CONCURRENCY,
+    MEDIA: settings.CELERY_MEDIA_CONCURRENCY,
+    NOTIFICATIONS: settings.CELERY_NOTIFICATIONS_CONCURRENCY,
+    MAINTENANCE: settings.CELERY_MAINTENANCE_CONCURRENCY,
+}
+
+celery.conf.update(
+    task_queues=[Queue(name) for name in QUEUE_CONCURRENCY],
+    task_default_queue=MAINTENANCE,
+    task_routes={
+        "reports.*": {"queue": REPORTS},
+        "notifications.*": {"queue": NOTIFICATIONS},
+        "shop.generate_image_variants": {"queue": MEDIA},
+    },
+    # Every task is safe to run twice, so a message is acknowledged only once
+    # it has been handled and a worker killed mid-task doesn't lose it
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    # Only report jobs are polled for results (they opt in with ignore_result=False)
+    task_ignore_result=True,
+    result_expires=settings.CELERY_RESULT_EXPIRES_SECONDS,
+    result_extended=True,
 )
 
+# ==================== RETRIES ====================
+# Failures worth retrying: the database or broker was briefly unreachable.
+# Anything else is a bug or bad input and fails the task straight away.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, RedisConnectionError)
+
+RETRY = {
+    "autoretry_for": TRANSIENT_ERRORS,
+    "retry_backoff": True,
+    "retry_backoff_max": settings.CELERY_RETRY_BACKOFF_MAX_SECONDS,
+    "retry_jitter": True,
+    "max_retries": settings.CELERY_MAX_RETRIES,
+}
+
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """Forked pool processes must not share the parent's DB connections"""
+    sync_engine.dispose(close=False)
+
+
+# ==================== SCHEDULE ====================
+# Periodic jobs (run `celery ... beat` alongside the workers). Each run expires
+# when the next one is due, so a stopped worker doesn't come back to a backlog
+# of identical sweeps.
+celery.conf.beat_schedule = {
+    "expire-stock-reservations": {
+        "task": "shop.expire_reservations",
+        "schedule": settings.RESERVATION_SWEEP_INTERVAL_SECONDS,
+        "options": {"expires": settings.RESERVATION_SWEEP_INTERVAL_SECONDS},
+    },
+    "snapshot-stock": {
+        "task": "shop.snapshot_stock",
+        "schedule": settings.STOCK_SNAPSHOT_INTERVAL_SECONDS,
+        "options": {"expires": settings.STOCK_SNAPSHOT_INTERVAL_SECONDS},
+    },
+    "collect-media-garbage": {
+        "task": "shop.collect_media_garbage",
+        "schedule": settings.MEDIA_GC_INTERVAL_SECONDS,
+        "options": {"expires": settings.MEDIA_GC_INTERVAL_SECONDS},
+    },
+}
+
 @celery.task(name="electronics.test_task")
 def test_task(x, y):
-    logger.info(f"Executing test_task with {x} + {y}")
+    logger.info("Executing test_task with %s + %s", x, y)
     return x + y
@@ -0,0 +1,27 @@
+import src.core.base  # noqa: F401 - register every model before mappers configure
+from sqlalchemy import select
+
+from src.core.db import SessionLocal
+from src.core.image_variants import generate_variants
+from src.shop.models import MediaObject
+
+
+def generate_image_variants():
+    """Write any missing WebP variants for every stored image (backfill; safe to re-run)"""
+    db = SessionLocal()  # synchronous session
+    try:
+        paths = db.execute(select(MediaObject.path).order_by(MediaObject.id)).scalars().all()
+    finally:
+        db.close()
+
+    written = 0
+    for path in paths:
+        try:
+            written += len(generate_variants(path))
+        except Exception as e:
+            print(f"Skipped {path}: {e}")
+    print(f"Wrote {written} variants for {len(paths)} stored images.")
+
+
+if __name__ == "__main__":
+    generate_image_variants()
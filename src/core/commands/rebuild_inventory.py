@@ -0,0 +1,20 @@
+import src.core.base  # noqa: F401 - register every model before mappers configure
+from src.core.db import SessionLocal
+from src.shop.controllers.ledger_controller import StockLedgerController
+
+
+def rebuild_inventory(shop_id: int = None):
+    """Reset inventory quantities from the stock ledger (pause stock writes first)"""
+    db = SessionLocal()  # synchronous session
+    try:
+        corrected = StockLedgerController.rebuild_inventory(db, shop_id)
+        print(f"Corrected {len(corrected)} inventory rows: {corrected}" if corrected else "Inventory matches the ledger.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import sys
+    shop_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    rebuild_inventory(shop_id)
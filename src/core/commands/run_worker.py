@@ -0,0 +1,26 @@
+from src.core.celery_app import celery, QUEUE_CONCURRENCY
+
+
+def run_worker(*queues: str):
+    """
+    Start a Celery worker consuming `queues` (default: all of them) with the
+    configured concurrency for each, summed
+    """
+    queues = queues or tuple(QUEUE_CONCURRENCY)
+    unknown = [queue for queue in queues if queue not in QUEUE_CONCURRENCY]
+    if unknown:
+        raise SystemExit(f"Unknown queues: {', '.join(unknown)} (known: {', '.join(QUEUE_CONCURRENCY)})")
+
+    celery.worker_main([
+        "worker",
+        "--loglevel=info",
+        f"--queues={','.join(queues)}",
+        f"--concurrency={sum(QUEUE_CONCURRENCY[queue] for queue in queues)}",
+        f"--hostname={'-'.join(queues)}@%h",
+    ])
+
+
+if __name__ == "__main__":
+    import sys
+
+    run_worker(*sys.argv[1:])
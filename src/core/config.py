@@ -1,3 +1,4 @@
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -19,6 +20,122 @@ class Settings(BaseSettings):
     # Optional flag to detect Docker environment
     DOCKER_ENV: bool = True
 
+    # Database connection pool (per process; each uvicorn/celery worker has its own).
+    # Requests wait at most DB_POOL_TIMEOUT seconds for a connection, then fail
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_RECYCLE: int = 1800  # Seconds; -1 keeps connections forever
+    DB_POOL_PRE_PING: bool = True
+
+    # Server-side limits per connection (milliseconds, 0 = no limit), so one slow
+    # report or a stuck transaction can't hold a pooled connection indefinitely
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000
+
+    # asyncpg prepared statement cache (per connection)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Read replica for read-only routes (unset = everything on DATABASE_URL).
+    # Users who just wrote keep reading from the primary for this many seconds
+    READ_REPLICA_URL: Optional[str] = None
+    READ_AFTER_WRITE_SECONDS: float = 5
+
+    # Connecting through PgBouncer in transaction mode: disables the prepared
+    # statement cache and per-connection server settings
+    DB_PGBOUNCER: bool = False
+
+    # Logging: default level for the "app"/"bg" loggers, plus per-logger
+    # overrides as JSON, e.g. {"app.shop.controllers": "DEBUG", "sqlalchemy.engine": "INFO"}
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {}
+
+    # Access log: one JSON record per request (route, status, latency, DB time,
+    # statements, rows, pool wait). Slow requests are always logged, the rest sampled
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 0.1
+    ACCESS_LOG_SLOW_MS: int = 500
+
+    # Catalog cache (products/categories): local LRU per worker + shared Redis.
+    # Writes bump version stamps; other workers see them within the version TTL
+    CATALOG_CACHE_REDIS: bool = True
+    CATALOG_CACHE_TTL_SECONDS: int = 600
+    CATALOG_CACHE_LOCAL_TTL_SECONDS: float = 60
+    CATALOG_CACHE_VERSION_TTL_SECONDS: float = 2
+    CATALOG_CACHE_MAX_ENTRIES: int = 5000
+
+    # Conditional GETs: catalog/shop/inventory reads send an ETag and
+    # Cache-Control: private, max-age=N, must-revalidate (0 = revalidate every poll)
+    HTTP_CACHE_MAX_AGE: int = 0
+
+    # Timezone business days are counted in (daily totals, date filters,
+    # invoice/return number dates). IANA name, e.g. "Asia/Kolkata".
+    BUSINESS_TIMEZONE: str = "UTC"
+
+    # ORM loading: relationships never load implicitly. Strict mode also
+    # raises when an unloaded relationship is read from the identity map.
+    ORM_STRICT_LOADING: bool = False
+
+    # Stock reservation holds (basket held at the till before checkout).
+    # Holds past their TTL are given back by the Celery beat sweeper,
+    # every SWEEP_INTERVAL seconds in batches of SWEEP_BATCH_SIZE rows
+    RESERVATION_TTL_SECONDS: int = 900
+    RESERVATION_MAX_TTL_SECONDS: int = 3600
+    RESERVATION_SWEEP_INTERVAL_SECONDS: float = 60
+    RESERVATION_SWEEP_BATCH_SIZE: int = 500
+
+    # Stock ledger snapshots (Celery beat). Movements younger than SETTLE
+    # seconds are left for the next run, so a transaction that commits late
+    # is never skipped
+    STOCK_SNAPSHOT_INTERVAL_SECONDS: float = 3600
+    STOCK_SNAPSHOT_SETTLE_SECONDS: int = 300
+
+    # Content-addressed media store. Objects no product or category points at
+    # are deleted by Celery beat once unused for GRACE seconds (long enough for
+    # an upload to be attached to the product it was made for)
+    MEDIA_GC_INTERVAL_SECONDS: float = 3600
+    MEDIA_GC_GRACE_SECONDS: int = 86400
+
+    # /media serving (see src/core/media_files.py). Content-addressed files are
+    # cached as immutable; anything else for MEDIA_CACHE_MAX_AGE seconds.
+    # MEDIA_ACCEL hands files to the fronting server instead of streaming them
+    # from Python: "" (off), "x-accel" (nginx internal location at
+    # MEDIA_ACCEL_PREFIX) or "x-sendfile" (Apache / lighttpd, absolute path)
+    MEDIA_CACHE_MAX_AGE: int = 3600
+    MEDIA_ACCEL: str = ""
+    MEDIA_ACCEL_PREFIX: str = "/protected-media/"
+
+    # Celery. Each queue has its own worker (python -m src.core.commands.run_worker
+    # <queue>) with this many processes. Tasks failing on a dropped DB / broker
+    # connection are retried with exponential backoff up to MAX_RETRIES times;
+    # results (report jobs) are kept for RESULT_EXPIRES seconds
+    CELERY_REPORTS_CONCURRENCY: int = 2
+    CELERY_MEDIA_CONCURRENCY: int = 2
+    CELERY_NOTIFICATIONS_CONCURRENCY: int = 4
+    CELERY_MAINTENANCE_CONCURRENCY: int = 1
+    CELERY_MAX_RETRIES: int = 5
+    CELERY_RETRY_BACKOFF_MAX_SECONDS: int = 600
+    CELERY_RESULT_EXPIRES_SECONDS: int = 3600
+
+    # Longest date range one sales summary report may cover
+    REPORT_MAX_DAYS: int = 366
+
+    # Invoice / return numbering
+    # 1 = allocate inside the sale's own transaction; N > 1 = each worker
+    # reserves N numbers at a time so busy shops don't queue on the counter row
+    DOCUMENT_NUMBER_BLOCK_SIZE: int = 1
+
+    # Authenticated-user cache (per worker). Role/shop changes made through the
+    # API invalidate immediately on that worker; other workers within the TTL.
+    # 0 disables the cache.
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing pool (PBKDF2 runs off the event loop). Requests beyond
+    # workers + max queue get 503 instead of stalling behind a login burst.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
     model_config = ConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,46 @@
+"""
+Business-day helpers.
+
+Date filters are turned into half-open timestamp ranges `[start, end)` so the
+database can range-scan an index on the raw column instead of evaluating
+`date(column)` for every row. Days are counted in BUSINESS_TIMEZONE.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from src.core.config import settings
+
+
+@lru_cache
+def business_tz() -> ZoneInfo:
+    return ZoneInfo(settings.BUSINESS_TIMEZONE)
+
+
+def business_now() -> datetime:
+    return datetime.now(business_tz())
+
+
+def business_today() -> date:
+    return business_now().date()
+
+
+def day_start(day: date) -> datetime:
+    """Midnight of `day` in the business timezone, as a UTC timestamp"""
+    return datetime.combine(day, time.min, tzinfo=business_tz()).astimezone(timezone.utc)
+
+
+def day_range(day: date) -> Tuple[datetime, datetime]:
+    """[start, end) of one business day"""
+    return day_start(day), day_start(day + timedelta(days=1))
+
+
+def date_range(
+    start_date: Optional[date],
+    end_date: Optional[date]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """[start, end) covering whole business days from start_date through end_date (inclusive)"""
+    start = day_start(start_date) if start_date else None
+    end = day_start(end_date + timedelta(days=1)) if end_date else None
+    return start, end
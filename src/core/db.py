@@ -1,20 +1,80 @@
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
 from src.core.config import settings
+from src.core.access_log import TimedAsyncAdaptedQueuePool, instrument_engine
+from src.core.metrics import instrument_pool
 from urllib.parse import urlparse, urlunparse
+from uuid import uuid4
 
 # Shared Base for all models
 Base = declarative_base()
 
+# -------------------------
+# Engine configuration (all from Settings)
+# -------------------------
+def pool_options() -> dict:
+    """Pool sizing shared by the async and sync engines"""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def server_settings() -> dict:
+    """Per-connection PostgreSQL settings (milliseconds, 0 = no limit)"""
+    return {
+        "application_name": settings.APP_NAME,
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+        "idle_in_transaction_session_timeout": str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+    }
+
+
+def asyncpg_connect_args() -> dict:
+    if settings.DB_PGBOUNCER:
+        # Transaction pooling hands each transaction to any server connection, so
+        # named prepared statements can't be reused and startup parameters other
+        # than application_name are rejected: set the timeouts on the PgBouncer
+        # side (or on the database role) instead
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            "server_settings": {"application_name": settings.APP_NAME},
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": server_settings(),
+    }
+
+
+def psycopg2_connect_args() -> dict:
+    options = " ".join(
+        f"-c {name}={value}"
+        for name, value in server_settings().items()
+        if name != "application_name"
+    )
+    return {"application_name": settings.APP_NAME, "options": options}
+
+
 # -------------------------
 # Async engine & session (for FastAPI)
 # -------------------------
 async_engine: AsyncEngine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
-    future=True
+    future=True,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    connect_args=asyncpg_connect_args(),
+    **pool_options()
 )
+instrument_engine(async_engine.sync_engine)
+instrument_pool(async_engine.sync_engine)
 
 AsyncSessionLocal = sessionmaker(
     bind=async_engine,
@@ -26,6 +86,58 @@ async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
+# -------------------------
+# Read replica (optional, for read-only routes)
+# -------------------------
+read_engine: Optional[AsyncEngine] = None
+ReadSessionLocal = None
+
+if settings.READ_REPLICA_URL:
+    read_engine = create_async_engine(
+        settings.READ_REPLICA_URL,
+        echo=False,
+        future=True,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        connect_args=asyncpg_connect_args(),
+        **pool_options()
+    )
+    instrument_engine(read_engine.sync_engine)
+
+    ReadSessionLocal = sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Session for read-only routes: the replica, unless there is none or the user
+    wrote within READ_AFTER_WRITE_SECONDS (see src/core/replica.py).
+    The primary session is only connected if it's actually used.
+    """
+    if ReadSessionLocal is None or getattr(request.state, "read_primary", False):
+        yield db
+        return
+
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+@asynccontextmanager
+async def primary_session(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    `db` if it is on the primary, else a short-lived primary session. For reads
+    whose result outlives the request (shared caches): a lagging replica must
+    never be the source of anything stored under a version the primary bumped.
+    """
+    if read_engine is None or db.bind is not read_engine:
+        yield db
+        return
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
 # -------------------------
 # Synchronous engine & session (for scripts like create_superuser)
 # -------------------------
@@ -36,10 +148,42 @@ sync_url = urlunparse(parsed._replace(scheme="postgresql+psycopg2"))
 sync_engine = create_engine(
     sync_url,
     echo=False,
-    future=True
+    future=True,
+    connect_args={} if settings.DB_PGBOUNCER else psycopg2_connect_args(),
+    **pool_options()
 )
 
 SessionLocal = sessionmaker(
     bind=sync_engine,
     expire_on_commit=False
 )
+
+
+@contextmanager
+def task_session() -> Iterator[Session]:
+    """
+    Session for Celery tasks: plain psycopg2 on sync_engine, never the asyncpg
+    engine (its connections belong to the API's event loop). Rolled back if
+    the task raises, always closed, so a retried task starts clean.
+    """
+    session = SessionLocal()
+    try:
+        yield session
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def pool_stats(engine: AsyncEngine = async_engine) -> dict:
+    """Live pool occupancy (for health checks and dashboards)"""
+    pool = engine.sync_engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout": pool.timeout(),
+    }
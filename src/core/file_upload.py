@@ -1,59 +1,159 @@
 # src/core/file_upload.py
 
-import os
+import hashlib
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from fastapi import UploadFile, HTTPException, status
 import aiofiles
+import aiofiles.os
 
-# Define allowed image types
-ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+CHUNK_SIZE = 64 * 1024  # Read / hash / write granularity
+
+# Allowed image types, recognised by their leading bytes (the filename is not trusted)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+ALLOWED_EXTENSIONS = {'.jpg', '.png', '.gif', '.webp'}
 
 # Base media directory
 MEDIA_DIR = Path("/app/media")
 PRODUCTS_DIR = MEDIA_DIR / "products"
+OBJECTS_FOLDER = "objects"  # Content-addressed store (see object_path)
+
+# Responsive WebP variants of stored images: name -> longest edge in pixels
+# (written next to the original by the media worker, see image_variants.py)
+IMAGE_VARIANTS = {"thumbnail": 160, "medium": 640, "large": 1280}
+
+
+@dataclass
+class ReceivedUpload:
+    """An upload streamed to a temp file; the caller moves it into place or deletes it"""
+    temp_path: Path
+    size: int
+    sha256: str
+    extension: str
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Extension for the image format `head` starts with, or None"""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+async def receive_upload(
+    upload_file: UploadFile,
+    folder: str = OBJECTS_FOLDER,
+    max_size: Optional[int] = None
+) -> ReceivedUpload:
+    """
+    Stream an uploaded image into a temp file in MEDIA_DIR/`folder`, CHUNK_SIZE at a
+    time: the type is sniffed from the first chunk, the SHA-256 is computed on
+    the way, and the upload is abandoned as soon as it passes `max_size`.
+    Memory use is one chunk, whatever the file size. The temp file sits on
+    the same filesystem as its destination, so place_upload is a rename.
+    """
+    max_size = MAX_FILE_SIZE if max_size is None else max_size
+    directory = MEDIA_DIR / folder
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    temp_path = directory / f".upload-{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    extension = None
+    try:
+        async with aiofiles.open(temp_path, 'wb') as f:
+            while chunk := await upload_file.read(CHUNK_SIZE):
+                if extension is None:
+                    extension = sniff_image_type(chunk)
+                    if extension is None:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Invalid file type. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
+                        )
+
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail=f"File too large. Maximum size: {max_size / 1024 / 1024}MB"
+                    )
+
+                digest.update(chunk)
+                await f.write(chunk)
+
+        if extension is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Empty file"
+            )
+    except BaseException:
+        await discard(temp_path)
+        raise
+
+    return ReceivedUpload(temp_path, size, digest.hexdigest(), extension)
+
+
+async def discard(path: Path) -> None:
+    """Delete a temp file if it is still there"""
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
 
-async def save_upload_file(upload_file: UploadFile, folder: str = "products") -> str:
+def object_path(sha256: str, extension: str) -> str:
     """
-    Save uploaded file to media directory
-    Returns: relative URL path to the file
+    Content-addressed path (relative to MEDIA_DIR) for a file with this digest,
+    sharded two levels deep so no directory grows past a few thousand entries:
+    objects/ab/cd/abcd...<ext>
     """
-    # Validate file extension
-    file_ext = Path(upload_file.filename).suffix.lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
-    
-    # Read file content
-    content = await upload_file.read()
-    
-    # Validate file size
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size: {MAX_FILE_SIZE / 1024 / 1024}MB"
-        )
-    
-    # Generate unique filename
-    unique_filename = f"{uuid.uuid4().hex}{file_ext}"
-    
-    # Create folder path
-    folder_path = MEDIA_DIR / folder
-    folder_path.mkdir(parents=True, exist_ok=True)
-    
-    # Full file path
-    file_path = folder_path / unique_filename
-    
-    # Save file
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(content)
-    
-    # Return URL path (relative to /media)
-    return f"/media/{folder}/{unique_filename}"
+    return f"{OBJECTS_FOLDER}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+async def place_upload(received: ReceivedUpload, relative_path: str) -> str:
+    """
+    Move a received upload to `relative_path` under MEDIA_DIR
+    (atomic rename: readers never see a partial file)
+    Returns: URL path to the file
+    """
+    destination = MEDIA_DIR / relative_path
+    await aiofiles.os.makedirs(destination.parent, exist_ok=True)
+    await aiofiles.os.replace(received.temp_path, destination)
+    return media_url(relative_path)
+
+
+def variant_path(relative_path: str, name: str) -> str:
+    """objects/ab/cd/<sha256>.png -> objects/ab/cd/<sha256>_<name>.webp"""
+    return f"{relative_path.rsplit('.', 1)[0]}_{name}.webp"
+
+
+def variant_urls(file_url: Optional[str]) -> Optional[Dict[str, str]]:
+    """{variant name: URL} for an image in the store (None for any other URL)"""
+    relative_path = media_relative_path(file_url)
+    if not relative_path or not relative_path.startswith(f"{OBJECTS_FOLDER}/"):
+        return None
+    return {name: media_url(variant_path(relative_path, name)) for name in IMAGE_VARIANTS}
+
+
+def media_url(relative_path: str) -> str:
+    return f"/media/{relative_path}"
+
+
+def media_relative_path(file_url: str) -> Optional[str]:
+    """Inverse of media_url (None for URLs outside /media/)"""
+    if file_url and file_url.startswith("/media/"):
+        return file_url[len("/media/"):]
+    return None
 
 
 def delete_file(file_url: Optional[str]) -> bool:
@@ -63,15 +163,15 @@ def delete_file(file_url: Optional[str]) -> bool:
     """
     if not file_url:
         return False
-    
+
     try:
         # Extract file path from URL
         file_path = MEDIA_DIR / file_url.replace("/media/", "")
-        
+
         if file_path.exists():
             file_path.unlink()
             return True
     except Exception:
         pass
-    
+
     return False
@@ -0,0 +1,89 @@
+"""
+HTTP conditional GETs (ETag / If-None-Match).
+
+A route computes a weak ETag from cheap aggregates over the rows it would
+return (count, latest change, id and quantity checksums) before loading and
+serialising them, and answers 304 when the client's copy is still current:
+
+    etag = await aggregate_etag(db, request, stamp(Product, Product.category_id == 3))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+The aggregates cover the whole filtered set, so any change to it changes the
+ETag of every page of it; the request URL (path + query) is mixed in so
+different pages and filters never share one.
+
+A body served from a version-stamped cache (src/core/cache.py) must be tagged
+with the versions it was looked up under, not with the live rows: another
+worker may still hold the old versions, and tagging its old body with the new
+state would earn the client 304s for a copy it never got. Such routes pass
+`versions` and keep stamps for the parts read live (stock), or none at all.
+"""
+import hashlib
+import json
+from functools import reduce
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+
+from src.core.config import settings
+
+
+def stamp(model, *criteria: ColumnElement, sums=()) -> Select:
+    """
+    One-row aggregate that changes whenever a row matching `criteria` is
+    inserted, updated (updated_at) or deleted; `sums` adds checksums for
+    columns changed by bulk UPDATEs that may not touch updated_at.
+    """
+    changed_at = func.coalesce(model.updated_at, model.created_at)
+    columns = [
+        func.count(model.id),
+        func.max(changed_at),
+        func.coalesce(func.sum(model.id), 0),
+        *[func.coalesce(func.sum(column), 0) for column in sums],
+    ]
+    return select(*columns).where(*criteria)
+
+
+async def aggregate_etag(
+    db: AsyncSession,
+    request: Request,
+    *stamps: Select,
+    versions: Optional[str] = None
+) -> str:
+    """Run all stamps in one round trip (none without stamps) and hash them with the request URL and cache versions"""
+    row = ()
+    if stamps:
+        subqueries = [s.subquery() for s in stamps]
+        joined = reduce(lambda left, right: left.join(right, true()), subqueries)
+        query = select(*[column for subquery in subqueries for column in subquery.c]).select_from(joined)
+        row = (await db.execute(query)).one()
+
+    payload = json.dumps([str(request.url.path), str(request.url.query), versions, *map(str, row)])
+    return f'W/"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+
+def check_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Put ETag / Cache-Control on `response`. Returns a 304 response to send
+    instead when If-None-Match already has this ETag.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate",
+    }
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    # Weak comparison: W/"x" matches "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
@@ -0,0 +1,51 @@
+"""
+Responsive WebP variants of stored images (see IMAGE_VARIANTS).
+
+CPU-bound Pillow work: it runs in the Celery worker, never on the API
+event loop. The API only needs the naming helpers in file_upload.py.
+"""
+import os
+from typing import List
+
+from PIL import Image, ImageOps
+
+from src.core import file_upload
+from src.core.file_upload import IMAGE_VARIANTS, variant_path
+
+WEBP_QUALITY = 80
+WEBP_METHOD = 4  # 0 (fast) - 6 (smallest); 4 is Pillow's default trade-off
+
+
+def generate_variants(relative_path: str) -> List[str]:
+    """
+    Write the variants of a stored image that don't exist yet (idempotent).
+    Returns: paths (relative to MEDIA_DIR) written
+    """
+    media_dir = file_upload.MEDIA_DIR
+    missing = [
+        (name, edge) for name, edge in IMAGE_VARIANTS.items()
+        if not (media_dir / variant_path(relative_path, name)).exists()
+    ]
+    if not missing:
+        return []
+
+    # Largest first: each smaller variant is scaled down from the previous one
+    missing.sort(key=lambda variant: variant[1], reverse=True)
+    written = []
+    with Image.open(media_dir / relative_path) as image:
+        # JPEG decodes straight to a reduced scale when it can (much less CPU and memory)
+        image.draft("RGB", (missing[0][1], missing[0][1]))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+        for name, edge in missing:
+            image.thumbnail((edge, edge), Image.Resampling.LANCZOS)  # Never upscales
+
+            destination = media_dir / variant_path(relative_path, name)
+            temp_path = destination.with_name(f".{destination.name}.part")
+            image.save(temp_path, "WEBP", quality=WEBP_QUALITY, method=WEBP_METHOD)
+            os.replace(temp_path, destination)
+            written.append(variant_path(relative_path, name))
+
+    return written
@@ -0,0 +1,33 @@
+"""
+Queueing Celery jobs from the API.
+
+Tasks are sent by name, so the API process never imports task modules (or
+what they depend on, e.g. Pillow). Broker and result-backend calls block,
+so they run in the threadpool instead of on the event loop.
+"""
+from starlette.concurrency import run_in_threadpool
+
+from src.core.celery_app import celery
+
+
+async def submit_job(name: str, **kwargs) -> str:
+    """Send task `name` (routed to its queue by task_routes); returns the job id"""
+    result = await run_in_threadpool(celery.send_task, name, kwargs=kwargs)
+    return result.id
+
+
+async def job_status(task_id: str) -> dict:
+    """
+    {"name", "status", "result"} of a job. Queued, unknown and expired jobs all
+    read as PENDING with no name; result is only set once the job succeeded.
+    """
+    def read() -> dict:
+        result = celery.AsyncResult(task_id)
+        state = result.state
+        return {
+            "name": result.name,
+            "status": state,
+            "result": result.result if state == "SUCCESS" else None,
+        }
+
+    return await run_in_threadpool(read)
@@ -0,0 +1,34 @@
+"""
+Relationship loading policy.
+
+Every relationship is declared with `lazy=DEFAULT_LAZY`, so touching one that
+a query didn't load raises instead of silently emitting SQL (which under
+asyncio would fail with MissingGreenlet anyway). Each model lists the
+relationships a use case needs in `__load_profiles__`, and controllers pick one:
+
+    select(Product).options(*load_profile(Product, LoadProfile.LIST))
+
+Set ORM_STRICT_LOADING=true in development to also flag accesses that only
+worked because the related object happened to be in the identity map.
+"""
+from enum import Enum
+from typing import Sequence
+
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from src.core.config import settings
+
+DEFAULT_LAZY = "raise" if settings.ORM_STRICT_LOADING else "raise_on_sql"
+
+
+class LoadProfile(str, Enum):
+    LIST = "list"          # Collection endpoints - only what the list schema renders
+    DETAIL = "detail"      # Single-object reads
+    CHECKOUT = "checkout"  # Write paths that need related rows to do their work
+
+
+def load_profile(model, profile: LoadProfile) -> Sequence[LoaderOption]:
+    """Loader options declared by `model` for a use case (empty if none needed)"""
+    profiles = getattr(model, "__load_profiles__", {})
+    build = profiles.get(profile)
+    return build() if build else ()
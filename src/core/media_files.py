@@ -0,0 +1,136 @@
+"""
+/media serving.
+
+Content-addressed files (objects/ab/cd/<sha256>[_<variant>].<ext>, see
+file_upload.object_path) never change under their URL, so they are sent with
+Cache-Control: immutable and their hash as a strong ETag. Other files
+(uploads from before the store) revalidate after MEDIA_CACHE_MAX_AGE.
+Conditional requests and byte ranges are handled by Starlette's FileResponse.
+
+With MEDIA_ACCEL set, Python only resolves the path and sets the headers;
+the fronting server streams the bytes and uvicorn workers stay free for API
+calls. For nginx ("x-accel"):
+
+    location /protected-media/ {
+        internal;
+        alias /app/media/;
+    }
+"""
+import os
+import re
+from mimetypes import guess_type
+from pathlib import PurePosixPath
+from typing import Optional
+from urllib.parse import quote
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from src.core.config import settings
+from src.core.file_upload import ALLOWED_EXTENSIONS, IMAGE_VARIANTS
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+OBJECT_NAME = re.compile(
+    r"^objects/[0-9a-f]{2}/[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})(?:_(?P<variant>[a-z]+))?\.[a-z]+$"
+)
+
+
+class MediaFiles(StaticFiles):
+    """StaticFiles with long-lived caching for content-addressed files and optional offload"""
+
+    def __init__(
+        self,
+        *,
+        directory: str,
+        accel: str = settings.MEDIA_ACCEL,
+        accel_prefix: str = settings.MEDIA_ACCEL_PREFIX,
+        **kwargs
+    ):
+        if accel not in ("", "x-accel", "x-sendfile"):
+            raise ValueError(f"Unknown MEDIA_ACCEL mode: {accel!r}")
+        super().__init__(directory=directory, **kwargs)
+        self.accel = accel
+        self.accel_prefix = accel_prefix
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # Dotfiles are uploads still being written (see receive_upload)
+        if any(part.startswith(".") for part in PurePosixPath(path).parts):
+            raise HTTPException(status_code=404)
+
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            original = self._variant_source(path) if exc.status_code == 404 else None
+            if original is None:
+                raise
+
+        # Variant not generated yet: serve the original, revalidating so the
+        # client switches to the variant once the worker has written it
+        for extension in sorted(ALLOWED_EXTENSIONS):
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, original + extension)
+            if stat_result is not None:
+                return self._send(full_path, stat_result, scope, REVALIDATE)
+        raise HTTPException(status_code=404)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        match = OBJECT_NAME.match(self._relative(full_path))
+        if match is None:
+            return self._send(full_path, stat_result, scope, f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}", status_code=status_code)
+
+        etag = match["sha256"] if match["variant"] is None else f"{match['sha256']}-{match['variant']}"
+        return self._send(full_path, stat_result, scope, IMMUTABLE, etag=f'"{etag}"', status_code=status_code)
+
+    # ==================== HELPERS ====================
+
+    def _send(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        cache_control: str,
+        etag: Optional[str] = None,
+        status_code: int = 200
+    ) -> Response:
+        if self.accel:
+            headers = {
+                "Cache-Control": cache_control,
+                "Content-Type": guess_type(str(full_path))[0] or "application/octet-stream",
+            }
+            if self.accel == "x-accel":
+                headers["X-Accel-Redirect"] = self.accel_prefix + quote(self._relative(full_path))
+            else:
+                headers["X-Sendfile"] = str(full_path)
+            return Response(status_code=status_code, headers=headers)
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["Cache-Control"] = cache_control
+        if etag:
+            response.headers["ETag"] = etag
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _relative(self, full_path) -> str:
+        """Path under the media directory, '/'-separated"""
+        relative = os.path.relpath(full_path, os.path.realpath(self.directory))
+        return relative.replace(os.sep, "/")
+
+    @staticmethod
+    def _variant_source(path: str) -> Optional[str]:
+        """objects/.../<sha256>_<variant>.webp -> objects/.../<sha256> (no extension), else None"""
+        match = OBJECT_NAME.match(path)
+        if match is None or match["variant"] not in IMAGE_VARIANTS:
+            return None
+        return path[:path.rindex("_")]
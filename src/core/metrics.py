@@ -0,0 +1,145 @@
+"""
+Prometheus metrics.
+
+Hot paths are timed into histograms in the default in-process registry and
+served in text exposition format on GET /metrics.
+
+With several uvicorn workers, point PROMETHEUS_MULTIPROC_DIR at an empty
+directory shared by the workers (and wipe it on deploy). prometheus_client then
+keeps values in per-process mmap files and /metrics aggregates all of them,
+whichever worker answers the scrape.
+"""
+import functools
+import os
+import time
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Buckets in seconds; PBKDF2 at 600k iterations sits around 0.2-0.5s per hash
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ==================== METRICS ====================
+
+CHECKOUT_SECONDS = Histogram(
+    "shop_checkout_seconds", "Time to create a sale", ["outcome"], buckets=REQUEST_BUCKETS
+)
+STOCK_MUTATION_SECONDS = Histogram(
+    "shop_stock_mutation_seconds", "Time to adjust/reserve/release stock",
+    ["operation", "outcome"], buckets=FAST_BUCKETS
+)
+PRODUCT_SEARCH_SECONDS = Histogram(
+    "shop_product_search_seconds", "Time to run a product search", ["outcome"], buckets=FAST_BUCKETS
+)
+LOGIN_SECONDS = Histogram(
+    "auth_login_seconds", "Time to log in, including password verification",
+    ["outcome"], buckets=REQUEST_BUCKETS
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "auth_password_hash_seconds", "PBKDF2 time per hash/verify", buckets=REQUEST_BUCKETS
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "auth_password_hash_queue_wait_seconds", "Wait for a free password hasher worker", buckets=REQUEST_BUCKETS
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "auth_password_hash_rejected", "Hash/verify calls rejected because the hasher queue was full"
+)
+
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts", "Connections checked out of the pool"
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", buckets=FAST_BUCKETS
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", multiprocess_mode="livesum"
+)
+
+
+# ==================== TIMING HELPERS ====================
+
+@contextmanager
+def timer(histogram: Histogram, **labels):
+    """
+    Observe the block's duration. Histograms with an `outcome` label get
+    ok / rejected (4xx HTTPException) / error.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except HTTPException as e:
+        outcome = "rejected" if e.status_code < 500 else "error"
+        raise
+    finally:
+        if "outcome" in histogram._labelnames:
+            labels["outcome"] = outcome
+        metric = histogram.labels(**labels) if labels else histogram
+        metric.observe(time.perf_counter() - started)
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator form of `timer` for async functions"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timer(histogram, **labels):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==================== POOL ====================
+
+def instrument_pool(engine: Engine) -> None:
+    """Track checkouts and pool occupancy of `engine` (pass `async_engine.sync_engine`)"""
+    pool = engine.pool
+
+    def update_gauges():
+        if hasattr(pool, "checkedout"):
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(0, pool.overflow()))
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        update_gauges()
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        update_gauges()
+
+
+# ==================== EXPOSITION ====================
+
+def render_metrics() -> bytes:
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared directory (worker shutdown)"""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
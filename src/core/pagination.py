@@ -0,0 +1,142 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of OFFSET, each page continues from the sort key of the last row it
+returned, so page N costs the same as page 1 (given an index on the key).
+
+    RECENT_SALES = Keyset("sales:recent", Sale.sale_date, Sale.id, descending=True)
+
+    query = RECENT_SALES.apply(select(Sale), cursor, limit)
+    rows = (await db.execute(query)).scalars().all()
+    return RECENT_SALES.page(rows, limit)
+
+The cursor is opaque to clients: base64 of the key name and the last row's
+sort values. Routes pass it back through the `X-Next-Cursor` response header.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql import ColumnElement, Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+KeyColumn = Union[ColumnElement, Tuple[ColumnElement, Callable[[Any], Any]]]
+
+
+class CursorPage(list):
+    """A page of results plus the cursor for the next page (None on the last page)"""
+
+    def __init__(self, items: Sequence[Any] = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+class Keyset:
+    """
+    A sort order that can be paginated by cursor.
+
+    Columns are compared as a row value, so they must all sort in the same
+    direction and the last one must be unique (normally the primary key).
+    A column whose value isn't a plain attribute on the row (e.g. a coalesce)
+    is given as `(expression, getter)`.
+    """
+
+    def __init__(self, name: str, *columns: KeyColumn, descending: bool = False):
+        self.name = name
+        self.descending = descending
+        self.expressions: List[ColumnElement] = []
+        self.getters: List[Callable[[Any], Any]] = []
+
+        for col in columns:
+            if isinstance(col, tuple):
+                expression, getter = col
+            else:
+                expression, getter = col, _attribute_getter(col.key)
+            self.expressions.append(expression)
+            self.getters.append(getter)
+
+    # ==================== QUERY ====================
+
+    def apply(self, query: Select, cursor: Optional[str], limit: int) -> Select:
+        """Order the query by this key, continue after `cursor` and fetch one extra row"""
+        if cursor:
+            values = self.decode(cursor)
+            key = tuple_(*self.expressions)
+            after = tuple_(*[
+                literal(value, expression.type)
+                for expression, value in zip(self.expressions, values)
+            ])
+            query = query.where(key < after if self.descending else key > after)
+
+        order = [e.desc() if self.descending else e.asc() for e in self.expressions]
+        return query.order_by(*order).limit(limit + 1)
+
+    def page(self, rows: Sequence[Any], limit: int) -> CursorPage:
+        """Trim the extra row fetched by `apply` and build the next cursor from the last one kept"""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return CursorPage(rows)
+        rows = rows[:limit]
+        return CursorPage(rows, self.encode(rows[-1]))
+
+    # ==================== CURSOR ====================
+
+    def encode(self, row: Any) -> str:
+        payload = {
+            "k": self.name,
+            "v": [_dump_value(getter(row)) for getter in self.getters],
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> List[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            if payload["k"] != self.name or len(payload["v"]) != len(self.expressions):
+                raise ValueError("cursor belongs to a different sort order")
+            return [_load_value(value) for value in payload["v"]]
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid cursor: {str(e)}"
+            )
+
+
+def set_next_cursor(response: Response, page: Sequence[Any]) -> None:
+    """Expose a CursorPage's next cursor to the client"""
+    next_cursor = getattr(page, "next_cursor", None)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def _attribute_getter(key: str) -> Callable[[Any], Any]:
+    return lambda row: getattr(row, key)
+
+
+def _dump_value(value: Any) -> Any:
+    # JSON has no datetime/decimal; tag them so decode restores the type
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise ValueError("unknown cursor value")
+    return value
@@ -0,0 +1,104 @@
+"""
+Read-replica routing.
+
+Read-only routes depend on `get_read_db`, which hands out a session on the
+replica engine (READ_REPLICA_URL). Because the replica lags the primary, a
+user who just wrote is kept on the primary for READ_AFTER_WRITE_SECONDS:
+
+- `ReadAfterWriteMiddleware` identifies the user from the bearer token and,
+  after any successful non-GET request, marks them sticky
+- while the mark lasts, their requests are flagged and `get_read_db` returns
+  the primary session instead
+
+Marks are per worker, like the principal cache. Unauthenticated requests are
+never sticky. Without READ_REPLICA_URL every read uses the primary.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.core.config import settings
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadAfterWriteTracker:
+    """Per-process TTL + LRU record of users who wrote recently"""
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._until: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._until[key] = time.monotonic() + self.ttl
+            self._until.move_to_end(key)
+            while len(self._until) > self.max_entries:
+                self._until.popitem(last=False)
+
+    def is_sticky(self, key: str) -> bool:
+        with self._lock:
+            until = self._until.get(key)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._until[key]
+                return False
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+
+read_after_write = ReadAfterWriteTracker(ttl=settings.READ_AFTER_WRITE_SECONDS)
+
+
+def _user_key(scope) -> Optional[str]:
+    from src.accounts.jwt import decode_token
+
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            payload = decode_token(token)
+            return str(payload["sub"]) if payload and "sub" in payload else None
+    return None
+
+
+class ReadAfterWriteMiddleware:
+    """Flags requests from recent writers (scope state `read_primary`) and records new writes"""
+
+    def __init__(self, app, tracker: ReadAfterWriteTracker = read_after_write):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = _user_key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["read_primary"] = self.tracker.is_sticky(key)
+
+        if scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_mark(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.tracker.mark(key)
+            await send(message)
+
+        await self.app(scope, receive, send_and_mark)
@@ -0,0 +1,37 @@
+from typing import Iterable, Sequence, Tuple, Any
+from sqlalchemy import values, column, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TypeEngine
+
+
+def values_table(
+    db: AsyncSession,
+    name: str,
+    columns: Sequence[Tuple[str, TypeEngine]],
+    rows: Iterable[Sequence[Any]]
+):
+    """
+    Build an inline table of literal rows that can be joined in UPDATE ... FROM.
+
+    PostgreSQL gets a real `(VALUES ...) AS name (cols)` clause. Other dialects
+    (SQLite in tests) don't accept a column alias list, so they get an equivalent
+    `SELECT ... UNION ALL SELECT ...` subquery with the same column names.
+    """
+    rows = list(rows)
+
+    if db.bind.dialect.name == "postgresql":
+        return values(
+            *[column(col_name, col_type) for col_name, col_type in columns],
+            name=name
+        ).data(rows)
+
+    selects = [
+        select(*[
+            literal(value, col_type).label(col_name)
+            for (col_name, col_type), value in zip(columns, row)
+        ])
+        for row in rows
+    ]
+    if len(selects) == 1:
+        return selects[0].subquery(name)
+    return union_all(*selects).subquery(name)
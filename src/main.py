@@ -1,12 +1,17 @@
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from src.core.config import settings
 from src.core.route import include_routers
-from src.core.app_logging import get_app_logger
+from src.core.app_logging import get_app_logger, stop_logging
+from src.accounts.security import password_hasher
+from src.core.pagination import NEXT_CURSOR_HEADER
+from src.core.access_log import AccessLogMiddleware
+from src.core.replica import ReadAfterWriteMiddleware
+from src.core.metrics import CONTENT_TYPE_LATEST, render_metrics, mark_worker_dead
+from src.core.db import pool_stats
+from src.core.media_files import MediaFiles
 from fastapi.middleware.cors import CORSMiddleware
 
-from fastapi.staticfiles import StaticFiles
-
 logger = get_app_logger()
 
 origins = [
@@ -24,7 +29,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+if settings.READ_REPLICA_URL:
+    app.add_middleware(ReadAfterWriteMiddleware)
+if settings.ACCESS_LOG_ENABLED:
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+        slow_ms=settings.ACCESS_LOG_SLOW_MS,
+    )
 
 include_routers(app)
 
@@ -42,13 +56,41 @@ MEDIA_DIR = os.path.join(BASE_DIR, "media")
 
 os.makedirs(MEDIA_DIR, exist_ok=True)
 
-app.mount("/media", StaticFiles(directory=MEDIA_DIR), name="media")
+app.mount("/media", MediaFiles(directory=MEDIA_DIR), name="media")
 
 @app.get("/")
 async def root():
     return {"app": settings.APP_NAME, "env": settings.APP_ENV}
 
 
+@app.get("/health", include_in_schema=False)
+async def health():
+    """Liveness plus this worker's DB pool occupancy"""
+    return {"status": "ok", "db_pool": pool_stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+def shutdown_logging():
+    # Flush records still queued for the log listener
+    stop_logging()
+
+
+@app.on_event("shutdown")
+def shutdown_metrics():
+    mark_worker_dead()
+
+
 # @app.on_event("startup")
 # def print_all_routes():
 #     print("\n📜 Registered FastAPI Routes:")
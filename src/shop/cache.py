@@ -0,0 +1,48 @@
+"""
+Catalog cache: products and categories, two-tier (see src/core/cache.py).
+
+Version scopes:
+- "product:{id}"    one product document
+- "products"        every product document (a category delete re-points products)
+- "product-lists"   every product list page
+- "categories"      every category document and list
+
+Controllers call the invalidate_* helpers after their write commits.
+"""
+from typing import Optional
+
+from src.core.cache import TwoTierCache
+from src.core.config import settings, REDIS
+
+ALL_PRODUCTS = "products"
+PRODUCT_LISTS = "product-lists"
+CATEGORIES = "categories"
+
+catalog_cache = TwoTierCache(
+    "catalog",
+    redis_url=REDIS if settings.CATALOG_CACHE_REDIS else None,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    local_ttl=settings.CATALOG_CACHE_LOCAL_TTL_SECONDS,
+    version_ttl=settings.CATALOG_CACHE_VERSION_TTL_SECONDS,
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+)
+
+
+def product_scope(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+async def invalidate_product(product_id: Optional[int] = None) -> None:
+    """A product was created (no id), updated or deleted"""
+    scopes = [PRODUCT_LISTS]
+    if product_id is not None:
+        scopes.append(product_scope(product_id))
+    await catalog_cache.bump(*scopes)
+
+
+async def invalidate_categories(products_changed: bool = False) -> None:
+    """A category was written; deleting one also changes its products' category_id"""
+    scopes = [CATEGORIES]
+    if products_changed:
+        scopes += [ALL_PRODUCTS, PRODUCT_LISTS]
+    await catalog_cache.bump(*scopes)
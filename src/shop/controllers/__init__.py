@@ -2,10 +2,22 @@ from .shop_controller import ShopController
 from .product_controller import ProductController
 from .inventory_controller import InventoryController
 from .sales_controller import SalesController
+from .search_controller import ProductSearchController
+from .catalog_controller import CatalogController
+from .reservation_controller import ReservationController
+from .ledger_controller import StockLedgerController
+from .media_controller import MediaController
+from .report_controller import ReportController
 
 __all__ = [
     "ShopController",
     "ProductController",
     "InventoryController",
     "SalesController",
+    "ProductSearchController",
+    "CatalogController",
+    "ReservationController",
+    "StockLedgerController",
+    "MediaController",
+    "ReportController",
 ]
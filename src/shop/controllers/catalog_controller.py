@@ -0,0 +1,251 @@
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from src.shop.models import Product, Inventory
+from src.shop.schemas import ProductData, ProductResponse, CategoryResponse, InventoryInProductResponse
+from src.shop.controllers.product_controller import ProductController
+from src.shop.cache import catalog_cache, product_scope, ALL_PRODUCTS, PRODUCT_LISTS, CATEGORIES
+from src.core.db import primary_session
+from src.core.pagination import CursorPage
+from src.core.http_cache import stamp
+from src.core.responses import schema_columns
+
+# Stock rows attached to product responses (see _inventory_for)
+INVENTORY_COLUMNS = schema_columns(Inventory, InventoryInProductResponse)
+
+
+class CatalogController:
+    """
+    Cached read side of the catalog (products and categories).
+    Product documents are cached without stock; inventory rows are always
+    read live and attached to each response. Cache misses are filled from
+    the primary even on replica sessions: a lagging replica could otherwise
+    store an old row under the version a write just bumped, for every worker.
+    """
+
+    # ==================== PRODUCTS ====================
+
+    @staticmethod
+    async def get_product(db: AsyncSession, product_id: int, versions: Optional[str] = None) -> ProductResponse:
+        """Get product by ID (cached document + live inventory), under `versions` if the caller already has them"""
+        versions = versions or await CatalogController.product_versions(product_id)
+        key = f"product:{product_id}:{versions}"
+
+        data = await catalog_cache.get(key)
+        if data is None:
+            async with primary_session(db) as primary:
+                response = ProductResponse.model_validate(await ProductController.get_product(primary, product_id))
+            await catalog_cache.set(key, CatalogController._document(response))
+            return response
+
+        inventory = await CatalogController._inventory_for(db, [product_id])
+        return ProductResponse(**data, inventory=inventory.get(product_id, []))
+
+    @staticmethod
+    async def get_products(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        versions: Optional[str] = None
+    ) -> CursorPage:
+        """
+        Get a product list page as ProductResponse-shaped dicts (cached
+        documents + live inventory), under `versions` if the caller already
+        has them. Searches aren't cached.
+        """
+        if search and search.strip():
+            products = await ProductController.get_products(
+                db, skip=skip, limit=limit, category_id=category_id,
+                is_active=is_active, search=search
+            )
+            return CursorPage(
+                [ProductResponse.model_validate(product).model_dump(mode="json") for product in products],
+                products.next_cursor
+            )
+
+        versions = versions or await CatalogController.list_versions()
+        key = f"products:{versions}:{category_id}:{is_active}:{skip}:{limit}:{cursor}"
+
+        page = await catalog_cache.get(key)
+        if page is None:
+            async with primary_session(db) as primary:
+                products = await ProductController.get_products(
+                    primary, skip=skip, limit=limit, category_id=category_id,
+                    is_active=is_active, cursor=cursor
+                )
+                responses = [ProductResponse.model_validate(product) for product in products]
+            await catalog_cache.set(key, {
+                "items": [CatalogController._document(response) for response in responses],
+                "next_cursor": products.next_cursor,
+            })
+            return CursorPage([response.model_dump(mode="json") for response in responses], products.next_cursor)
+
+        inventory = await CatalogController._inventory_for(db, [item["id"] for item in page["items"]])
+        return CursorPage(
+            [{**item, "inventory": inventory.get(item["id"], [])} for item in page["items"]],
+            page["next_cursor"]
+        )
+
+    @staticmethod
+    async def get_products_by_ids(db: AsyncSession, product_ids: Iterable[int]) -> Dict[int, ProductData]:
+        """
+        Product documents for a set of ids (checkout). Whatever the basket size:
+        one MGET for the versions, one for the documents, one query for the
+        misses and one pipeline to cache them. Unknown ids are absent.
+        """
+        product_ids = set(product_ids)
+        versions = await catalog_cache.version_map(ALL_PRODUCTS, *map(product_scope, product_ids))
+        keys = {
+            product_id: f"product-data:{product_id}:{versions[ALL_PRODUCTS]}.{versions[product_scope(product_id)]}"
+            for product_id in product_ids
+        }
+        cached = await catalog_cache.get_many(keys.values())
+
+        products: Dict[int, ProductData] = {}
+        missing: List[int] = []
+        for product_id, key in keys.items():
+            if key in cached:
+                products[product_id] = ProductData(**cached[key])
+            else:
+                missing.append(product_id)
+
+        if missing:
+            async with primary_session(db) as primary:
+                result = await primary.execute(select(Product).where(Product.id.in_(missing)))
+                fresh = {}
+                for product in result.scalars().all():
+                    products[product.id] = ProductData.model_validate(product)
+                    fresh[keys[product.id]] = products[product.id].model_dump(mode="json")
+            await catalog_cache.set_many(fresh)
+
+        return products
+
+    # ==================== CATEGORIES ====================
+
+    @staticmethod
+    async def get_category(db: AsyncSession, category_id: int, versions: Optional[str] = None) -> CategoryResponse:
+        """Get category by ID (cached)"""
+        versions = versions or await CatalogController.category_versions()
+        key = f"category:{category_id}:{versions}"
+
+        data = await catalog_cache.get(key)
+        if data is None:
+            async with primary_session(db) as primary:
+                category = CategoryResponse.model_validate(
+                    await ProductController.get_category(primary, category_id)
+                )
+            await catalog_cache.set(key, category.model_dump(mode="json"))
+            return category
+
+        return CategoryResponse(**data)
+
+    @staticmethod
+    async def get_categories(
+        db: AsyncSession,
+        is_active: Optional[bool] = None,
+        versions: Optional[str] = None
+    ) -> List[CategoryResponse]:
+        """Get all categories (cached)"""
+        versions = versions or await CatalogController.category_versions()
+        key = f"categories:{versions}:{is_active}"
+
+        data = await catalog_cache.get(key)
+        if data is None:
+            async with primary_session(db) as primary:
+                categories = [
+                    CategoryResponse.model_validate(category)
+                    for category in await ProductController.get_categories(primary, is_active=is_active)
+                ]
+            await catalog_cache.set(key, [category.model_dump(mode="json") for category in categories])
+            return categories
+
+        return [CategoryResponse(**item) for item in data]
+
+    # ==================== HELPERS ====================
+
+    @staticmethod
+    def _document(response: ProductResponse) -> dict:
+        return response.model_dump(mode="json", exclude={"inventory"})
+
+    @staticmethod
+    async def _inventory_for(db: AsyncSession, product_ids: List[int]) -> Dict[int, List[dict]]:
+        """Live stock rows (InventoryInProductResponse-shaped dicts) for the given products, in one query"""
+        if not product_ids:
+            return {}
+
+        result = await db.execute(
+            select(Inventory.product_id, *INVENTORY_COLUMNS)
+            .where(Inventory.product_id.in_(product_ids))
+            .order_by(Inventory.id)
+        )
+        inventory: Dict[int, List[dict]] = {}
+        for row in result.all():
+            item = dict(row._mapping)
+            inventory.setdefault(item.pop("product_id"), []).append(item)
+        return inventory
+
+    # ==================== HTTP CACHE STAMPS ====================
+    # Cached bodies are tagged with the cache versions they are read under
+    # (pass the same versions to the getter) plus stamps of what is read live
+
+    @staticmethod
+    async def product_versions(product_id: int) -> str:
+        return await catalog_cache.versions(ALL_PRODUCTS, product_scope(product_id))
+
+    @staticmethod
+    async def list_versions() -> str:
+        return await catalog_cache.versions(ALL_PRODUCTS, PRODUCT_LISTS)
+
+    @staticmethod
+    async def category_versions() -> str:
+        return await catalog_cache.versions(CATEGORIES)
+
+    @staticmethod
+    def product_stamps(
+        product_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        is_active: Optional[bool] = None
+    ) -> List[Select]:
+        """ETag aggregates for uncached product reads (searches): the product rows and their stock"""
+        return [
+            stamp(Product, *CatalogController._product_criteria(product_id, category_id, is_active)),
+            *CatalogController.stock_stamps(product_id, category_id, is_active),
+        ]
+
+    @staticmethod
+    def stock_stamps(
+        product_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        is_active: Optional[bool] = None
+    ) -> List[Select]:
+        """ETag aggregates for the live stock of one product or a product listing"""
+        criteria = CatalogController._product_criteria(product_id, category_id, is_active)
+        product_ids = select(Product.id).where(*criteria)
+        return [
+            stamp(
+                Inventory,
+                Inventory.product_id.in_(product_ids),
+                sums=(Inventory.quantity, Inventory.reserved_quantity)
+            ),
+        ]
+
+    @staticmethod
+    def _product_criteria(
+        product_id: Optional[int],
+        category_id: Optional[int],
+        is_active: Optional[bool]
+    ) -> list:
+        criteria = []
+        if product_id is not None:
+            criteria.append(Product.id == product_id)
+        if category_id:
+            criteria.append(Product.category_id == category_id)
+        if is_active is not None:
+            criteria.append(Product.is_active == is_active)
+        return criteria
@@ -1,17 +1,46 @@
 # src/shop/controllers/inventory_controller.py - PAGE 1 OPTIMIZED
 # CHANGES: Remove success logs + Query optimization (remove selectinload, add pagination)
 
-from typing import List
+from typing import Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_
+from sqlalchemy import select, update, or_, and_, func, Integer
+from sqlalchemy.sql import Select
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from datetime import datetime
-from src.shop.models import Inventory, Product, Shop
-from src.shop.schemas import InventoryCreate, InventoryUpdate, StockAdjustment
+from src.shop.models import Inventory, Product, Shop, MovementReason
+from src.shop.schemas import InventoryCreate, InventoryUpdate, InventoryResponse, StockAdjustment
 from src.core.app_logging import get_app_logger
-
-logger = get_app_logger()
+from src.core.metrics import STOCK_MUTATION_SECONDS, timed
+from src.core.sql import values_table
+from src.core.pagination import CursorPage, Keyset
+from src.core.http_cache import stamp
+from src.core.responses import schema_columns
+from src.shop.controllers.ledger_controller import StockLedgerController
+
+logger = get_app_logger(__name__)
+
+# ==================== SORT KEYS ====================
+# updated_at is NULL until a row is first modified; fall back to created_at
+INVENTORY_RECENT = Keyset(
+    "inventory:recent",
+    (func.coalesce(Inventory.updated_at, Inventory.created_at), lambda inv: inv.updated_at or inv.created_at),
+    Inventory.id,
+    descending=True
+)
+INVENTORY_BY_QUANTITY = Keyset("inventory:quantity", Inventory.quantity, Inventory.id)
+INVENTORY_BY_PRODUCT = Keyset("inventory:product", Inventory.product_id, Inventory.id)
+INVENTORY_MOST_STOCKED = Keyset("inventory:quantity-desc", Inventory.quantity, Inventory.id, descending=True)
+
+# List pages select only what InventoryResponse renders (see _rows)
+INVENTORY_COLUMNS = schema_columns(Inventory, InventoryResponse)
+
+# sort_by options accepted by get_shop_inventory
+INVENTORY_SORTS = {
+    "updated_at": INVENTORY_RECENT,
+    "quantity": INVENTORY_BY_QUANTITY,
+    "product_id": INVENTORY_BY_PRODUCT,
+}
 
 class InventoryController:
     """Controller for inventory management operations"""
@@ -60,6 +89,13 @@ class InventoryController:
 
             inventory = Inventory(**inventory_data.model_dump())
             db.add(inventory)
+            await db.flush()
+            await StockLedgerController.record(db, [
+                StockLedgerController.entry(
+                    inventory.id, inventory.shop_id, inventory.product_id,
+                    inventory.quantity, MovementReason.INITIAL
+                )
+            ])
             await db.commit()
             await db.refresh(inventory)
             return inventory
@@ -67,7 +103,7 @@ class InventoryController:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error creating inventory: {str(e)}")
+            logger.error("Error creating inventory: %s", e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -75,12 +111,16 @@ class InventoryController:
             )
 
     @staticmethod
-    async def get_inventory(db: AsyncSession, inventory_id: int) -> Inventory:
-        """Get inventory by ID - OPTIMIZED: Removed selectinload"""
+    async def get_inventory(db: AsyncSession, inventory_id: int, for_update: bool = False) -> Inventory:
+        """
+        Get inventory by ID - OPTIMIZED: Removed selectinload
+        for_update: lock the row until the caller's transaction ends (and refresh it)
+        """
         try:
-            result = await db.execute(
-                select(Inventory).where(Inventory.id == inventory_id)
-            )
+            query = select(Inventory).where(Inventory.id == inventory_id)
+            if for_update:
+                query = query.with_for_update().execution_options(populate_existing=True)
+            result = await db.execute(query)
             inventory = result.scalar_one_or_none()
 
             if not inventory:
@@ -94,27 +134,28 @@ class InventoryController:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error fetching inventory ID {inventory_id}: {str(e)}")
+            logger.error("Error fetching inventory ID %s: %s", inventory_id, e)
             raise
 
     @staticmethod
     async def get_all_inventory(
         db: AsyncSession,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Inventory]:
-        """Get all inventory records - OPTIMIZED: Removed selectinload + Added pagination"""
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get all inventory records, most recently changed first (cursor or skip/limit), as response rows"""
         try:
-            result = await db.execute(
-                select(Inventory)
-                .offset(skip)
-                .limit(limit)
-                .order_by(Inventory.updated_at.desc())
-            )
-            return result.scalars().all()
+            query = INVENTORY_RECENT.apply(select(*INVENTORY_COLUMNS), cursor, limit)
+            if not cursor:
+                query = query.offset(skip)
+            result = await db.execute(query)
+            return InventoryController._rows(INVENTORY_RECENT.page(result.all(), limit))
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching all inventory: {str(e)}")
+            logger.error("Error fetching all inventory: %s", e)
             raise
 
     @staticmethod
@@ -123,25 +164,24 @@ class InventoryController:
         shop_id: int,
         skip: int = 0,
         limit: int = 50,
-        sort_by: str = "updated_at"
-    ) -> List[Inventory]:
-        """Get all inventory for a specific shop - OPTIMIZED"""
+        sort_by: str = "updated_at",
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get all inventory for a specific shop (cursor or skip/limit), as response rows"""
         try:
-            query = select(Inventory).where(Inventory.shop_id == shop_id)
+            keyset = INVENTORY_SORTS.get(sort_by, INVENTORY_RECENT)
 
-            if sort_by == "quantity":
-                query = query.order_by(Inventory.quantity.asc())
-            elif sort_by == "product_id":
-                query = query.order_by(Inventory.product_id.asc())
-            else:
-                query = query.order_by(Inventory.updated_at.desc())
-
-            query = query.offset(skip).limit(limit)
+            query = select(*INVENTORY_COLUMNS).where(Inventory.shop_id == shop_id)
+            query = keyset.apply(query, cursor, limit)
+            if not cursor:
+                query = query.offset(skip)
             result = await db.execute(query)
-            return result.scalars().all()
+            return InventoryController._rows(keyset.page(result.all(), limit))
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching shop inventory for shop {shop_id}: {str(e)}")
+            logger.error("Error fetching shop inventory for shop %s: %s", shop_id, e)
             raise
 
     @staticmethod
@@ -149,22 +189,22 @@ class InventoryController:
         db: AsyncSession,
         product_id: int,
         skip: int = 0,
-        limit: int = 50
-    ) -> List[Inventory]:
-        """Get inventory across all shops for a product - OPTIMIZED"""
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get inventory across all shops for a product, best stocked first, as response rows"""
         try:
-            query = (
-                select(Inventory)
-                .where(Inventory.product_id == product_id)
-                .order_by(Inventory.quantity.desc())
-                .offset(skip)
-                .limit(limit)
-            )
+            query = select(*INVENTORY_COLUMNS).where(Inventory.product_id == product_id)
+            query = INVENTORY_MOST_STOCKED.apply(query, cursor, limit)
+            if not cursor:
+                query = query.offset(skip)
             result = await db.execute(query)
-            return result.scalars().all()
+            return InventoryController._rows(INVENTORY_MOST_STOCKED.page(result.all(), limit))
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching product inventory for product {product_id}: {str(e)}")
+            logger.error("Error fetching product inventory for product %s: %s", product_id, e)
             raise
 
     @staticmethod
@@ -172,21 +212,22 @@ class InventoryController:
         db: AsyncSession,
         threshold: int = 5,
         skip: int = 0,
-        limit: int = 50
-    ) -> List[Inventory]:
-        """Get inventory items with low stock - OPTIMIZED"""
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get inventory items with low stock, lowest first, as response rows"""
         try:
-            result = await db.execute(
-                select(Inventory)
-                .where(Inventory.quantity <= threshold)
-                .order_by(Inventory.quantity.asc())
-                .offset(skip)
-                .limit(limit)
-            )
-            return result.scalars().all()
+            query = select(*INVENTORY_COLUMNS).where(Inventory.quantity <= threshold)
+            query = INVENTORY_BY_QUANTITY.apply(query, cursor, limit)
+            if not cursor:
+                query = query.offset(skip)
+            result = await db.execute(query)
+            return InventoryController._rows(INVENTORY_BY_QUANTITY.page(result.all(), limit))
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching low stock items: {str(e)}")
+            logger.error("Error fetching low stock items: %s", e)
             raise
 
     @staticmethod
@@ -197,12 +238,23 @@ class InventoryController:
     ) -> Inventory:
         """Update inventory details"""
         try:
-            inventory = await InventoryController.get_inventory(db, inventory_id)
+            # Locked from the read to the commit: a sale or adjustment landing in
+            # between would otherwise be overwritten and missing from the CORRECTION
+            inventory = await InventoryController.get_inventory(db, inventory_id, for_update=True)
 
             update_data = inventory_data.model_dump(exclude_unset=True)
+            change = 0
+            if update_data.get("quantity") is not None:
+                change = update_data["quantity"] - inventory.quantity
             for field, value in update_data.items():
                 setattr(inventory, field, value)
 
+            await StockLedgerController.record(db, [
+                StockLedgerController.entry(
+                    inventory.id, inventory.shop_id, inventory.product_id,
+                    change, MovementReason.CORRECTION
+                )
+            ])
             await db.commit()
             await db.refresh(inventory)
             return inventory
@@ -210,14 +262,119 @@ class InventoryController:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating inventory ID {inventory_id}: {str(e)}")
+            logger.error("Error updating inventory ID %s: %s", inventory_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update inventory: {str(e)}"
             )
 
+    # ==================== ATOMIC STOCK MUTATIONS ====================
+    # Every stock change is a single guarded UPDATE ... RETURNING, so concurrent
+    # sales of the same SKU can neither lose updates nor oversell, and no row
+    # lock is held while Python code runs.
+
+    @staticmethod
+    async def _guarded_update(
+        db: AsyncSession,
+        inventory_id: int,
+        guard,
+        **values
+    ) -> Optional[Inventory]:
+        """
+        Apply `values` to one inventory row only if `guard` holds
+        Returns: the updated row, or None if the row is missing or the guard failed
+        """
+        result = await db.execute(
+            update(Inventory)
+            .where(and_(Inventory.id == inventory_id, guard))
+            .values(**values)
+            .returning(Inventory)
+            .execution_options(synchronize_session="fetch", populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def decrement_available(
+        db: AsyncSession,
+        inventory_id: int,
+        quantity: int
+    ) -> Optional[Inventory]:
+        """Take `quantity` units off the shelf if that many are available (not reserved)"""
+        return await InventoryController._guarded_update(
+            db,
+            inventory_id,
+            Inventory.quantity - Inventory.reserved_quantity >= quantity,
+            quantity=Inventory.quantity - quantity
+        )
+
+    @staticmethod
+    async def decrement_available_many(
+        db: AsyncSession,
+        lines: Dict[int, int],
+        held: Optional[Dict[int, int]] = None
+    ) -> List[int]:
+        """
+        Batched decrement_available for {inventory_id: quantity} in one statement.
+        `held` ({inventory_id: quantity} of converted reservation holds) is taken
+        out of reserved_quantity in the same statement and may cover the lines.
+        Returns: inventory IDs that could not be decremented (missing or short).
+        Rows that did succeed stay decremented - roll back if the batch must be all-or-nothing.
+        """
+        held = held or {}
+        inventory_ids = list(lines) + [inventory_id for inventory_id in held if inventory_id not in lines]
+        if not inventory_ids:
+            return []
+
+        basket = values_table(
+            db,
+            "basket",
+            [("inventory_id", Integer()), ("quantity", Integer()), ("held", Integer())],
+            [(inventory_id, lines.get(inventory_id, 0), held.get(inventory_id, 0)) for inventory_id in inventory_ids]
+        )
+        result = await db.execute(
+            update(Inventory)
+            .where(
+                and_(
+                    Inventory.id == basket.c.inventory_id,
+                    Inventory.reserved_quantity >= basket.c.held,
+                    Inventory.quantity - Inventory.reserved_quantity + basket.c.held >= basket.c.quantity
+                )
+            )
+            .values(
+                quantity=Inventory.quantity - basket.c.quantity,
+                reserved_quantity=Inventory.reserved_quantity - basket.c.held
+            )
+            .returning(Inventory.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        updated = set(result.scalars().all())
+        return [inventory_id for inventory_id in inventory_ids if inventory_id not in updated]
+
     @staticmethod
+    async def restock_many(
+        db: AsyncSession,
+        lines: Dict[int, int]
+    ) -> None:
+        """Put {inventory_id: quantity} back on the shelf in one statement"""
+        if not lines:
+            return
+
+        basket = values_table(
+            db,
+            "basket",
+            [("inventory_id", Integer()), ("quantity", Integer())],
+            lines.items()
+        )
+        await db.execute(
+            update(Inventory)
+            .where(Inventory.id == basket.c.inventory_id)
+            .values(quantity=Inventory.quantity + basket.c.quantity)
+            .execution_options(synchronize_session="fetch")
+        )
+
+    @staticmethod
+    @timed(STOCK_MUTATION_SECONDS, operation="adjust")
     async def adjust_stock(
         db: AsyncSession,
         inventory_id: int,
@@ -225,27 +382,34 @@ class InventoryController:
     ) -> Inventory:
         """Adjust inventory stock quantity"""
         try:
-            inventory = await InventoryController.get_inventory(db, inventory_id)
-
-            new_quantity = inventory.quantity + adjustment.quantity
+            inventory = await InventoryController._guarded_update(
+                db,
+                inventory_id,
+                Inventory.quantity + adjustment.adjustment >= 0,
+                quantity=Inventory.quantity + adjustment.adjustment,
+                last_restocked_at=datetime.now()
+            )
 
-            if new_quantity < 0:
+            if not inventory:
+                await InventoryController.get_inventory(db, inventory_id)  # 404 if missing
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Insufficient stock for this adjustment"
                 )
 
-            inventory.quantity = new_quantity
-            inventory.last_restocked_at = datetime.now()
-
+            await StockLedgerController.record(db, [
+                StockLedgerController.entry(
+                    inventory.id, inventory.shop_id, inventory.product_id,
+                    adjustment.adjustment, MovementReason.ADJUSTMENT, note=adjustment.reason
+                )
+            ])
             await db.commit()
-            await db.refresh(inventory)
             return inventory
 
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error adjusting stock for inventory {inventory_id}: {str(e)}")
+            logger.error("Error adjusting stock for inventory %s: %s", inventory_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -253,6 +417,7 @@ class InventoryController:
             )
 
     @staticmethod
+    @timed(STOCK_MUTATION_SECONDS, operation="reserve")
     async def reserve_stock(
         db: AsyncSession,
         inventory_id: int,
@@ -260,26 +425,27 @@ class InventoryController:
     ) -> Inventory:
         """Reserve stock for pending orders"""
         try:
-            inventory = await InventoryController.get_inventory(db, inventory_id)
-
-            available = inventory.quantity - inventory.reserved_quantity
+            inventory = await InventoryController._guarded_update(
+                db,
+                inventory_id,
+                Inventory.quantity - Inventory.reserved_quantity >= quantity,
+                reserved_quantity=Inventory.reserved_quantity + quantity
+            )
 
-            if available < quantity:
+            if not inventory:
+                current = await InventoryController.get_inventory(db, inventory_id)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient available stock. Available: {available}"
+                    detail=f"Insufficient available stock. Available: {current.available_quantity}"
                 )
 
-            inventory.reserved_quantity += quantity
-
             await db.commit()
-            await db.refresh(inventory)
             return inventory
 
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error reserving stock for inventory {inventory_id}: {str(e)}")
+            logger.error("Error reserving stock for inventory %s: %s", inventory_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -287,6 +453,7 @@ class InventoryController:
             )
 
     @staticmethod
+    @timed(STOCK_MUTATION_SECONDS, operation="release")
     async def release_stock(
         db: AsyncSession,
         inventory_id: int,
@@ -294,26 +461,60 @@ class InventoryController:
     ) -> Inventory:
         """Release reserved stock"""
         try:
-            inventory = await InventoryController.get_inventory(db, inventory_id)
+            inventory = await InventoryController._guarded_update(
+                db,
+                inventory_id,
+                Inventory.reserved_quantity >= quantity,
+                reserved_quantity=Inventory.reserved_quantity - quantity
+            )
 
-            if inventory.reserved_quantity < quantity:
+            if not inventory:
+                current = await InventoryController.get_inventory(db, inventory_id)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Cannot release more than reserved. Reserved: {inventory.reserved_quantity}"
+                    detail=f"Cannot release more than reserved. Reserved: {current.reserved_quantity}"
                 )
 
-            inventory.reserved_quantity -= quantity
-
             await db.commit()
-            await db.refresh(inventory)
             return inventory
 
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error releasing stock for inventory {inventory_id}: {str(e)}")
+            logger.error("Error releasing stock for inventory %s: %s", inventory_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to release stock: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    # ==================== LIST ROWS ====================
+
+    @staticmethod
+    def _rows(page: CursorPage) -> CursorPage:
+        """Column rows -> InventoryResponse-shaped dicts (computed fields as on the model)"""
+        items = []
+        for row in page:
+            item = dict(row._mapping)
+            item["available_quantity"] = item["quantity"] - item["reserved_quantity"]
+            item["needs_restock"] = item["quantity"] <= item["min_stock_level"]
+            items.append(item)
+        return CursorPage(items, page.next_cursor)
+
+    # ==================== HTTP CACHE STAMPS ====================
+
+    @staticmethod
+    def inventory_stamps(
+        shop_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        threshold: Optional[int] = None
+    ) -> List[Select]:
+        """ETag aggregates for an inventory listing (see src/core/http_cache.py)"""
+        criteria = []
+        if shop_id is not None:
+            criteria.append(Inventory.shop_id == shop_id)
+        if product_id is not None:
+            criteria.append(Inventory.product_id == product_id)
+        if threshold is not None:
+            criteria.append(Inventory.quantity <= threshold)
+        return [stamp(Inventory, *criteria, sums=(Inventory.quantity, Inventory.reserved_quantity))]
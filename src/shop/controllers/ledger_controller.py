@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, insert, update, and_, func, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+
+from src.shop.models import Inventory, StockMovement, StockSnapshot, MovementReason
+from src.core.app_logging import get_app_logger
+from src.core.config import settings
+from src.core.pagination import CursorPage, Keyset
+
+logger = get_app_logger(__name__)
+
+# ==================== SORT KEYS ====================
+MOVEMENTS_RECENT = Keyset("movements:recent", StockMovement.id, descending=True)
+
+
+class StockLedgerController:
+    """
+    Append-only stock ledger (stock_movements) and its snapshots.
+
+    Every quantity change is recorded by the code path that makes it, in the
+    same transaction. Snapshots periodically fold the ledger per (shop,
+    product), so the quantity at any time is the latest snapshot before it
+    plus the movements after that snapshot - a short range scan on
+    (shop_id, product_id, id) instead of a replay of the whole history.
+    """
+
+    # ==================== RECORDING ====================
+
+    @staticmethod
+    def entry(
+        inventory_id: Optional[int],
+        shop_id: int,
+        product_id: int,
+        quantity_change: int,
+        reason: MovementReason,
+        **refs
+    ) -> dict:
+        """One movement row for `record` (refs: note, sale_id, return_id)"""
+        return {
+            "inventory_id": inventory_id,
+            "shop_id": shop_id,
+            "product_id": product_id,
+            "quantity_change": quantity_change,
+            "reason": reason.value,
+            **refs,
+        }
+
+    @staticmethod
+    async def record(db: AsyncSession, movements: List[dict]) -> None:
+        """Append movements in one multi-row INSERT (the caller commits)"""
+        movements = [movement for movement in movements if movement["quantity_change"]]
+        if movements:
+            await db.execute(insert(StockMovement).values(movements))
+
+    # ==================== READS ====================
+
+    @staticmethod
+    async def get_movements(
+        db: AsyncSession,
+        shop_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Ledger entries, newest first (cursor or skip/limit)"""
+        query = select(StockMovement)
+        if shop_id:
+            query = query.where(StockMovement.shop_id == shop_id)
+        if product_id:
+            query = query.where(StockMovement.product_id == product_id)
+
+        query = MOVEMENTS_RECENT.apply(query, cursor, limit)
+        if not cursor:
+            query = query.offset(skip)
+        result = await db.execute(query)
+        return MOVEMENTS_RECENT.page(result.scalars().all(), limit)
+
+    @staticmethod
+    async def stock_at(db: AsyncSession, shop_id: int, product_id: int, at: datetime) -> int:
+        """Quantity of a product in a shop at `at` (0 before its first movement)"""
+        quantities = StockLedgerController._quantities(shop_id=shop_id, product_id=product_id, at=at)
+        result = await db.execute(select(quantities.c.quantity))
+        return result.scalar_one_or_none() or 0
+
+    # ==================== SNAPSHOTS ====================
+
+    @staticmethod
+    def take_snapshots(session: Session, settle_seconds: int = settings.STOCK_SNAPSHOT_SETTLE_SECONDS) -> int:
+        """
+        Snapshot every (shop, product) that moved since its last snapshot, in one
+        INSERT ... SELECT. Synchronous: runs in the Celery worker on SessionLocal.
+        Returns: number of snapshots written
+        """
+        settled = datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)
+        upto = session.execute(
+            select(func.max(StockMovement.id)).where(StockMovement.created_at <= settled)
+        ).scalar()
+        if upto is None:
+            return 0
+
+        snap, delta = StockLedgerController._ledger(upto=upto)
+        result = session.execute(
+            insert(StockSnapshot).from_select(
+                ["shop_id", "product_id", "quantity", "movement_id", "taken_at"],
+                select(
+                    delta.c.shop_id,
+                    delta.c.product_id,
+                    func.coalesce(snap.c.quantity, 0) + delta.c.quantity,
+                    delta.c.movement_id,
+                    delta.c.taken_at
+                ).select_from(
+                    delta.outerjoin(
+                        snap,
+                        and_(snap.c.shop_id == delta.c.shop_id, snap.c.product_id == delta.c.product_id)
+                    )
+                )
+            )
+        )
+        session.commit()
+        return result.rowcount
+
+    # ==================== REBUILD ====================
+
+    @staticmethod
+    def rebuild_inventory(session: Session, shop_id: Optional[int] = None) -> List[int]:
+        """
+        Reset Inventory.quantity to what the ledger says (latest snapshot + later
+        movements) in one UPDATE. Run with stock writes paused.
+        reserved_quantity is not part of the ledger and is left as is. Rows
+        whose ledger has no opening or initial entry are left alone: their
+        movements are only deltas from a starting quantity the ledger never saw.
+        Returns: IDs of the inventory rows that were corrected
+        """
+        quantities = StockLedgerController._quantities(shop_id=shop_id)
+        has_baseline = (
+            select(StockMovement.id)
+            .where(
+                StockMovement.shop_id == Inventory.shop_id,
+                StockMovement.product_id == Inventory.product_id,
+                StockMovement.reason.in_([MovementReason.OPENING.value, MovementReason.INITIAL.value])
+            )
+            .exists()
+        )
+        result = session.execute(
+            update(Inventory)
+            .where(
+                Inventory.shop_id == quantities.c.shop_id,
+                Inventory.product_id == quantities.c.product_id,
+                Inventory.quantity != quantities.c.quantity,
+                has_baseline
+            )
+            .values(quantity=quantities.c.quantity)
+            .returning(Inventory.id)
+            .execution_options(synchronize_session=False)
+        )
+        corrected = list(result.scalars().all())
+        session.commit()
+
+        if corrected:
+            logger.warning("Rebuilt %s inventory rows from the stock ledger: %s", len(corrected), corrected)
+        return corrected
+
+    # ==================== QUERY BUILDERS ====================
+
+    @staticmethod
+    def _ledger(
+        shop_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        at: Optional[datetime] = None,
+        upto: Optional[int] = None
+    ) -> Tuple[Subquery, Subquery]:
+        """
+        (snap, delta) per (shop, product): the latest snapshot, and the sum of the
+        movements after it. Both can be cut off at a time (`at`) or movement id (`upto`).
+        """
+        snapshot_filters, movement_filters = [], []
+        for model, filters in ((StockSnapshot, snapshot_filters), (StockMovement, movement_filters)):
+            if shop_id:
+                filters.append(model.shop_id == shop_id)
+            if product_id:
+                filters.append(model.product_id == product_id)
+        if at is not None:
+            snapshot_filters.append(StockSnapshot.taken_at <= at)
+            movement_filters.append(StockMovement.created_at <= at)
+        if upto is not None:
+            snapshot_filters.append(StockSnapshot.movement_id <= upto)
+            movement_filters.append(StockMovement.id <= upto)
+
+        latest = (
+            select(
+                StockSnapshot.shop_id,
+                StockSnapshot.product_id,
+                func.max(StockSnapshot.movement_id).label("movement_id")
+            )
+            .where(*snapshot_filters)
+            .group_by(StockSnapshot.shop_id, StockSnapshot.product_id)
+            .subquery("latest")
+        )
+        snap = (
+            select(StockSnapshot.shop_id, StockSnapshot.product_id, StockSnapshot.quantity, StockSnapshot.movement_id)
+            .join(
+                latest,
+                and_(
+                    StockSnapshot.shop_id == latest.c.shop_id,
+                    StockSnapshot.product_id == latest.c.product_id,
+                    StockSnapshot.movement_id == latest.c.movement_id
+                )
+            )
+            .subquery("snap")
+        )
+        delta = (
+            select(
+                StockMovement.shop_id,
+                StockMovement.product_id,
+                func.sum(StockMovement.quantity_change).label("quantity"),
+                func.max(StockMovement.id).label("movement_id"),
+                func.max(StockMovement.created_at).label("taken_at")
+            )
+            .outerjoin(
+                snap,
+                and_(snap.c.shop_id == StockMovement.shop_id, snap.c.product_id == StockMovement.product_id)
+            )
+            .where(StockMovement.id > func.coalesce(snap.c.movement_id, 0), *movement_filters)
+            .group_by(StockMovement.shop_id, StockMovement.product_id)
+            .subquery("delta")
+        )
+        return snap, delta
+
+    @staticmethod
+    def _quantities(**cutoff) -> Subquery:
+        """(shop_id, product_id, quantity) according to the ledger"""
+        snap, delta = StockLedgerController._ledger(**cutoff)
+        parts = union_all(
+            select(snap.c.shop_id, snap.c.product_id, snap.c.quantity),
+            select(delta.c.shop_id, delta.c.product_id, delta.c.quantity)
+        ).subquery("parts")
+        return (
+            select(parts.c.shop_id, parts.c.product_id, func.sum(parts.c.quantity).label("quantity"))
+            .group_by(parts.c.shop_id, parts.c.product_id)
+            .subquery("ledger")
+        )
@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.shop.models import MediaObject
+from src.core.app_logging import get_app_logger
+from src.core.celery_app import celery
+from src.core.config import settings
+from src.core.file_upload import (
+    receive_upload, discard, place_upload, object_path, variant_path,
+    variant_urls, media_url, media_relative_path, delete_file, IMAGE_VARIANTS
+)
+from src.core import file_upload
+
+logger = get_app_logger(__name__)
+
+# Advisory lock key: the garbage collector holds it exclusively while it
+# deletes rows and files, writers that create or revive a reference share it
+MEDIA_GC_LOCK = 0x6D656469
+
+
+class MediaController:
+    """
+    Content-addressed image store (media_objects).
+
+    Every distinct image is stored once, at a path derived from its SHA-256,
+    however many products use it. Product and category writes keep ref_count
+    in step with their image_url in the same transaction; objects nobody
+    references are deleted by the beat garbage collector after a grace period.
+    The collector and every writer that could bring an object back to life
+    serialise on MEDIA_GC_LOCK, so a file is never unlinked under a live row.
+    """
+
+    # ==================== STORE ====================
+
+    @staticmethod
+    async def store(db: AsyncSession, upload_file: UploadFile) -> MediaObject:
+        """
+        Store an uploaded image, or return the existing object with the same content.
+        A known image costs the hash lookup only: no new file and no row.
+        """
+        received = await receive_upload(upload_file)
+
+        # Looked up under the lock: the collector can't delete this row or its
+        # file before we commit, and anything it deleted earlier is gone for good
+        await MediaController._hold_off_gc(db)
+        media = await MediaController.get_by_hash(db, received.sha256)
+        if media:
+            if (file_upload.MEDIA_DIR / media.path).exists():
+                await discard(received.temp_path)
+            else:
+                await place_upload(received, media.path)  # Row outlived its file: heal it
+            revive = media.ref_count == 0
+            if revive:
+                # Re-uploaded orphan: restart its grace period so it survives until attached
+                media.last_used_at = func.now()
+            await db.commit()
+            if revive:
+                await db.refresh(media)
+            logger.info("Upload matched stored media %s", received.sha256)
+            return media
+
+        relative_path = object_path(received.sha256, received.extension)
+        await place_upload(received, relative_path)
+
+        # A concurrent upload of the same bytes may have inserted the row (and
+        # renamed identical bytes onto the same path) in the meantime
+        dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        await db.execute(
+            dialect_insert(MediaObject)
+            .values(
+                sha256=received.sha256,
+                path=relative_path,
+                extension=received.extension,
+                size=received.size
+            )
+            .on_conflict_do_nothing(index_elements=[MediaObject.sha256])
+        )
+        await db.commit()
+
+        logger.info("Stored new media %s (%s bytes)", received.sha256, received.size)
+        return await MediaController.get_by_hash(db, received.sha256)
+
+    @staticmethod
+    def request_variants(relative_path: str) -> None:
+        """
+        Queue WebP variant generation for a stored image (run after the response;
+        the worker skips variants that already exist). A broker outage only costs
+        the variants: `python -m src.core.commands.generate_image_variants` backfills.
+        """
+        try:
+            celery.send_task("shop.generate_image_variants", args=[relative_path])
+        except Exception as e:
+            logger.warning("Could not queue variants for %s: %s", relative_path, e)
+
+    @staticmethod
+    async def get_by_hash(db: AsyncSession, sha256: str) -> Optional[MediaObject]:
+        result = await db.execute(select(MediaObject).where(MediaObject.sha256 == sha256.lower()))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_media(db: AsyncSession, sha256: str) -> MediaObject:
+        """Stored image by content hash (lets clients skip uploading bytes the store has)"""
+        media = await MediaController.get_by_hash(db, sha256)
+        if not media:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Media not found"
+            )
+        return media
+
+    @staticmethod
+    def describe(media: MediaObject) -> dict:
+        return {
+            "sha256": media.sha256,
+            "file_url": media_url(media.path),
+            "size": media.size,
+            "variants": variant_urls(media_url(media.path)),
+        }
+
+    # ==================== REFERENCES ====================
+
+    @staticmethod
+    async def swap_refs(db: AsyncSession, old_url: Optional[str], new_url: Optional[str]) -> None:
+        """
+        Move one reference from `old_url` to `new_url` (the caller commits).
+        URLs outside the store (external links, pre-store uploads) match no row.
+        """
+        if old_url == new_url:
+            return
+
+        new_path = media_relative_path(new_url)
+        if new_path:
+            # An orphan past its grace period could be collected between here and the commit
+            await MediaController._hold_off_gc(db)
+            await db.execute(
+                update(MediaObject)
+                .where(MediaObject.path == new_path)
+                .values(ref_count=MediaObject.ref_count + 1)
+            )
+
+        old_path = media_relative_path(old_url)
+        if old_path:
+            await db.execute(
+                update(MediaObject)
+                .where(MediaObject.path == old_path, MediaObject.ref_count > 0)
+                .values(ref_count=MediaObject.ref_count - 1, last_used_at=func.now())
+            )
+
+    # ==================== GARBAGE COLLECTION ====================
+
+    @staticmethod
+    def collect_garbage(session: Session, grace_seconds: int = settings.MEDIA_GC_GRACE_SECONDS) -> int:
+        """
+        Delete objects unreferenced for `grace_seconds`: rows, then their files,
+        in one transaction holding MEDIA_GC_LOCK. Uploads and attachments of
+        the same objects wait for the commit, then find no row and start afresh.
+        Synchronous: runs in the Celery worker on SessionLocal.
+        Returns: number of objects deleted
+        """
+        if session.bind.dialect.name == "postgresql":
+            session.execute(select(func.pg_advisory_xact_lock(MEDIA_GC_LOCK)))
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+        rows = session.execute(
+            delete(MediaObject)
+            .where(MediaObject.ref_count == 0, MediaObject.last_used_at < cutoff)
+            .returning(MediaObject.path)
+            .execution_options(synchronize_session=False)
+        ).all()
+        # If the commit fails after this, the rows stay and name missing files:
+        # the next run deletes them again, and store() re-places the bytes meanwhile
+        for row in rows:
+            for path in [row.path, *(variant_path(row.path, name) for name in IMAGE_VARIANTS)]:
+                delete_file(media_url(path))
+        session.commit()
+        return len(rows)
+
+    @staticmethod
+    async def _hold_off_gc(db: AsyncSession) -> None:
+        """Keep collect_garbage out until this transaction ends (PostgreSQL only; tests run one process)"""
+        if db.bind.dialect.name == "postgresql":
+            await db.execute(select(func.pg_advisory_xact_lock_shared(MEDIA_GC_LOCK)))
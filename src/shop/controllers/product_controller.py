@@ -2,15 +2,21 @@
 
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 from fastapi import HTTPException, status
 
 from src.shop.models import Product, Category
 from src.shop.schemas import ProductCreate, ProductUpdate, CategoryCreate, CategoryUpdate
+from src.shop.controllers.search_controller import ProductSearchController
+from src.shop.controllers.media_controller import MediaController
+from src.shop.cache import invalidate_product, invalidate_categories
+from src.core.loading import LoadProfile, load_profile
+from src.core.pagination import CursorPage, Keyset
 from src.core.app_logging import get_app_logger
 
-logger = get_app_logger()
+logger = get_app_logger(__name__)
+
+PRODUCTS_BY_ID = Keyset("products:id", Product.id)
 
 
 class ProductController:
@@ -25,7 +31,7 @@ class ProductController:
     ) -> Category:
         """Create a new category"""
         try:
-            logger.info(f"Creating new category: {category_data.name}")
+            logger.info("Creating new category: %s", category_data.name)
             
             # Check if slug exists
             result = await db.execute(
@@ -33,7 +39,7 @@ class ProductController:
             )
             
             if result.scalar_one_or_none():
-                logger.warning(f"Category slug already exists: {category_data.slug}")
+                logger.warning("Category slug already exists: %s", category_data.slug)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Category with this slug already exists"
@@ -41,16 +47,18 @@ class ProductController:
             
             category = Category(**category_data.model_dump())
             db.add(category)
+            await MediaController.swap_refs(db, None, category.image_url)
             await db.commit()
             await db.refresh(category)
+            await invalidate_categories()
             
-            logger.info(f"Successfully created category: {category.name} (ID: {category.id})")
+            logger.info("Successfully created category: %s (ID: %s)", category.name, category.id)
             return category
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error creating category {category_data.name}: {str(e)}")
+            logger.error("Error creating category %s: %s", category_data.name, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -61,26 +69,26 @@ class ProductController:
     async def get_category(db: AsyncSession, category_id: int) -> Category:
         """Get category by ID"""
         try:
-            logger.info(f"Fetching category ID: {category_id}")
+            logger.debug("Fetching category ID: %s", category_id)
             result = await db.execute(
                 select(Category).where(Category.id == category_id)
             )
             
             category = result.scalar_one_or_none()
             if not category:
-                logger.warning(f"Category ID {category_id} not found")
+                logger.warning("Category ID %s not found", category_id)
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Category not found"
                 )
             
-            logger.info(f"Retrieved category: {category.name}")
+            logger.debug("Retrieved category: %s", category.name)
             return category
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error fetching category ID {category_id}: {str(e)}")
+            logger.error("Error fetching category ID %s: %s", category_id, e)
             raise
 
     @staticmethod
@@ -90,7 +98,7 @@ class ProductController:
     ) -> List[Category]:
         """Get all categories"""
         try:
-            logger.info(f"Fetching categories (is_active={is_active})")
+            logger.debug("Fetching categories (is_active=%s)", is_active)
             
             query = select(Category)
             if is_active is not None:
@@ -99,11 +107,11 @@ class ProductController:
             result = await db.execute(query)
             categories = result.scalars().all()
             
-            logger.info(f"Retrieved {len(categories)} categories")
+            logger.debug("Retrieved %s categories", len(categories))
             return categories
             
         except Exception as e:
-            logger.error(f"Error fetching categories: {str(e)}")
+            logger.error("Error fetching categories: %s", e)
             raise
 
     @staticmethod
@@ -114,24 +122,27 @@ class ProductController:
     ) -> Category:
         """Update category"""
         try:
-            logger.info(f"Updating category ID: {category_id}")
+            logger.info("Updating category ID: %s", category_id)
             
             category = await ProductController.get_category(db, category_id)
+            old_image_url = category.image_url
             
             update_data = category_data.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(category, field, value)
             
+            await MediaController.swap_refs(db, old_image_url, category.image_url)
             await db.commit()
             await db.refresh(category)
+            await invalidate_categories()
             
-            logger.info(f"Successfully updated category ID: {category_id}")
+            logger.info("Successfully updated category ID: %s", category_id)
             return category
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating category ID {category_id}: {str(e)}")
+            logger.error("Error updating category ID %s: %s", category_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -140,20 +151,31 @@ class ProductController:
 
     @staticmethod
     async def delete_category(db: AsyncSession, category_id: int) -> None:
-        """Delete category"""
+        """Delete category together with its products"""
         try:
-            logger.info(f"Deleting category ID: {category_id}")
+            logger.info("Deleting category ID: %s", category_id)
             
             category = await ProductController.get_category(db, category_id)
+
+            # Products go with their category, deleted like delete_product does
+            # (products.category_id is ON DELETE SET NULL: left to the database,
+            # they would only be uncategorised)
+            products = await db.execute(select(Product).where(Product.category_id == category_id))
+            for product in products.scalars().all():
+                await MediaController.swap_refs(db, product.image_url, None)
+                await db.delete(product)
+
+            await MediaController.swap_refs(db, category.image_url, None)
             await db.delete(category)
             await db.commit()
+            await invalidate_categories(products_changed=True)
             
-            logger.info(f"Successfully deleted category ID: {category_id}")
+            logger.info("Successfully deleted category ID: %s", category_id)
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error deleting category ID {category_id}: {str(e)}")
+            logger.error("Error deleting category ID %s: %s", category_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -194,7 +216,7 @@ class ProductController:
     ) -> Product:
         """Create a new product"""
         try:
-            logger.info(f"Creating new product: {product_data.name}")
+            logger.info("Creating new product: %s", product_data.name)
             
             # ✅ Check if SKU exists
             result = await db.execute(
@@ -202,7 +224,7 @@ class ProductController:
             )
             
             if result.scalar_one_or_none():
-                logger.warning(f"Product SKU already exists: {product_data.sku}")
+                logger.warning("Product SKU already exists: %s", product_data.sku)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Product with this SKU already exists"
@@ -217,16 +239,17 @@ class ProductController:
             
             product = Product(**product_dict)
             db.add(product)
+            await MediaController.swap_refs(db, None, product.image_url)
             await db.commit()
-            await db.refresh(product)
+            await invalidate_product()
             
-            logger.info(f"Successfully created product: {product.name} (ID: {product.id})")
-            return product
+            logger.info("Successfully created product: %s (ID: %s)", product.name, product.id)
+            return await ProductController.get_product(db, product.id)
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error creating product {product_data.name}: {str(e)}")
+            logger.error("Error creating product %s: %s", product_data.name, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -237,33 +260,30 @@ class ProductController:
     async def get_product(db: AsyncSession, product_id: int) -> Product:
         """Get product by ID"""
         try:
-            logger.info(f"Fetching product ID: {product_id}")
+            logger.debug("Fetching product ID: %s", product_id)
             
-            # ✅ Load product WITH inventory and category relationships
+            # ✅ Load product WITH inventory (what ProductResponse renders)
             result = await db.execute(
                 select(Product)
-                .options(
-                    selectinload(Product.category),
-                    selectinload(Product.inventory)  # ✅ Load inventory
-                )
+                .options(*load_profile(Product, LoadProfile.DETAIL))
                 .where(Product.id == product_id)
             )
             
             product = result.scalar_one_or_none()
             if not product:
-                logger.warning(f"Product ID {product_id} not found")
+                logger.warning("Product ID %s not found", product_id)
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Product not found"
                 )
             
-            logger.info(f"Retrieved product: {product.name}")
+            logger.debug("Retrieved product: %s", product.name)
             return product
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error fetching product ID {product_id}: {str(e)}")
+            logger.error("Error fetching product ID %s: %s", product_id, e)
             raise
 
     @staticmethod
@@ -273,17 +293,27 @@ class ProductController:
         limit: int = 100,
         category_id: Optional[int] = None,
         is_active: Optional[bool] = None,
-        search: Optional[str] = None
-    ) -> List[Product]:
-        """Get products with filters"""
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get products with filters (cursor or skip/limit, stable id order; searches are ranked and paged by skip)"""
         try:
-            logger.info(f"Fetching products (skip={skip}, limit={limit}, category={category_id}, search={search})")
+            logger.debug("Fetching products (skip=%s, limit=%s, category=%s, search=%s)", skip, limit, category_id, search)
+            
+            if search and search.strip():
+                products = await ProductSearchController.search(
+                    db,
+                    search,
+                    skip=skip,
+                    limit=limit,
+                    category_id=category_id,
+                    is_active=is_active
+                )
+                logger.debug("Search '%s' matched %s products", search, len(products))
+                return CursorPage(products)
             
-            # ✅ Load products WITH inventory and category relationships
-            query = select(Product).options(
-                selectinload(Product.category),
-                selectinload(Product.inventory)  # ✅ Load inventory
-            )
+            # ✅ Load products WITH inventory (what ProductResponse renders)
+            query = select(Product).options(*load_profile(Product, LoadProfile.LIST))
             
             if category_id:
                 query = query.where(Product.category_id == category_id)
@@ -291,23 +321,19 @@ class ProductController:
             if is_active is not None:
                 query = query.where(Product.is_active == is_active)
             
-            if search:
-                query = query.where(
-                    or_(
-                        Product.name.ilike(f"%{search}%"),
-                        Product.sku.ilike(f"%{search}%")
-                    )
-                )
-            
-            query = query.offset(skip).limit(limit)
+            query = PRODUCTS_BY_ID.apply(query, cursor, limit)
+            if not cursor:
+                query = query.offset(skip)
             result = await db.execute(query)
-            products = result.scalars().all()
+            products = PRODUCTS_BY_ID.page(result.scalars().all(), limit)
             
-            logger.info(f"Retrieved {len(products)} products")
+            logger.debug("Retrieved %s products", len(products))
             return products
             
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching products: {str(e)}")
+            logger.error("Error fetching products: %s", e)
             raise
 
     @staticmethod
@@ -318,9 +344,10 @@ class ProductController:
     ) -> Product:
         """Update product"""
         try:
-            logger.info(f"Updating product ID: {product_id}")
+            logger.info("Updating product ID: %s", product_id)
             
             product = await ProductController.get_product(db, product_id)
+            old_image_url = product.image_url
             
             update_data = product_data.model_dump(exclude_unset=True)
             
@@ -336,26 +363,25 @@ class ProductController:
             for field, value in update_data.items():
                 setattr(product, field, value)
             
+            await MediaController.swap_refs(db, old_image_url, product.image_url)
             await db.commit()
+            await invalidate_product(product_id)
             
-            # Reload with category and inventory
+            # Reload with inventory
             result = await db.execute(
                 select(Product)
-                .options(
-                    selectinload(Product.category),
-                    selectinload(Product.inventory)
-                )
+                .options(*load_profile(Product, LoadProfile.DETAIL))
                 .where(Product.id == product_id)
             )
             product = result.scalar_one()
             
-            logger.info(f"Successfully updated product ID: {product_id}")
+            logger.info("Successfully updated product ID: %s", product_id)
             return product
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating product ID {product_id}: {str(e)}")
+            logger.error("Error updating product ID %s: %s", product_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -366,18 +392,20 @@ class ProductController:
     async def delete_product(db: AsyncSession, product_id: int) -> None:
         """Delete product"""
         try:
-            logger.info(f"Deleting product ID: {product_id}")
+            logger.info("Deleting product ID: %s", product_id)
             
             product = await ProductController.get_product(db, product_id)
+            await MediaController.swap_refs(db, product.image_url, None)
             await db.delete(product)
             await db.commit()
+            await invalidate_product(product_id)
             
-            logger.info(f"Successfully deleted product ID: {product_id}")
+            logger.info("Successfully deleted product ID: %s", product_id)
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error deleting product ID {product_id}: {str(e)}")
+            logger.error("Error deleting product ID %s: %s", product_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,181 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, cast, Date
+from sqlalchemy.orm import Session
+
+from src.shop.models import Sale, Inventory, Product, Shop
+from src.shop.schemas import SalesSummaryRequest, LowStockReportRequest
+from src.core.app_logging import get_app_logger
+from src.core.config import settings
+from src.core.dates import date_range
+from src.core.jobs import submit_job, job_status
+
+logger = get_app_logger(__name__)
+
+
+class ReportController:
+    """
+    Reports too heavy to build inside a request.
+
+    The API only queues a job on the `reports` queue and returns its id; the
+    worker builds the report on a sync session and the result waits in the
+    result backend (CELERY_RESULT_EXPIRES_SECONDS) for the client to poll.
+    Reports are JSON-ready dicts: amounts as strings, dates in ISO format.
+    """
+
+    # ==================== JOBS ====================
+
+    @staticmethod
+    async def request_sales_summary(data: SalesSummaryRequest) -> dict:
+        """Queue a sales summary over start_date..end_date (inclusive)"""
+        days = (data.end_date - data.start_date).days + 1
+        if days < 1 or days > settings.REPORT_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"end_date must be on or after start_date, at most {settings.REPORT_MAX_DAYS} days later"
+            )
+        return await ReportController._submit(
+            "sales_summary",
+            start_date=data.start_date.isoformat(),
+            end_date=data.end_date.isoformat(),
+            shop_id=data.shop_id
+        )
+
+    @staticmethod
+    async def request_low_stock(data: LowStockReportRequest) -> dict:
+        """Queue a low-stock report"""
+        return await ReportController._submit("low_stock", shop_id=data.shop_id)
+
+    @staticmethod
+    async def get_report(task_id: str) -> dict:
+        """Status of a report job, with the report once it has finished"""
+        job = await job_status(task_id)
+        if job["name"] is not None and not job["name"].startswith("reports."):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Report not found"
+            )
+        return {"task_id": task_id, "status": job["status"], "result": job["result"]}
+
+    # ==================== REPORTS ====================
+
+    @staticmethod
+    def sales_summary(
+        session: Session,
+        start_date: date,
+        end_date: date,
+        shop_id: Optional[int] = None
+    ) -> dict:
+        """
+        Sales count and total per business day, with per-shop and per-payment-method
+        breakdowns, from one GROUP BY over the date range
+        """
+        range_start, range_end = date_range(start_date, end_date)
+        day = ReportController._business_day(session, Sale.sale_date)
+
+        filters = [Sale.sale_date >= range_start, Sale.sale_date < range_end]
+        if shop_id:
+            filters.append(Sale.shop_id == shop_id)
+
+        groups = session.execute(
+            select(
+                day.label("day"),
+                Sale.shop_id,
+                Sale.payment_method,
+                func.count(Sale.id).label("sales_count"),
+                func.coalesce(func.sum(Sale.total_amount), 0).label("total_amount")
+            )
+            .where(*filters)
+            .group_by(day, Sale.shop_id, Sale.payment_method)
+            .order_by(day)
+        ).all()
+
+        days: Dict[str, dict] = {}
+        for group in groups:
+            key = str(group.day)  # date (PostgreSQL) or 'YYYY-MM-DD' (SQLite)
+            totals = days.setdefault(key, {
+                "date": key, "sales_count": 0, "total_amount": Decimal("0.00"),
+                "by_shop": {}, "by_payment_method": {},
+            })
+            amount = Decimal(group.total_amount)
+            payment_method = getattr(group.payment_method, "value", group.payment_method)
+            for bucket in (
+                totals,
+                totals["by_shop"].setdefault(group.shop_id, {"shop_id": group.shop_id, "sales_count": 0, "total_amount": Decimal("0.00")}),
+                totals["by_payment_method"].setdefault(payment_method, {"payment_method": payment_method, "sales_count": 0, "total_amount": Decimal("0.00")}),
+            ):
+                bucket["sales_count"] += group.sales_count
+                bucket["total_amount"] += amount
+
+        report_days = [
+            {
+                **totals,
+                "total_amount": str(totals["total_amount"]),
+                "by_shop": [
+                    {**shop, "total_amount": str(shop["total_amount"])}
+                    for _, shop in sorted(totals["by_shop"].items())
+                ],
+                "by_payment_method": [
+                    {**method, "total_amount": str(method["total_amount"])}
+                    for method in totals["by_payment_method"].values()
+                ],
+            }
+            for totals in days.values()
+        ]
+        return {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "shop_id": shop_id,
+            "total_sales_count": sum(totals["sales_count"] for totals in days.values()),
+            "total_amount": str(sum((totals["total_amount"] for totals in days.values()), Decimal("0.00"))),
+            "days": report_days,
+        }
+
+    @staticmethod
+    def low_stock(session: Session, shop_id: Optional[int] = None) -> dict:
+        """Every inventory row at or below its own min_stock_level, emptiest first, with product and shop names"""
+        query = (
+            select(
+                Inventory.id.label("inventory_id"),
+                Inventory.shop_id,
+                Shop.name.label("shop_name"),
+                Inventory.product_id,
+                Product.name.label("product_name"),
+                Product.sku,
+                Inventory.quantity,
+                Inventory.reserved_quantity,
+                Inventory.min_stock_level
+            )
+            .join(Product, Product.id == Inventory.product_id)
+            .join(Shop, Shop.id == Inventory.shop_id)
+            .where(Inventory.quantity <= Inventory.min_stock_level)
+            .order_by(Inventory.shop_id, Inventory.quantity, Inventory.id)
+        )
+        if shop_id:
+            query = query.where(Inventory.shop_id == shop_id)
+
+        items = [dict(row._mapping) for row in session.execute(query)]
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "shop_id": shop_id,
+            "count": len(items),
+            "items": items,
+        }
+
+    # ==================== HELPERS ====================
+
+    @staticmethod
+    async def _submit(name: str, **params) -> dict:
+        task_id = await submit_job(f"reports.{name}", **params)
+        logger.info("Queued report %s (%s)", name, task_id)
+        return {"task_id": task_id, "status": "PENDING", "result": None}
+
+    @staticmethod
+    def _business_day(session: Session, column):
+        """The business-timezone date of a timestamp column, computed in SQL"""
+        if session.bind.dialect.name == "postgresql":
+            return cast(func.timezone(settings.BUSINESS_TIMEZONE, column), Date)
+        return func.date(column)  # SQLite (tests): days in UTC
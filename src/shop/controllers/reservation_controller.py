@@ -0,0 +1,274 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update, insert, and_, case, func, Integer
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Update
+
+from src.shop.models import Inventory, StockReservation, ReservationStatus
+from src.shop.schemas import ReservationCreate
+from src.core.app_logging import get_app_logger
+from src.core.config import settings
+from src.core.metrics import STOCK_MUTATION_SECONDS, timed
+from src.core.sql import values_table
+
+logger = get_app_logger(__name__)
+
+ACTIVE = ReservationStatus.ACTIVE.value
+
+
+class ReservationController:
+    """
+    Time-limited stock holds.
+
+    A hold adds its quantity to inventory.reserved_quantity; converting it into
+    a sale, releasing it or letting it expire takes the quantity back out. Every
+    transition claims the hold rows with a guarded UPDATE on status = 'active',
+    so a hold is given back exactly once even if the sweeper and a checkout race.
+    """
+
+    # ==================== HOLDS ====================
+
+    @staticmethod
+    @timed(STOCK_MUTATION_SECONDS, operation="hold")
+    async def create_hold(
+        db: AsyncSession,
+        data: ReservationCreate,
+        user_id: Optional[int] = None
+    ) -> dict:
+        """Reserve a whole basket in one guarded UPDATE; all lines or none"""
+        lines: Dict[int, int] = defaultdict(int)
+        for item in data.items:
+            lines[item.product_id] += item.quantity
+
+        basket = values_table(
+            db,
+            "basket",
+            [("product_id", Integer()), ("quantity", Integer())],
+            lines.items()
+        )
+        result = await db.execute(
+            update(Inventory)
+            .where(
+                and_(
+                    Inventory.shop_id == data.shop_id,
+                    Inventory.product_id == basket.c.product_id,
+                    Inventory.quantity - Inventory.reserved_quantity >= basket.c.quantity
+                )
+            )
+            .values(reserved_quantity=Inventory.reserved_quantity + basket.c.quantity)
+            .returning(Inventory.id, Inventory.product_id)
+            .execution_options(synchronize_session="fetch")
+        )
+        inventory_ids = {row.product_id: row.id for row in result.all()}
+
+        short = [product_id for product_id in lines if product_id not in inventory_ids]
+        if short:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock for products {', '.join(map(str, short))}"
+            )
+
+        hold_token = uuid4().hex
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            seconds=data.ttl_seconds or settings.RESERVATION_TTL_SECONDS
+        )
+        result = await db.execute(
+            insert(StockReservation)
+            .values([
+                {
+                    "hold_token": hold_token,
+                    "inventory_id": inventory_ids[product_id],
+                    "shop_id": data.shop_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "status": ACTIVE,
+                    "expires_at": expires_at,
+                    "created_by": user_id,
+                }
+                for product_id, quantity in lines.items()
+            ])
+            .returning(
+                StockReservation.id,
+                StockReservation.inventory_id,
+                StockReservation.product_id,
+                StockReservation.quantity
+            )
+        )
+        items = [dict(row._mapping) for row in result.all()]
+        await db.commit()
+
+        return {
+            "hold_token": hold_token,
+            "shop_id": data.shop_id,
+            "status": ACTIVE,
+            "expires_at": expires_at,
+            "items": items,
+        }
+
+    @staticmethod
+    async def get_hold(db: AsyncSession, hold_token: str) -> dict:
+        """All lines held under a token"""
+        result = await db.execute(
+            select(StockReservation)
+            .where(StockReservation.hold_token == hold_token)
+            .order_by(StockReservation.id)
+        )
+        holds = result.scalars().all()
+        if not holds:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Reservation not found"
+            )
+
+        statuses = {hold.status for hold in holds}
+        return {
+            "hold_token": hold_token,
+            "shop_id": holds[0].shop_id,
+            "status": ACTIVE if ACTIVE in statuses else holds[0].status,
+            "expires_at": min(hold.expires_at for hold in holds),
+            "items": holds,
+        }
+
+    @staticmethod
+    @timed(STOCK_MUTATION_SECONDS, operation="unhold")
+    async def release_hold(db: AsyncSession, hold_token: str) -> None:
+        """Give a basket's held stock back before it expires"""
+        result = await db.execute(
+            ReservationController._claim(
+                ReservationStatus.RELEASED,
+                StockReservation.hold_token == hold_token
+            )
+        )
+        released = ReservationController._totals(result.all())
+        if not released:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No active reservation for this token"
+            )
+
+        await db.execute(ReservationController._unreserve(db, released))
+        await db.commit()
+
+    # ==================== CHECKOUT ====================
+
+    @staticmethod
+    async def held_quantities(db: AsyncSession, hold_token: str, shop_id: int) -> Dict[int, int]:
+        """{product_id: quantity} still held under a token in this shop (expired holds don't count)"""
+        result = await db.execute(
+            select(StockReservation.product_id, func.sum(StockReservation.quantity).label("quantity"))
+            .where(
+                StockReservation.hold_token == hold_token,
+                StockReservation.shop_id == shop_id,
+                StockReservation.status == ACTIVE,
+                StockReservation.expires_at > datetime.now(timezone.utc)
+            )
+            .group_by(StockReservation.product_id)
+        )
+        return {row.product_id: row.quantity for row in result.all()}
+
+    @staticmethod
+    async def convert_hold(
+        db: AsyncSession,
+        hold_token: str,
+        shop_id: int,
+        sale_id: int
+    ) -> Dict[int, int]:
+        """
+        Mark a token's live holds as converted into `sale_id` (caller commits)
+        Returns: {inventory_id: quantity} the caller must take out of reserved_quantity
+        """
+        result = await db.execute(
+            ReservationController._claim(
+                ReservationStatus.CONVERTED,
+                StockReservation.hold_token == hold_token,
+                StockReservation.shop_id == shop_id,
+                StockReservation.expires_at > datetime.now(timezone.utc),
+                sale_id=sale_id
+            )
+        )
+        return ReservationController._totals(result.all())
+
+    # ==================== EXPIRY ====================
+
+    @staticmethod
+    def expire_stale(session: Session, batch_size: int = settings.RESERVATION_SWEEP_BATCH_SIZE) -> int:
+        """
+        Give back every hold past its expiry, `batch_size` holds per transaction.
+        Synchronous: runs in the Celery worker on SessionLocal.
+        Returns: number of holds expired
+        """
+        expired = 0
+        while True:
+            batch = (
+                select(StockReservation.id)
+                .where(
+                    StockReservation.status == ACTIVE,
+                    StockReservation.expires_at <= datetime.now(timezone.utc)
+                )
+                .order_by(StockReservation.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = session.execute(
+                ReservationController._claim(
+                    ReservationStatus.EXPIRED,
+                    StockReservation.id.in_(batch.scalar_subquery())
+                )
+            ).all()
+
+            totals = ReservationController._totals(rows)
+            if totals:
+                session.execute(ReservationController._unreserve(session, totals))
+            session.commit()
+
+            expired += len(rows)
+            if len(rows) < batch_size:
+                return expired
+
+    # ==================== HELPERS ====================
+
+    @staticmethod
+    def _claim(new_status: ReservationStatus, *criteria, **values) -> Update:
+        """Move active holds matching `criteria` to `new_status`, returning what they held"""
+        return (
+            update(StockReservation)
+            .where(StockReservation.status == ACTIVE, *criteria)
+            .values(status=new_status.value, **values)
+            .returning(StockReservation.inventory_id, StockReservation.quantity)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _totals(rows: Iterable) -> Dict[int, int]:
+        totals: Dict[int, int] = defaultdict(int)
+        for row in rows:
+            totals[row.inventory_id] += row.quantity
+        return dict(totals)
+
+    @staticmethod
+    def _unreserve(db, totals: Dict[int, int]) -> Update:
+        """Take {inventory_id: quantity} out of reserved_quantity in one statement (never below 0)"""
+        basket = values_table(
+            db,
+            "released",
+            [("inventory_id", Integer()), ("quantity", Integer())],
+            totals.items()
+        )
+        return (
+            update(Inventory)
+            .where(Inventory.id == basket.c.inventory_id)
+            .values(
+                reserved_quantity=case(
+                    (Inventory.reserved_quantity > basket.c.quantity,
+                     Inventory.reserved_quantity - basket.c.quantity),
+                    else_=0
+                )
+            )
+            .execution_options(synchronize_session="fetch")
+        )
@@ -1,13 +1,32 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, and_, func
 from fastapi import HTTPException, status
 from datetime import datetime, date
 from decimal import Decimal
+from uuid import uuid4
 
-from src.shop.models import Sale, SaleItem, Return, Product, Inventory
-from src.shop.schemas import SaleCreate, ReturnCreate, ReturnUpdate
+from src.shop.models import Sale, SaleItem, Return, Inventory, MovementReason
+from src.shop.schemas import SaleCreate, SaleResponse, SaleItemResponse, ReturnCreate, ReturnUpdate
+from src.shop.controllers.sequence_controller import SequenceController
+from src.shop.controllers.inventory_controller import InventoryController
+from src.shop.controllers.catalog_controller import CatalogController
+from src.shop.controllers.reservation_controller import ReservationController
+from src.shop.controllers.ledger_controller import StockLedgerController
+from src.core.loading import LoadProfile, load_profile
+from src.core.pagination import CursorPage, Keyset
+from src.core.responses import schema_columns
+from src.core.dates import business_today, day_range, date_range
+from src.core.metrics import CHECKOUT_SECONDS, timed
+
+
+# ==================== SORT KEYS ====================
+SALES_RECENT = Keyset("sales:recent", Sale.sale_date, Sale.id, descending=True)
+RETURNS_RECENT = Keyset("returns:recent", Return.return_date, Return.id, descending=True)
+
+# get_sales selects only what SaleResponse renders
+SALE_COLUMNS = schema_columns(Sale, SaleResponse)
+SALE_ITEM_COLUMNS = schema_columns(SaleItem, SaleItemResponse)
 
 
 class SalesController:
@@ -15,136 +34,177 @@ class SalesController:
 
     # ==================== TODAY'S SALES ====================
     @staticmethod
-    async def get_todays_sales(db: AsyncSession) -> dict:
+    async def get_todays_sales(
+        db: AsyncSession,
+        shop_id: Optional[int] = None,
+        include_sales: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
         """
-        Get today's sales with summary statistics
+        Get today's sales summary
+        Totals and per-payment-method / per-shop breakdowns come from a single
+        GROUP BY; the sales themselves are only loaded (one page) on request.
         Returns:
-            dict: Contains date, total_sales_count, total_amount, and sales list
+            dict: date, total_sales_count, total_amount, by_payment_method, by_shop, sales
         """
-        today = date.today()
-        
-        # ✅ OPTIMIZED: Simple query without relationships
-        query = (
-            select(Sale)
-            .where(func.date(Sale.created_at) == today)
-            .order_by(Sale.created_at.desc())
+        today = business_today()
+        day_start, day_end = day_range(today)
+
+        # Half-open range on sale_date (index range scan, no date() per row)
+        filters = [Sale.sale_date >= day_start, Sale.sale_date < day_end]
+        if shop_id:
+            filters.append(Sale.shop_id == shop_id)
+
+        result = await db.execute(
+            select(
+                Sale.shop_id,
+                Sale.payment_method,
+                func.count(Sale.id).label("sales_count"),
+                func.coalesce(func.sum(Sale.total_amount), 0).label("total_amount")
+            )
+            .where(*filters)
+            .group_by(Sale.shop_id, Sale.payment_method)
         )
-        
-        result = await db.execute(query)
-        todays_sales = result.scalars().all()
-        
-        # Calculate totals
-        total_sales_count = len(todays_sales)
-        total_amount = sum(
-            sale.total_amount for sale in todays_sales
-        ) if todays_sales else Decimal('0.00')
-        
-        return {
+        groups = result.all()
+
+        by_payment_method: Dict[Any, dict] = {}
+        by_shop: Dict[int, dict] = {}
+        for group in groups:
+            for key, bucket, label in (
+                (group.payment_method, by_payment_method, "payment_method"),
+                (group.shop_id, by_shop, "shop_id"),
+            ):
+                totals = bucket.setdefault(
+                    key, {label: key, "sales_count": 0, "total_amount": Decimal("0.00")}
+                )
+                totals["sales_count"] += group.sales_count
+                totals["total_amount"] += Decimal(group.total_amount)
+
+        summary = {
             "date": today,
-            "total_sales_count": total_sales_count,
-            "total_amount": total_amount,
-            "sales": todays_sales
+            "total_sales_count": sum(group.sales_count for group in groups),
+            "total_amount": sum((Decimal(group.total_amount) for group in groups), Decimal("0.00")),
+            "by_payment_method": list(by_payment_method.values()),
+            "by_shop": sorted(by_shop.values(), key=lambda totals: totals["shop_id"]),
+            "sales": None
         }
 
+        if include_sales:
+            query = SALES_RECENT.apply(select(Sale).where(*filters), cursor, limit)
+            result = await db.execute(query)
+            summary["sales"] = SALES_RECENT.page(result.scalars().all(), limit)
+
+        return summary
+
     # ==================== INVOICE GENERATION ====================
     @staticmethod
     async def generate_invoice_number(db: AsyncSession) -> str:
         """Generate unique invoice number"""
         # Format: INV-YYYYMMDD-XXXXXX
-        date_str = datetime.now().strftime("%Y%m%d")
-        
-        # Get count of sales today
-        result = await db.execute(
-            select(func.count(Sale.id)).where(
-                func.date(Sale.sale_date) == datetime.now().date()
-            )
-        )
-        count = result.scalar() or 0
-        invoice_number = f"INV-{date_str}-{(count + 1):06d}"
-        
-        return invoice_number
+        date_str, number = await SequenceController.next_value(db, "invoice")
+        return f"INV-{date_str}-{number:06d}"
 
     @staticmethod
     async def generate_return_number(db: AsyncSession) -> str:
         """Generate unique return number"""
         # Format: RET-YYYYMMDD-XXXX
-        date_str = datetime.now().strftime("%Y%m%d")
-        
-        result = await db.execute(
-            select(func.count(Return.id)).where(
-                func.date(Return.return_date) == datetime.now().date()
+        date_str, number = await SequenceController.next_value(db, "return")
+        return f"RET-{date_str}-{number:04d}"
+
+    # ==================== CREATE SALE ====================
+    @staticmethod
+    async def _load_basket(
+        db: AsyncSession,
+        sale_data: SaleCreate
+    ) -> Tuple[Dict[int, Any], Dict[int, Any]]:
+        """
+        Load every product and inventory row the basket touches.
+        One set-based query each, regardless of how many lines the basket has.
+        Returns: ({product_id: product_row}, {product_id: inventory_row})
+        """
+        product_ids = {item.product_id for item in sale_data.items}
+
+        # Catalog fields come from the catalog cache; stock is always read live
+        products = await CatalogController.get_products_by_ids(db, product_ids)
+
+        inventory_result = await db.execute(
+            select(
+                Inventory.id,
+                Inventory.product_id,
+                Inventory.quantity,
+                Inventory.reserved_quantity
+            ).where(
+                and_(
+                    Inventory.shop_id == sale_data.shop_id,
+                    Inventory.product_id.in_(product_ids)
+                )
             )
         )
-        count = result.scalar() or 0
-        return_number = f"RET-{date_str}-{(count + 1):04d}"
-        
-        return return_number
+        inventory = {row.product_id: row for row in inventory_result}
+
+        return products, inventory
 
-    # ==================== CREATE SALE ====================
     @staticmethod
+    @timed(CHECKOUT_SECONDS)
     async def create_sale(
         db: AsyncSession,
         sale_data: SaleCreate,
         staff_id: int
     ) -> Sale:
-        """Create a new sale with items"""
-        # Generate invoice number
-        invoice_number = await SalesController.generate_invoice_number(db)
-        
-        # Calculate totals
-        subtotal = Decimal('0')
-        sale_items_data = []
-        
+        """Create a new sale with items (converting the basket's reservation hold, if any)"""
+        products, inventory = await SalesController._load_basket(db, sale_data)
+
+        # Stock held for this basket counts as available to it
+        held: Dict[int, int] = {}
+        if sale_data.hold_token:
+            held = await ReservationController.held_quantities(db, sale_data.hold_token, sale_data.shop_id)
+
+        # Validate the whole basket in memory (same product may appear on several lines)
+        requested: Dict[int, int] = {}
         for item in sale_data.items:
-            # Get product details
-            product_result = await db.execute(
-                select(Product).where(Product.id == item.product_id)
-            )
-            product = product_result.scalar_one_or_none()
-            
+            product = products.get(item.product_id)
             if not product:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Product {item.product_id} not found"
                 )
-            
-            # Check stock availability
-            inventory_result = await db.execute(
-                select(Inventory).where(
-                    and_(
-                        Inventory.product_id == item.product_id,
-                        Inventory.shop_id == sale_data.shop_id
-                    )
-                )
-            )
-            inventory = inventory_result.scalar_one_or_none()
-            
-            if not inventory or inventory.available_quantity < item.quantity:
+
+            requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+            stock = inventory.get(item.product_id)
+            available = stock.quantity - stock.reserved_quantity + held.get(item.product_id, 0) if stock else 0
+            if available < requested[item.product_id]:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Insufficient stock for {product.name}"
                 )
-            
-            # Calculate item total
+
+        # Calculate totals
+        subtotal = Decimal('0')
+        sale_items_data = []
+        for item in sale_data.items:
+            product = products[item.product_id]
             item_total = (item.unit_price * item.quantity) - item.discount
             subtotal += item_total
-            
-            # Store item data for later
+
             sale_items_data.append({
-                'product': product,
-                'inventory': inventory,
-                'item_data': item,
-                'item_total': item_total
+                'product_id': product.id,
+                'product_name': product.name,
+                'product_sku': product.sku,
+                'quantity': item.quantity,
+                'unit_price': item.unit_price,
+                'discount': item.discount,
+                'total_price': item_total
             })
-        
+
         # Calculate tax (example: 18% GST)
         tax_amount = subtotal * Decimal('0.18')
         discount_amount = Decimal('0')  # Can be added from sale_data if needed
         total_amount = subtotal + tax_amount - discount_amount
-        
-        # Create sale
+
+        # Create sale (numbered just before commit, see below)
         sale = Sale(
-            invoice_number=invoice_number,
+            invoice_number=f"PENDING-{uuid4().hex}",
             shop_id=sale_data.shop_id,
             customer_id=sale_data.customer_id,
             staff_id=staff_id,
@@ -157,56 +217,75 @@ class SalesController:
             status="completed",
             notes=sale_data.notes
         )
-        
+
         db.add(sale)
         await db.flush()  # Get sale.id
-        
-        # Create sale items and update inventory
-        for item_data in sale_items_data:
-            product = item_data['product']
-            inventory = item_data['inventory']
-            item = item_data['item_data']
-            item_total = item_data['item_total']
-            
-            # Create sale item
-            sale_item = SaleItem(
-                sale_id=sale.id,
-                product_id=product.id,
-                product_name=product.name,
-                product_sku=product.sku,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                discount=item.discount,
-                total_price=item_total
+
+        # All sale lines in one multi-row INSERT
+        for row in sale_items_data:
+            row['sale_id'] = sale.id
+        await db.execute(insert(SaleItem).values(sale_items_data))
+
+        # Claim the hold (only what hasn't expired meanwhile); its whole quantity
+        # leaves reserved_quantity, including lines the customer didn't buy
+        converted: Dict[int, int] = {}
+        if sale_data.hold_token:
+            converted = await ReservationController.convert_hold(
+                db, sale_data.hold_token, sale_data.shop_id, sale.id
             )
-            db.add(sale_item)
-            
-            # Update inventory
-            inventory.quantity -= item.quantity
-        
+
+        # All inventory rows in one guarded UPDATE ... FROM (VALUES ...); the guard
+        # catches a concurrent checkout that took the stock after we validated it
+        short = await InventoryController.decrement_available_many(
+            db,
+            {inventory[product_id].id: quantity for product_id, quantity in requested.items()},
+            held=converted
+        )
+        if short:
+            await db.rollback()
+            names = [
+                products[product_id].name
+                for product_id in requested
+                if inventory[product_id].id in short
+            ]
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock for {', '.join(names)}"
+            )
+
+        await StockLedgerController.record(db, [
+            StockLedgerController.entry(
+                inventory[product_id].id, sale_data.shop_id, product_id,
+                -quantity, MovementReason.SALE, sale_id=sale.id
+            )
+            for product_id, quantity in requested.items()
+        ])
+
+        # Number the invoice last: the day's counter row stays locked until the
+        # commit, so only this UPDATE and the commit queue behind other checkouts
+        sale.invoice_number = await SalesController.generate_invoice_number(db)
         await db.commit()
-        
-        # Reload with relationships
+
+        # Reload with what SaleResponse renders
         result = await db.execute(
             select(Sale)
-            .options(selectinload(Sale.items))
+            .options(*load_profile(Sale, LoadProfile.DETAIL))
             .where(Sale.id == sale.id)
         )
-        
+
         return result.scalar_one()
 
     # ==================== GET SALES ====================
     @staticmethod
-    async def get_sale(db: AsyncSession, sale_id: int) -> Sale:
-        """Get single sale by ID with full details"""
+    async def get_sale(
+        db: AsyncSession,
+        sale_id: int,
+        profile: LoadProfile = LoadProfile.DETAIL
+    ) -> Sale:
+        """Get single sale by ID, loading what the given profile needs"""
         result = await db.execute(
             select(Sale)
-            .options(
-                selectinload(Sale.items),
-                selectinload(Sale.customer),
-                selectinload(Sale.staff),
-                selectinload(Sale.shop)
-            )
+            .options(*load_profile(Sale, profile))
             .where(Sale.id == sale_id)
         )
         
@@ -227,17 +306,16 @@ class SalesController:
         shop_id: Optional[int] = None,
         customer_id: Optional[int] = None,
         status: Optional[str] = None,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> List[Sale]:
-        """Get list of sales with filters"""
-        query = (
-            select(Sale)
-            .options(selectinload(Sale.items))
-            .offset(skip)
-            .limit(limit)
-            .order_by(Sale.sale_date.desc())
-        )
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """
+        Get list of sales with filters, newest first (cursor or skip/limit),
+        as SaleResponse-shaped dicts
+        start_date/end_date are inclusive business days
+        """
+        query = select(*SALE_COLUMNS)
         
         # Apply filters
         if shop_id:
@@ -246,13 +324,33 @@ class SalesController:
             query = query.where(Sale.customer_id == customer_id)
         if status:
             query = query.where(Sale.status == status)
-        if start_date:
-            query = query.where(Sale.sale_date >= start_date)
-        if end_date:
-            query = query.where(Sale.sale_date <= end_date)
+        range_start, range_end = date_range(start_date, end_date)
+        if range_start:
+            query = query.where(Sale.sale_date >= range_start)
+        if range_end:
+            query = query.where(Sale.sale_date < range_end)
+
+        query = SALES_RECENT.apply(query, cursor, limit)
+        if not cursor:
+            query = query.offset(skip)
         
         result = await db.execute(query)
-        return result.scalars().all()
+        page = SALES_RECENT.page(result.all(), limit)
+
+        sales = [dict(row._mapping) for row in page]
+        items: Dict[int, List[dict]] = {}
+        if sales:
+            result = await db.execute(
+                select(*SALE_ITEM_COLUMNS)
+                .where(SaleItem.sale_id.in_([sale["id"] for sale in sales]))
+                .order_by(SaleItem.id)
+            )
+            for row in result.all():
+                items.setdefault(row.sale_id, []).append(dict(row._mapping))
+
+        for sale in sales:
+            sale["items"] = items.get(sale["id"], [])
+        return CursorPage(sales, page.next_cursor)
 
     # ==================== CANCEL SALE ====================
     @staticmethod
@@ -262,7 +360,7 @@ class SalesController:
         reason: Optional[str] = None
     ) -> Sale:
         """Cancel a sale and restore inventory"""
-        sale = await SalesController.get_sale(db, sale_id)
+        sale = await SalesController.get_sale(db, sale_id, LoadProfile.CHECKOUT)
         
         if sale.status == "cancelled":
             raise HTTPException(
@@ -270,19 +368,31 @@ class SalesController:
                 detail="Sale is already cancelled"
             )
         
-        # Restore inventory for each item
-        for item in sale.items:
-            inventory_result = await db.execute(
-                select(Inventory).where(
-                    and_(
-                        Inventory.product_id == item.product_id,
-                        Inventory.shop_id == sale.shop_id
-                    )
+        # Restore inventory for all items in one statement
+        inventory_result = await db.execute(
+            select(Inventory.id, Inventory.product_id).where(
+                and_(
+                    Inventory.shop_id == sale.shop_id,
+                    Inventory.product_id.in_({item.product_id for item in sale.items})
                 )
             )
-            inventory = inventory_result.scalar_one_or_none()
-            if inventory:
-                inventory.quantity += item.quantity
+        )
+        inventory_ids = {row.product_id: row.id for row in inventory_result}
+
+        restock: Dict[int, int] = {}
+        for item in sale.items:
+            inventory_id = inventory_ids.get(item.product_id)
+            if inventory_id:
+                restock[inventory_id] = restock.get(inventory_id, 0) + item.quantity
+        await InventoryController.restock_many(db, restock)
+        await StockLedgerController.record(db, [
+            StockLedgerController.entry(
+                inventory_id, sale.shop_id, product_id,
+                restock[inventory_id], MovementReason.SALE_CANCELLED, sale_id=sale.id
+            )
+            for product_id, inventory_id in inventory_ids.items()
+            if inventory_id in restock
+        ])
         
         # Update sale status
         sale.status = "cancelled"
@@ -302,7 +412,7 @@ class SalesController:
     ) -> Return:
         """Create a product return"""
         # Verify sale exists
-        sale = await SalesController.get_sale(db, return_data.sale_id)
+        sale = await SalesController.get_sale(db, return_data.sale_id, LoadProfile.CHECKOUT)
         
         # Verify product was in the sale
         sale_item = None
@@ -358,7 +468,7 @@ class SalesController:
         """Process (approve/reject) a return"""
         result = await db.execute(
             select(Return)
-            .options(selectinload(Return.sale))
+            .options(*load_profile(Return, LoadProfile.CHECKOUT))
             .where(Return.id == return_id)
         )
         product_return = result.scalar_one_or_none()
@@ -383,16 +493,22 @@ class SalesController:
         # If approved, restore inventory
         if return_update.status == "approved":
             inventory_result = await db.execute(
-                select(Inventory).where(
+                select(Inventory.id).where(
                     and_(
                         Inventory.product_id == product_return.product_id,
                         Inventory.shop_id == product_return.sale.shop_id
                     )
                 )
             )
-            inventory = inventory_result.scalar_one_or_none()
-            if inventory:
-                inventory.quantity += product_return.quantity
+            inventory_id = inventory_result.scalar_one_or_none()
+            if inventory_id:
+                await InventoryController.restock_many(db, {inventory_id: product_return.quantity})
+                await StockLedgerController.record(db, [
+                    StockLedgerController.entry(
+                        inventory_id, product_return.sale.shop_id, product_return.product_id,
+                        product_return.quantity, MovementReason.RETURN, return_id=product_return.id
+                    )
+                ])
         
         await db.commit()
         await db.refresh(product_return)
@@ -404,18 +520,18 @@ class SalesController:
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-        status: Optional[str] = None
-    ) -> List[Return]:
-        """Get list of returns"""
-        query = (
-            select(Return)
-            .offset(skip)
-            .limit(limit)
-            .order_by(Return.return_date.desc())
-        )
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get list of returns, newest first (cursor or skip/limit)"""
+        query = select(Return)
         
         if status:
             query = query.where(Return.status == status)
+
+        query = RETURNS_RECENT.apply(query, cursor, limit)
+        if not cursor:
+            query = query.offset(skip)
         
         result = await db.execute(query)
-        return result.scalars().all()
+        return RETURNS_RECENT.page(result.scalars().all(), limit)
@@ -0,0 +1,178 @@
+"""
+Product search.
+
+On PostgreSQL, products carry a generated `search_vector` tsvector (name,
+brand, model, description, specifications - weighted A/B/C) with a GIN index,
+and `name` / `sku` have pg_trgm GIN indexes. A search is one indexed query:
+
+- full-text match on every word, each as a prefix (type-ahead: "gal s2" finds "Galaxy S24")
+- trigram match on name / SKU for typos and partial SKUs
+- ranked by ts_rank_cd + name similarity + an exact/prefix SKU boost
+
+Both live only in the database (see migration 3f8a2c71d9b4), so SQLite test
+databases fall back to a LIKE prefilter ranked in Python with the same weights.
+"""
+import re
+from difflib import SequenceMatcher
+from typing import List, Optional
+
+from sqlalchemy import Boolean, Float, case, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shop.models import Product
+from src.core.loading import LoadProfile, load_profile
+from src.core.metrics import PRODUCT_SEARCH_SECONDS, timed
+
+SEARCH_CONFIG = "simple"  # No stemming: model names and brands aren't English words
+
+# Same weights as the setweight() labels in the generated column
+FIELD_WEIGHTS = {
+    "name": 1.0,
+    "brand": 0.4,
+    "model": 0.4,
+    "description": 0.1,
+    "specifications": 0.1,
+}
+SKU_EXACT_BOOST = 2.0
+SKU_PREFIX_BOOST = 1.0
+
+LIKE_ESCAPE = "/"  # Not backslash: its quoting differs between PostgreSQL string settings
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def search_words(term: str) -> List[str]:
+    """Lowercased alphanumeric words of a search term"""
+    return _WORD.findall(term.lower())
+
+
+def prefix_tsquery(words: List[str]) -> str:
+    """'gal s2' -> 'gal:* & s2:*' (every word must match, as a prefix)"""
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+class ProductSearchController:
+    """Ranked product search"""
+
+    @staticmethod
+    @timed(PRODUCT_SEARCH_SECONDS)
+    async def search(
+        db: AsyncSession,
+        term: str,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        is_active: Optional[bool] = None
+    ) -> List[Product]:
+        """Products matching `term`, best match first"""
+        term = term.strip()
+        query = select(Product).options(*load_profile(Product, LoadProfile.LIST))
+
+        if category_id:
+            query = query.where(Product.category_id == category_id)
+
+        if is_active is not None:
+            query = query.where(Product.is_active == is_active)
+
+        if db.bind.dialect.name == "postgresql":
+            return await ProductSearchController._search_postgres(db, query, term, skip, limit)
+        return await ProductSearchController._search_fallback(db, query, term, skip, limit)
+
+    # ==================== POSTGRESQL ====================
+
+    @staticmethod
+    async def _search_postgres(db: AsyncSession, query, term: str, skip: int, limit: int) -> List[Product]:
+        words = search_words(term)
+        sku_prefix = f"{_like_escape(term)}%"
+
+        matches = [
+            Product.name.bool_op("%")(term),
+            Product.sku.bool_op("%")(term),
+            Product.sku.ilike(sku_prefix, escape=LIKE_ESCAPE),
+        ]
+        rank = (
+            func.similarity(Product.name, term)
+            + case(
+                (func.lower(Product.sku) == term.lower(), SKU_EXACT_BOOST),
+                (Product.sku.ilike(sku_prefix, escape=LIKE_ESCAPE), SKU_PREFIX_BOOST),
+                else_=0.0
+            )
+        )
+
+        if words:
+            vector = literal_column("products.search_vector")
+            tsquery = func.to_tsquery(SEARCH_CONFIG, prefix_tsquery(words))
+            matches.append(vector.op("@@", return_type=Boolean)(tsquery))
+            rank = rank + func.ts_rank_cd(vector, tsquery, type_=Float)
+
+        query = (
+            query.where(or_(*matches))
+            .order_by(rank.desc(), Product.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    # ==================== FALLBACK (SQLite) ====================
+
+    @staticmethod
+    async def _search_fallback(db: AsyncSession, query, term: str, skip: int, limit: int) -> List[Product]:
+        words = search_words(term)
+
+        matches = [Product.sku.ilike(f"%{_like_escape(term)}%", escape=LIKE_ESCAPE)]
+        for field in FIELD_WEIGHTS:
+            column = getattr(Product, field)
+            matches.extend(column.ilike(f"%{_like_escape(word)}%", escape=LIKE_ESCAPE) for word in words)
+
+        result = await db.execute(query.where(or_(*matches)))
+        candidates = result.scalars().all()
+
+        ranked = [
+            (score, product)
+            for product in candidates
+            if (score := ProductSearchController.rank(product, term, words)) > 0
+        ]
+        ranked.sort(key=lambda scored: (-scored[0], scored[1].id))
+        return [product for _, product in ranked[skip:skip + limit]]
+
+    @staticmethod
+    def rank(product: Product, term: str, words: List[str]) -> float:
+        """In-process approximation of the PostgreSQL rank (0 = no match)"""
+        lowered = term.lower()
+        sku = (product.sku or "").lower()
+        score = 0.0
+
+        if sku == lowered:
+            score += SKU_EXACT_BOOST
+        elif lowered and sku.startswith(lowered):
+            score += SKU_PREFIX_BOOST
+        elif lowered and lowered in sku:
+            score += 0.3
+
+        # Full-text part: every word must prefix-match some field
+        field_words = {
+            field: search_words(getattr(product, field) or "")
+            for field in FIELD_WEIGHTS
+        }
+        text_score = 0.0
+        for word in words:
+            hits = [
+                FIELD_WEIGHTS[field]
+                for field, values in field_words.items()
+                if any(value.startswith(word) for value in values)
+            ]
+            if not hits:
+                text_score = 0.0
+                break
+            text_score += max(hits)
+
+        if text_score:
+            similarity = SequenceMatcher(None, lowered, (product.name or "").lower()).ratio()
+            score += text_score + similarity
+
+        return score
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.shop.models import DocumentCounter
+from src.core.config import settings
+from src.core.dates import business_today
+
+
+class SequenceController:
+    """
+    Hands out invoice/return numbers from per-day counter rows.
+
+    Each allocation is a single upsert on a unique (name, period) row, so it
+    costs O(1) regardless of how many sales exist and two concurrent checkouts
+    can never receive the same value.
+    """
+
+    # Block-prefetch state per worker: (name, period) -> [next_value, last_value]
+    _blocks: Dict[Tuple[str, str], list] = {}
+    _lock = asyncio.Lock()
+
+    @staticmethod
+    async def allocate(
+        db: AsyncSession,
+        name: str,
+        period: str,
+        count: int = 1
+    ) -> int:
+        """
+        Reserve `count` consecutive values for (name, period)
+        Returns: the last reserved value
+        """
+        dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+        stmt = dialect_insert(DocumentCounter).values(name=name, period=period, value=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentCounter.name, DocumentCounter.period],
+            set_={"value": DocumentCounter.value + count}
+        ).returning(DocumentCounter.value)
+
+        result = await db.execute(stmt)
+        return result.scalar_one()
+
+    @staticmethod
+    async def next_value(
+        db: AsyncSession,
+        name: str,
+        block_size: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """
+        Get the next value for today's counter
+        Returns: (period, value)
+        """
+        period = business_today().strftime("%Y%m%d")
+        block_size = block_size or settings.DOCUMENT_NUMBER_BLOCK_SIZE
+
+        # Allocate inside the caller's transaction (rolled back together with it).
+        # The counter row stays locked until that transaction ends, so callers
+        # allocate as their last statement before committing
+        if block_size <= 1:
+            return period, await SequenceController.allocate(db, name, period)
+
+        # Block mode: reserve a range in a short transaction of its own and
+        # serve it from memory. Unused numbers are skipped if the worker dies.
+        key = (name, period)
+        async with SequenceController._lock:
+            block = SequenceController._blocks.get(key)
+            if not block or block[0] > block[1]:
+                async with AsyncSession(bind=db.bind) as counter_db:
+                    last = await SequenceController.allocate(counter_db, name, period, block_size)
+                    await counter_db.commit()
+                block = [last - block_size + 1, last]
+                # Drop blocks from previous days
+                SequenceController._blocks = {
+                    k: v for k, v in SequenceController._blocks.items() if k[1] == period
+                }
+                SequenceController._blocks[key] = block
+
+            value = block[0]
+            block[0] += 1
+
+        return period, value
@@ -2,14 +2,19 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 from fastapi import HTTPException, status
 
 from src.shop.models import Shop, ShopStaff
 from src.shop.schemas import ShopCreate, ShopUpdate, ShopStaffCreate
+from src.accounts.principal import principal_cache
+from src.core.pagination import CursorPage, Keyset
+from src.core.http_cache import stamp
 from src.core.app_logging import get_app_logger
 
-logger = get_app_logger()
+logger = get_app_logger(__name__)
+
+SHOPS_BY_ID = Keyset("shops:id", Shop.id)
 
 
 class ShopController:
@@ -19,14 +24,14 @@ class ShopController:
     async def create_shop(db: AsyncSession, shop_data: ShopCreate) -> Shop:
         """Create a new shop"""
         try:
-            logger.info(f"Creating new shop: {shop_data.name}")
+            logger.info("Creating new shop: %s", shop_data.name)
             
             # Check if shop name already exists
             result = await db.execute(
                 select(Shop).where(Shop.name == shop_data.name)
             )
             if result.scalar_one_or_none():
-                logger.warning(f"Shop name already exists: {shop_data.name}")
+                logger.warning("Shop name already exists: %s", shop_data.name)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Shop with this name already exists"
@@ -37,13 +42,13 @@ class ShopController:
             await db.commit()
             await db.refresh(shop)
             
-            logger.info(f"Successfully created shop: {shop.name} (ID: {shop.id})")
+            logger.info("Successfully created shop: %s (ID: %s)", shop.name, shop.id)
             return shop
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error creating shop {shop_data.name}: {str(e)}")
+            logger.error("Error creating shop %s: %s", shop_data.name, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -54,29 +59,27 @@ class ShopController:
     async def get_shop(db: AsyncSession, shop_id: int) -> Shop:
         """Get shop by ID"""
         try:
-            logger.info(f"Fetching shop ID: {shop_id}")
+            logger.debug("Fetching shop ID: %s", shop_id)
             
             result = await db.execute(
-                select(Shop)
-                .options(selectinload(Shop.staff))
-                .where(Shop.id == shop_id)
+                select(Shop).where(Shop.id == shop_id)
             )
             shop = result.scalar_one_or_none()
             
             if not shop:
-                logger.warning(f"Shop ID {shop_id} not found")
+                logger.warning("Shop ID %s not found", shop_id)
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Shop not found"
                 )
             
-            logger.info(f"Retrieved shop: {shop.name}")
+            logger.debug("Retrieved shop: %s", shop.name)
             return shop
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error fetching shop ID {shop_id}: {str(e)}")
+            logger.error("Error fetching shop ID %s: %s", shop_id, e)
             raise
 
     @staticmethod
@@ -84,24 +87,29 @@ class ShopController:
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-        is_active: Optional[bool] = None
-    ) -> List[Shop]:
-        """Get list of shops"""
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get list of shops (cursor or skip/limit, stable id order)"""
         try:
-            logger.info(f"Fetching shops (skip={skip}, limit={limit}, is_active={is_active})")
+            logger.debug("Fetching shops (skip=%s, limit=%s, is_active=%s)", skip, limit, is_active)
             
-            query = select(Shop).offset(skip).limit(limit)
+            query = select(Shop)
             if is_active is not None:
                 query = query.where(Shop.is_active == is_active)
+
+            query = SHOPS_BY_ID.apply(query, cursor, limit)
+            if not cursor:
+                query = query.offset(skip)
                 
             result = await db.execute(query)
-            shops = result.scalars().all()
+            shops = SHOPS_BY_ID.page(result.scalars().all(), limit)
             
-            logger.info(f"Retrieved {len(shops)} shops")
+            logger.debug("Retrieved %s shops", len(shops))
             return shops
             
         except Exception as e:
-            logger.error(f"Error fetching shops: {str(e)}")
+            logger.error("Error fetching shops: %s", e)
             raise
 
     @staticmethod
@@ -112,7 +120,7 @@ class ShopController:
     ) -> Shop:
         """Update shop details"""
         try:
-            logger.info(f"Updating shop ID: {shop_id}")
+            logger.info("Updating shop ID: %s", shop_id)
             
             shop = await ShopController.get_shop(db, shop_id)
             update_data = shop_data.model_dump(exclude_unset=True)
@@ -123,13 +131,13 @@ class ShopController:
             await db.commit()
             await db.refresh(shop)
             
-            logger.info(f"Successfully updated shop ID: {shop_id}")
+            logger.info("Successfully updated shop ID: %s", shop_id)
             return shop
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating shop ID {shop_id}: {str(e)}")
+            logger.error("Error updating shop ID %s: %s", shop_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -140,18 +148,24 @@ class ShopController:
     async def delete_shop(db: AsyncSession, shop_id: int) -> None:
         """Delete shop"""
         try:
-            logger.info(f"Deleting shop ID: {shop_id}")
+            logger.info("Deleting shop ID: %s", shop_id)
             
             shop = await ShopController.get_shop(db, shop_id)
+            result = await db.execute(
+                select(ShopStaff.user_id).where(ShopStaff.shop_id == shop_id)
+            )
+            staff_user_ids = result.scalars().all()
             await db.delete(shop)
             await db.commit()
+            for user_id in staff_user_ids:
+                principal_cache.invalidate_user(user_id)
             
-            logger.info(f"Successfully deleted shop ID: {shop_id}")
+            logger.info("Successfully deleted shop ID: %s", shop_id)
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error deleting shop ID {shop_id}: {str(e)}")
+            logger.error("Error deleting shop ID %s: %s", shop_id, e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -165,7 +179,7 @@ class ShopController:
     ) -> ShopStaff:
         """Assign staff to shop"""
         try:
-            logger.info(f"Assigning user ID {staff_data.user_id} to shop ID {staff_data.shop_id}")
+            logger.info("Assigning user ID %s to shop ID %s", staff_data.user_id, staff_data.shop_id)
             
             # Check if already assigned
             result = await db.execute(
@@ -175,7 +189,7 @@ class ShopController:
                 )
             )
             if result.scalar_one_or_none():
-                logger.warning(f"User {staff_data.user_id} already assigned to shop {staff_data.shop_id}")
+                logger.warning("User %s already assigned to shop %s", staff_data.user_id, staff_data.shop_id)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Staff already assigned to this shop"
@@ -184,15 +198,16 @@ class ShopController:
             staff_assignment = ShopStaff(**staff_data.model_dump())
             db.add(staff_assignment)
             await db.commit()
+            principal_cache.invalidate_user(staff_data.user_id)
             await db.refresh(staff_assignment)
             
-            logger.info(f"Successfully assigned staff ID {staff_assignment.id}")
+            logger.info("Successfully assigned staff ID %s", staff_assignment.id)
             return staff_assignment
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error assigning staff: {str(e)}")
+            logger.error("Error assigning staff: %s", e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -207,7 +222,7 @@ class ShopController:
     ) -> None:
         """Remove staff from shop"""
         try:
-            logger.info(f"Removing user ID {user_id} from shop ID {shop_id}")
+            logger.info("Removing user ID %s from shop ID %s", user_id, shop_id)
             
             result = await db.execute(
                 select(ShopStaff).where(
@@ -218,7 +233,7 @@ class ShopController:
             staff = result.scalar_one_or_none()
             
             if not staff:
-                logger.warning(f"Staff assignment not found: user {user_id}, shop {shop_id}")
+                logger.warning("Staff assignment not found: user %s, shop %s", user_id, shop_id)
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Staff assignment not found"
@@ -226,15 +241,28 @@ class ShopController:
 
             await db.delete(staff)
             await db.commit()
+            principal_cache.invalidate_user(user_id)
             
-            logger.info(f"Successfully removed staff assignment")
+            logger.info("Successfully removed staff assignment")
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error removing staff: {str(e)}")
+            logger.error("Error removing staff: %s", e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to remove staff: {str(e)}"
             )
+
+    # ==================== HTTP CACHE STAMPS ====================
+
+    @staticmethod
+    def shop_stamps(shop_id: Optional[int] = None, is_active: Optional[bool] = None) -> List[Select]:
+        """ETag aggregates for one shop or the shop list (see src/core/http_cache.py)"""
+        criteria = []
+        if shop_id is not None:
+            criteria.append(Shop.id == shop_id)
+        if is_active is not None:
+            criteria.append(Shop.is_active == is_active)
+        return [stamp(Shop, *criteria)]
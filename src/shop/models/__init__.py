@@ -3,6 +3,10 @@ from .category import Category
 from .product import Product
 from .inventory import Inventory
 from .sales import Sale, SaleItem, Return
+from .sequence import DocumentCounter
+from .reservation import StockReservation, ReservationStatus
+from .ledger import StockMovement, StockSnapshot, MovementReason
+from .media import MediaObject
 
 __all__ = [
     "Shop",
@@ -13,4 +17,11 @@ __all__ = [
     "Sale",
     "SaleItem",
     "Return",
+    "DocumentCounter",
+    "StockReservation",
+    "ReservationStatus",
+    "StockMovement",
+    "StockSnapshot",
+    "MovementReason",
+    "MediaObject",
 ]
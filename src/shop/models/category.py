@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Bool
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY
 
 
 class Category(Base):
@@ -18,8 +19,10 @@ class Category(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    parent = relationship("Category", remote_side=[id], backref="subcategories", lazy="joined")
-    products = relationship("Product", back_populates="category", cascade="all, delete-orphan", lazy="selectin")
+    parent = relationship("Category", remote_side=[id], back_populates="subcategories", lazy=DEFAULT_LAZY)
+    subcategories = relationship("Category", back_populates="parent", passive_deletes=True, lazy=DEFAULT_LAZY)
+    # Never loaded to cascade: ProductController.delete_category deletes the products itself
+    products = relationship("Product", back_populates="category", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
     
     def __repr__(self):
         return f"<Category(id={self.id}, name='{self.name}')>"
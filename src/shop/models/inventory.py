@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY
 
 
 class Inventory(Base):
@@ -19,8 +20,15 @@ class Inventory(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    product = relationship("Product", back_populates="inventory", lazy="joined")
-    shop = relationship("Shop", back_populates="inventory", lazy="joined")
+    product = relationship("Product", back_populates="inventory", lazy=DEFAULT_LAZY)
+    shop = relationship("Shop", back_populates="inventory", lazy=DEFAULT_LAZY)
+
+    # Keyset pagination sort keys (see InventoryController sort keys)
+    __table_args__ = (
+        Index("ix_inventory_recent", func.coalesce(updated_at, created_at), id),
+        Index("ix_inventory_shop_recent", shop_id, func.coalesce(updated_at, created_at), id),
+        Index("ix_inventory_shop_quantity", shop_id, quantity, id),
+    )
     
     @property
     def available_quantity(self):
@@ -0,0 +1,61 @@
+from enum import Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from src.core.db import Base
+
+
+class MovementReason(str, Enum):
+    OPENING = "opening"                # Balance carried over when the ledger started
+    INITIAL = "initial"                # New inventory record
+    ADJUSTMENT = "adjustment"          # adjust_stock
+    CORRECTION = "correction"          # quantity overwritten by update_inventory
+    SALE = "sale"
+    SALE_CANCELLED = "sale_cancelled"
+    RETURN = "return"
+
+
+class StockMovement(Base):
+    """
+    Append-only ledger of quantity changes, one row per (shop, product) change.
+    Written in the same transaction as the Inventory update it records.
+    """
+    __tablename__ = "stock_movements"
+
+    id = Column(Integer, primary_key=True, index=True)
+    shop_id = Column(Integer, ForeignKey("shops.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    inventory_id = Column(Integer, ForeignKey("inventory.id", ondelete="SET NULL"), nullable=True)
+    quantity_change = Column(Integer, nullable=False)  # Signed
+    reason = Column(String(20), nullable=False)
+    note = Column(String(255))
+    sale_id = Column(Integer, ForeignKey("sales.id", ondelete="SET NULL"), nullable=True)
+    return_id = Column(Integer, ForeignKey("returns.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Point-in-time reads scan one (shop, product) range after a snapshot's movement id
+    __table_args__ = (
+        Index("ix_stock_movements_shop_product_id", shop_id, product_id, id),
+    )
+
+    def __repr__(self):
+        return f"<StockMovement(shop={self.shop_id}, product={self.product_id}, change={self.quantity_change}, reason='{self.reason}')>"
+
+
+class StockSnapshot(Base):
+    """Quantity of a (shop, product) after every movement up to movement_id"""
+    __tablename__ = "stock_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    shop_id = Column(Integer, ForeignKey("shops.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    movement_id = Column(Integer, nullable=False)  # Last movement included
+    taken_at = Column(DateTime(timezone=True), nullable=False)  # created_at of that movement
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_stock_snapshots_shop_product_movement", shop_id, product_id, movement_id),
+    )
+
+    def __repr__(self):
+        return f"<StockSnapshot(shop={self.shop_id}, product={self.product_id}, qty={self.quantity}, movement={self.movement_id})>"
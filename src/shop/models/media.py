@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
+from sqlalchemy.sql import func
+from src.core.db import Base
+
+
+class MediaObject(Base):
+    """
+    One stored image file, keyed by the SHA-256 of its content.
+    ref_count is the number of products / categories whose image_url points at it;
+    objects left unreferenced past a grace period are garbage-collected.
+    """
+    __tablename__ = "media_objects"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), unique=True, nullable=False, index=True)
+    path = Column(String(255), unique=True, nullable=False)  # Relative to MEDIA_DIR
+    extension = Column(String(10), nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Grace period starts here
+
+    # Garbage collection only ever scans unreferenced objects
+    __table_args__ = (
+        Index(
+            "ix_media_objects_unreferenced_last_used_at",
+            last_used_at,
+            postgresql_where=text("ref_count = 0"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<MediaObject(sha256='{self.sha256[:12]}', refs={self.ref_count})>"
@@ -1,7 +1,9 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 from sqlalchemy.sql import func
 from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY, LoadProfile
+from src.core.file_upload import variant_urls
 
 
 class Product(Base):
@@ -26,9 +28,20 @@ class Product(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    category = relationship("Category", back_populates="products", lazy="joined")
-    inventory = relationship("Inventory", back_populates="product", cascade="all, delete-orphan", lazy="selectin")
-    sale_items = relationship("SaleItem", back_populates="product", lazy="selectin")
+    category = relationship("Category", back_populates="products", lazy=DEFAULT_LAZY)
+    inventory = relationship("Inventory", back_populates="product", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
+    sale_items = relationship("SaleItem", back_populates="product", passive_deletes=True, lazy=DEFAULT_LAZY)
+
+    # ProductResponse renders the per-shop inventory rows, nothing else
+    __load_profiles__ = {
+        LoadProfile.LIST: lambda: (selectinload(Product.inventory),),
+        LoadProfile.DETAIL: lambda: (selectinload(Product.inventory),),
+    }
     
+    @property
+    def image_variants(self):
+        """WebP thumbnail / medium / large URLs (only for images in the media store)"""
+        return variant_urls(self.image_url)
+
     def __repr__(self):
         return f"<Product(id={self.id}, name='{self.name}', sku='{self.sku}')>"
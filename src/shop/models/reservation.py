@@ -0,0 +1,49 @@
+from enum import Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY
+
+
+class ReservationStatus(str, Enum):
+    ACTIVE = "active"
+    CONVERTED = "converted"  # Became sale lines
+    RELEASED = "released"    # Given back by the till
+    EXPIRED = "expired"      # Given back by the sweeper
+
+
+class StockReservation(Base):
+    """
+    A time-limited hold on stock for one basket line.
+    While active, its quantity is counted in inventory.reserved_quantity.
+    """
+    __tablename__ = "stock_reservations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    hold_token = Column(String(32), nullable=False, index=True)  # One per basket
+    inventory_id = Column(Integer, ForeignKey("inventory.id", ondelete="CASCADE"), nullable=False, index=True)
+    shop_id = Column(Integer, ForeignKey("shops.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default=ReservationStatus.ACTIVE.value)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    sale_id = Column(Integer, ForeignKey("sales.id", ondelete="SET NULL"), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    inventory = relationship("Inventory", lazy=DEFAULT_LAZY)
+
+    # The sweeper only ever scans active holds by expiry
+    __table_args__ = (
+        Index(
+            "ix_stock_reservations_active_expires_at",
+            expires_at,
+            postgresql_where=text("status = 'active'"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<StockReservation(token='{self.hold_token}', inventory={self.inventory_id}, qty={self.quantity}, status='{self.status}')>"
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Text, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship, selectinload, joinedload
 from sqlalchemy.sql import func
 from enum import Enum
 from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY, LoadProfile
 
 
 class SaleStatus(str, Enum):
@@ -43,11 +44,24 @@ class Sale(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    shop = relationship("Shop", back_populates="sales", lazy="joined")
-    customer = relationship("CustomerProfile", back_populates="sales", lazy="joined")
-    staff = relationship("User", foreign_keys=[staff_id], back_populates="sales", lazy="joined")
-    items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan", lazy="selectin")
-    returns = relationship("Return", back_populates="sale", cascade="all, delete-orphan", lazy="selectin")
+    shop = relationship("Shop", back_populates="sales", lazy=DEFAULT_LAZY)
+    customer = relationship("CustomerProfile", back_populates="sales", lazy=DEFAULT_LAZY)
+    staff = relationship("User", foreign_keys=[staff_id], back_populates="sales", lazy=DEFAULT_LAZY)
+    items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
+    returns = relationship("Return", back_populates="sale", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
+
+    # SaleResponse renders the line items; cancel/return work off them too
+    __load_profiles__ = {
+        LoadProfile.LIST: lambda: (selectinload(Sale.items),),
+        LoadProfile.DETAIL: lambda: (selectinload(Sale.items),),
+        LoadProfile.CHECKOUT: lambda: (selectinload(Sale.items),),
+    }
+
+    # Match get_sales filters + its (sale_date, id) sort key
+    __table_args__ = (
+        Index("ix_sales_shop_id_sale_date", shop_id, sale_date.desc(), id.desc()),
+        Index("ix_sales_status_sale_date", status, sale_date.desc(), id.desc()),
+    )
     
     def __repr__(self):
         return f"<Sale(id={self.id}, invoice='{self.invoice_number}', total={self.total_amount})>"
@@ -68,8 +82,8 @@ class SaleItem(Base):
     total_price = Column(Numeric(10, 2), nullable=False)
     
     # Relationships
-    sale = relationship("Sale", back_populates="items", lazy="joined")
-    product = relationship("Product", back_populates="sale_items", lazy="joined")
+    sale = relationship("Sale", back_populates="items", lazy=DEFAULT_LAZY)
+    product = relationship("Product", back_populates="sale_items", lazy=DEFAULT_LAZY)
     
     def __repr__(self):
         return f"<SaleItem(sale_id={self.sale_id}, product='{self.product_name}', qty={self.quantity})>"
@@ -87,14 +101,24 @@ class Return(Base):
     refund_amount = Column(Numeric(10, 2), nullable=False)
     status = Column(String(50), nullable=False, default="pending")  # pending, approved, rejected, completed
     processed_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    return_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    return_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     processed_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
-    sale = relationship("Sale", back_populates="returns", lazy="joined")
-    product = relationship("Product", lazy="joined")
-    processor = relationship("User", foreign_keys=[processed_by], back_populates="returns_processed", lazy="joined")
+    sale = relationship("Sale", back_populates="returns", lazy=DEFAULT_LAZY)
+    product = relationship("Product", lazy=DEFAULT_LAZY)
+    processor = relationship("User", foreign_keys=[processed_by], back_populates="returns_processed", lazy=DEFAULT_LAZY)
+
+    # Processing a return restocks the sale's shop
+    __load_profiles__ = {
+        LoadProfile.CHECKOUT: lambda: (joinedload(Return.sale),),
+    }
+
+    # Match get_returns status filter + its (return_date, id) sort key
+    __table_args__ = (
+        Index("ix_returns_status_return_date", status, return_date.desc(), id.desc()),
+    )
     
     def __repr__(self):
         return f"<Return(id={self.id}, return_number='{self.return_number}', status='{self.status}')>"
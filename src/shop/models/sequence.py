@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from src.core.db import Base
+
+
+class DocumentCounter(Base):
+    __tablename__ = "document_counters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(50), nullable=False)  # invoice, return
+    period = Column(String(8), nullable=False)  # YYYYMMDD
+    value = Column(Integer, nullable=False, default=0)  # Last value handed out
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("name", "period", name="uq_document_counters_name_period"),
+    )
+
+    def __repr__(self):
+        return f"<DocumentCounter(name='{self.name}', period='{self.period}', value={self.value})>"
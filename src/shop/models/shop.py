@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.core.db import Base
+from src.core.loading import DEFAULT_LAZY
 
 
 class Shop(Base):
@@ -20,9 +21,9 @@ class Shop(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    staff = relationship("ShopStaff", back_populates="shop", cascade="all, delete-orphan", lazy="selectin")
-    inventory = relationship("Inventory", back_populates="shop", cascade="all, delete-orphan", lazy="selectin")
-    sales = relationship("Sale", back_populates="shop", cascade="all, delete-orphan", lazy="selectin")
+    staff = relationship("ShopStaff", back_populates="shop", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
+    inventory = relationship("Inventory", back_populates="shop", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
+    sales = relationship("Sale", back_populates="shop", cascade="all, delete-orphan", passive_deletes=True, lazy=DEFAULT_LAZY)
     
     def __repr__(self):
         return f"<Shop(id={self.id}, name='{self.name}')>"
@@ -39,8 +40,8 @@ class ShopStaff(Base):
     joined_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="shop_staff", lazy="joined")
-    shop = relationship("Shop", back_populates="staff", lazy="joined")
+    user = relationship("User", back_populates="shop_staff", lazy=DEFAULT_LAZY)
+    shop = relationship("Shop", back_populates="staff", lazy=DEFAULT_LAZY)
     
     def __repr__(self):
         return f"<ShopStaff(user_id={self.user_id}, shop_id={self.shop_id})>"
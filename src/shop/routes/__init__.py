@@ -3,6 +3,8 @@ from .shop import router as shop_router
 from .product import router as product_router
 from .inventory import router as inventory_router
 from .sales import router as sales_router
+from .reservation import router as reservation_router
+from .report import router as report_router
 
 router = APIRouter()
 
@@ -10,5 +12,7 @@ router.include_router(shop_router, prefix="/shops", tags=["Shops"])
 router.include_router(product_router, prefix="/products", tags=["Products"])
 router.include_router(inventory_router, prefix="/inventory", tags=["Inventory"])
 router.include_router(sales_router, prefix="/sales", tags=["Sales"])
+router.include_router(reservation_router, prefix="/reservations", tags=["Reservations"])
+router.include_router(report_router, prefix="/reports", tags=["Reports"])
 
 __all__ = ["router"]
@@ -1,16 +1,23 @@
 # src/shop/routes/inventory.py - UPDATED FOR OPTIMIZED CONTROLLER (PAGE 1)
 # CHANGES: Added pagination parameters to routes that now support it
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from src.core.db import get_db
+from datetime import datetime
+from src.core.db import get_db, get_read_db
+from src.core.pagination import set_next_cursor
+from src.core.http_cache import aggregate_etag, check_etag
+from src.core.responses import FastJSONResponse
 from src.shop.controllers.inventory_controller import InventoryController
+from src.shop.controllers.ledger_controller import StockLedgerController
 from src.shop.schemas.inventory import (
     InventoryResponse,
     InventoryCreate,
     InventoryUpdate,
-    StockAdjustment
+    StockAdjustment,
+    StockMovementResponse,
+    StockAtResponse
 )
 
 router = APIRouter()
@@ -21,67 +28,138 @@ router = APIRouter()
 
 @router.get("/low-stock", response_model=List[InventoryResponse])
 async def get_low_stock_items(
+    request: Request,
+    response: Response,
     threshold: int = Query(5, description="Stock level threshold", ge=0),
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Records per page"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get inventory items with stock below threshold
     - **threshold**: Minimum stock level (default: 5)
-    - **skip**: Number of records to skip (pagination)
+    - **skip**: Number of records to skip (ignored when a cursor is given)
     - **limit**: Number of records per page (default: 50, max: 100)
+    - **cursor**: Continue after the previous page
     """
-    return await InventoryController.get_low_stock_items(
+    etag = await aggregate_etag(db, request, *InventoryController.inventory_stamps(threshold=threshold))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = await InventoryController.get_low_stock_items(
         db=db, 
         threshold=threshold, 
         skip=skip, 
-        limit=limit
+        limit=limit,
+        cursor=cursor
+    )
+    set_next_cursor(response, page)
+    return FastJSONResponse(page, headers=response.headers)
+
+@router.get("/movements", response_model=List[StockMovementResponse])
+async def get_stock_movements(
+    response: Response,
+    shop_id: Optional[int] = Query(None),
+    product_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0, description="Records to skip"),
+    limit: int = Query(100, ge=1, le=500, description="Records per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Stock ledger entries, newest first
+    - **shop_id** / **product_id**: Filter to one shop and/or product
+    - **cursor**: Continue after the previous page
+    """
+    page = await StockLedgerController.get_movements(
+        db, shop_id=shop_id, product_id=product_id, skip=skip, limit=limit, cursor=cursor
     )
+    set_next_cursor(response, page)
+    return page
+
+@router.get("/stock-at", response_model=StockAtResponse)
+async def get_stock_at(
+    shop_id: int = Query(...),
+    product_id: int = Query(...),
+    at: datetime = Query(..., description="Point in time (ISO 8601)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Quantity of a product in a shop at a point in time
+    (latest ledger snapshot before `at` + the movements after it)
+    """
+    quantity = await StockLedgerController.stock_at(db, shop_id, product_id, at)
+    return {"shop_id": shop_id, "product_id": product_id, "at": at, "quantity": quantity}
 
 @router.get("/shop/{shop_id}", response_model=List[InventoryResponse])
 async def get_shop_inventory(
     shop_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(50, ge=1, le=200, description="Records per page"),
     sort_by: str = Query(
         "updated_at", 
         description="Sort by: updated_at (default), quantity, or product_id"
     ),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all inventory for a specific shop
-    - **skip**: Number of records to skip (pagination)
+    - **skip**: Number of records to skip (ignored when a cursor is given)
     - **limit**: Number of records per page (default: 50)
     - **sort_by**: Sort order - updated_at, quantity, or product_id
+    - **cursor**: Continue after the previous page (same sort_by)
     """
-    return await InventoryController.get_shop_inventory(
+    etag = await aggregate_etag(db, request, *InventoryController.inventory_stamps(shop_id=shop_id))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = await InventoryController.get_shop_inventory(
         db, 
         shop_id, 
         skip=skip, 
         limit=limit, 
-        sort_by=sort_by
+        sort_by=sort_by,
+        cursor=cursor
     )
+    set_next_cursor(response, page)
+    return FastJSONResponse(page, headers=response.headers)
 
 @router.get("/product/{product_id}", response_model=List[InventoryResponse])
 async def get_product_inventory(
     product_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(50, ge=1, le=200, description="Records per page"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get inventory across all shops for a specific product
-    - **skip**: Number of records to skip (pagination)
+    - **skip**: Number of records to skip (ignored when a cursor is given)
     - **limit**: Number of records per page (default: 50)
+    - **cursor**: Continue after the previous page
     """
-    return await InventoryController.get_product_inventory(
+    etag = await aggregate_etag(db, request, *InventoryController.inventory_stamps(product_id=product_id))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = await InventoryController.get_product_inventory(
         db=db, 
         product_id=product_id,
         skip=skip, 
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, page)
+    return FastJSONResponse(page, headers=response.headers)
 
 # ============================================
 # 📋 GENERAL ROUTES
@@ -89,27 +167,39 @@ async def get_product_inventory(
 
 @router.get("/", response_model=List[InventoryResponse])
 async def get_all_inventory(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(100, ge=1, le=500, description="Records per page"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all inventory records - OPTIMIZED
-    - **skip**: Number of records to skip (pagination)
+    - **skip**: Number of records to skip (ignored when a cursor is given)
     - **limit**: Number of records per page (default: 100, max: 500)
+    - **cursor**: Continue after the previous page
 
-    💡 TIP: This endpoint now supports pagination
-    Instead of loading all 10,000 items, you can paginate:
+    💡 TIP: Page with the cursor instead of skip - every page costs the same:
 
-    GET /api/inventory/?skip=0&limit=100    (First 100 items)
-    GET /api/inventory/?skip=100&limit=100  (Next 100 items)
-    GET /api/inventory/?skip=200&limit=100  (Next 100 items)
+    GET /api/inventory/?limit=100                    (First 100 items)
+    GET /api/inventory/?limit=100&cursor=<X-Next-Cursor>  (Next 100 items)
+
+    Supports If-None-Match: 304 while no inventory row changed
     """
-    return await InventoryController.get_all_inventory(
+    etag = await aggregate_etag(db, request, *InventoryController.inventory_stamps())
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = await InventoryController.get_all_inventory(
         db, 
         skip=skip, 
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, page)
+    return FastJSONResponse(page, headers=response.headers)
 
 @router.post("/", response_model=InventoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_inventory(
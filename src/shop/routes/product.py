@@ -1,19 +1,21 @@
-from fastapi import APIRouter, Depends, status, Query, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, status, Query, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from src.core.db import get_db
+from src.core.db import get_db, get_read_db
+from src.core.pagination import set_next_cursor
+from src.core.http_cache import aggregate_etag, check_etag
+from src.core.responses import FastJSONResponse
 from src.accounts.permissions import IsAdmin, IsManager
 from src.accounts.dependencies import get_current_user
-from src.accounts.models import User
-from src.shop.controllers import ProductController
+from src.accounts.principal import Principal
+from src.shop.controllers import ProductController, CatalogController, MediaController
 from src.shop.schemas import (
     CategoryCreate, CategoryUpdate, CategoryResponse,
     ProductCreate, ProductUpdate, ProductResponse
 )
 
 from fastapi import File, UploadFile
-from src.core.file_upload import save_upload_file
 
 router = APIRouter()
 
@@ -23,7 +25,7 @@ router = APIRouter()
 async def create_category(
     category_data: CategoryCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Create a new category (Manager+)
@@ -34,16 +36,25 @@ async def create_category(
 
 @router.get("/categories", response_model=List[CategoryResponse], tags=["Categories"])
 async def get_categories(
+    request: Request,
+    response: Response,
     is_active: Optional[bool] = Query(None),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Get list of categories
+    Get list of categories (supports If-None-Match)
     """
-    categories = await ProductController.get_categories(
+    versions = await CatalogController.category_versions()
+    etag = await aggregate_etag(db, request, versions=versions)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    categories = await CatalogController.get_categories(
         db=db,           # ✅ Use keyword arguments
-        is_active=is_active
+        is_active=is_active,
+        versions=versions
     )
     return categories
 
@@ -51,13 +62,21 @@ async def get_categories(
 @router.get("/categories/{category_id}", response_model=CategoryResponse, tags=["Categories"])
 async def get_category(
     category_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Get category by ID
+    Get category by ID (supports If-None-Match)
     """
-    category = await ProductController.get_category(db, category_id)
+    versions = await CatalogController.category_versions()
+    etag = await aggregate_etag(db, request, versions=versions)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    category = await CatalogController.get_category(db, category_id, versions=versions)
     return category
 
 
@@ -66,7 +85,7 @@ async def update_category(
     category_id: int,
     category_data: CategoryUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Update category (Manager+)
@@ -80,7 +99,7 @@ async def update_category(
 async def create_product(
     product_data: ProductCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Create a new product (Manager+)
@@ -91,35 +110,69 @@ async def create_product(
 
 @router.get("/", response_model=List[ProductResponse])
 async def get_products(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     category_id: Optional[int] = Query(None, description="Filter by category"),
-    search: Optional[str] = Query(None, description="Search by name, SKU, or brand"),
+    search: Optional[str] = Query(None, description="Search by name, SKU, brand, model or description (prefix/typo tolerant, ranked)"),
     is_active: Optional[bool] = None,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get list of products with filters
-    """
-    products = await ProductController.get_products(
-        db, skip, limit, category_id, search, is_active
+    - **search**: results are ranked best match first and paged with skip/limit
+    - Supports If-None-Match: 304 while no product in the filter (or its stock) changed
+    """
+    if search and search.strip():
+        # Searches skip the catalog cache: tag the live rows
+        versions = None
+        stamps = CatalogController.product_stamps(category_id=category_id, is_active=is_active)
+    else:
+        versions = await CatalogController.list_versions()
+        stamps = CatalogController.stock_stamps(category_id=category_id, is_active=is_active)
+    etag = await aggregate_etag(db, request, *stamps, versions=versions)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    products = await CatalogController.get_products(
+        db,
+        skip=skip,
+        limit=limit,
+        category_id=category_id,
+        is_active=is_active,
+        search=search,
+        cursor=cursor,
+        versions=versions
     )
-    return products
+    set_next_cursor(response, products)
+    return FastJSONResponse(products, headers=response.headers)
 
 @router.post("/upload-image", tags=["Products"])
 async def upload_product_image(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Upload product image"""
+    """
+    Upload product image (JPEG, PNG, GIF or WebP, checked by content; max 5MB).
+    Identical images share one stored file and URL. Thumbnail / medium / large
+    WebP variants are generated in the background.
+    """
     try:
-        file_url = await save_upload_file(file, folder="products")
+        media = await MediaController.store(db, file)
+        background_tasks.add_task(MediaController.request_variants, media.path)
         return {
             "success": True,
-            "file_url": file_url,
+            **MediaController.describe(media),
             "message": "Image uploaded successfully"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -127,16 +180,38 @@ async def upload_product_image(
         )
 
 
+@router.get("/media/{sha256}", tags=["Products"])
+async def get_media(
+    sha256: str,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Look up a stored image by the SHA-256 of its content.
+    Clients can check here first and reuse file_url instead of uploading the bytes.
+    """
+    media = await MediaController.get_media(db, sha256)
+    return MediaController.describe(media)
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Get product by ID
+    Get product by ID (supports If-None-Match)
     """
-    product = await ProductController.get_product(db, product_id)
+    versions = await CatalogController.product_versions(product_id)
+    etag = await aggregate_etag(db, request, *CatalogController.stock_stamps(product_id=product_id), versions=versions)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    product = await CatalogController.get_product(db, product_id, versions=versions)
     return product
 
 
@@ -145,7 +220,7 @@ async def update_product(
     product_id: int,
     product_data: ProductUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Update product (Manager+)
@@ -158,7 +233,7 @@ async def update_product(
 async def delete_product(
     product_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsAdmin())
+    current_user: Principal = Depends(IsAdmin())
 ):
     """
     Delete product (Admin only)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, status
+
+from src.accounts.permissions import IsManager
+from src.accounts.principal import Principal
+from src.shop.controllers import ReportController
+from src.shop.schemas import SalesSummaryRequest, LowStockReportRequest, ReportJobResponse
+
+router = APIRouter()
+
+
+# ==================== Report Routes ====================
+# Reports are built by the Celery reports worker: POST queues one and
+# returns its task_id, GET /{task_id} returns it once status is SUCCESS.
+
+@router.post("/sales-summary", response_model=ReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def request_sales_summary(
+    report_data: SalesSummaryRequest,
+    current_user: Principal = Depends(IsManager())
+):
+    """Queue daily sales totals (per shop / payment method) for a date range (Manager+)"""
+    return await ReportController.request_sales_summary(report_data)
+
+
+@router.post("/low-stock", response_model=ReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def request_low_stock_report(
+    report_data: LowStockReportRequest,
+    current_user: Principal = Depends(IsManager())
+):
+    """Queue a report of inventory at or below its minimum stock level (Manager+)"""
+    return await ReportController.request_low_stock(report_data)
+
+
+@router.get("/{task_id}", response_model=ReportJobResponse)
+async def get_report(
+    task_id: str,
+    current_user: Principal = Depends(IsManager())
+):
+    """Report job status, with the report once it has finished (kept for CELERY_RESULT_EXPIRES_SECONDS)"""
+    return await ReportController.get_report(task_id)
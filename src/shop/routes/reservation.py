@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import get_db
+from src.accounts.permissions import IsStaff
+from src.accounts.principal import Principal
+from src.shop.controllers import ReservationController
+from src.shop.schemas import ReservationCreate, ReservationResponse
+
+router = APIRouter()
+
+
+# ==================== Reservation Routes ====================
+
+@router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
+async def create_reservation(
+    reservation_data: ReservationCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(IsStaff())
+):
+    """
+    Hold stock for a whole basket (Staff+)
+
+    All lines are reserved or none. The hold expires after `ttl_seconds`
+    unless it is converted first: pass `hold_token` to POST /api/sales/.
+    """
+    return await ReservationController.create_hold(db, reservation_data, current_user.id)
+
+
+@router.get("/{hold_token}", response_model=ReservationResponse)
+async def get_reservation(
+    hold_token: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(IsStaff())
+):
+    """Get the lines held under a token"""
+    return await ReservationController.get_hold(db, hold_token)
+
+
+@router.delete("/{hold_token}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_reservation(
+    hold_token: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(IsStaff())
+):
+    """Give held stock back (basket abandoned)"""
+    await ReservationController.release_hold(db, hold_token)
+    return None
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, date
 
-from src.core.db import get_db
+from src.core.db import get_db, get_read_db
+from src.core.pagination import set_next_cursor
+from src.core.responses import FastJSONResponse
 from src.accounts.permissions import IsManager, IsStaff
-from src.accounts.models import User
+from src.accounts.principal import Principal
 from src.shop.controllers import SalesController
 from src.shop.schemas import (
     SaleCreate, SaleResponse,
@@ -21,7 +23,7 @@ router = APIRouter()
 async def create_sale(
     sale_data: SaleCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """
     Create a new sale (Staff+)
@@ -35,39 +37,59 @@ async def create_sale(
 
 @router.get("/", response_model=List[SaleResponse])
 async def get_sales(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     shop_id: Optional[int] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get sales with filters"""
-    return await SalesController.get_sales(
+    """Get sales with filters (pass `cursor` instead of `skip` for deep pages)"""
+    page = await SalesController.get_sales(
         db=db,                   
         skip=skip,
         limit=limit,
         shop_id=shop_id,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        cursor=cursor
     )
+    set_next_cursor(response, page)
+    return FastJSONResponse(page, headers=response.headers)
 
 @router.get("/today", response_model=TodaysSalesResponse)
 async def get_todays_sales(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    response: Response,
+    shop_id: Optional[int] = Query(None),
+    include_sales: bool = Query(False, description="Also return one page of today's sales"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(IsStaff())
 ):
     """
-    Get today's sales summary with details (Staff+)
+    Get today's sales summary (Staff+)
+    - Count, total and per payment method / per shop breakdowns
+    - **include_sales**: add a page of the sales themselves (paged by `cursor`)
     """
-    result = await SalesController.get_todays_sales(db)
+    result = await SalesController.get_todays_sales(
+        db,
+        shop_id=shop_id,
+        include_sales=include_sales,
+        limit=limit,
+        cursor=cursor
+    )
+    if result["sales"] is not None:
+        set_next_cursor(response, result["sales"])
     return result
 
 @router.post("/returns", response_model=ReturnResponse, status_code=status.HTTP_201_CREATED, tags=["Returns"])
 async def create_return(
     return_data: ReturnCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """
     Create a product return request (Staff+)
@@ -78,19 +100,27 @@ async def create_return(
 
 @router.get("/returns", response_model=List[ReturnResponse], tags=["Returns"])
 async def get_returns(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(IsStaff())
 ):
     """Get returns with optional status filter"""
-    return await SalesController.get_returns(db=db, status=status)
+    page = await SalesController.get_returns(
+        db=db, skip=skip, limit=limit, status=status, cursor=cursor
+    )
+    set_next_cursor(response, page)
+    return page
 
 @router.put("/returns/{return_id}/process", response_model=ReturnResponse, tags=["Returns"])
 async def process_return(
     return_id: int,
     return_update: ReturnUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Process (approve/reject) a return (Manager+)
@@ -108,7 +138,7 @@ async def process_return(
 async def get_sale(
     sale_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsStaff())
+    current_user: Principal = Depends(IsStaff())
 ):
     """
     Get sale details by ID (Staff+)
@@ -122,7 +152,7 @@ async def cancel_sale(
     sale_id: int,
     reason: Optional[str] = Query(None, description="Cancellation reason"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Cancel a sale and restore inventory (Manager+)
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from src.core.db import get_db
+from src.core.pagination import set_next_cursor
+from src.core.http_cache import aggregate_etag, check_etag
 from src.accounts.permissions import IsAdmin, IsManager
 from src.accounts.dependencies import get_current_user
-from src.accounts.models import User
+from src.accounts.principal import Principal
 from src.shop.controllers import ShopController
 from src.shop.schemas import (
     ShopCreate, ShopUpdate, ShopResponse,
@@ -19,7 +21,7 @@ router = APIRouter()
 async def create_shop(
     shop_data: ShopCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsAdmin())
+    current_user: Principal = Depends(IsAdmin())
 ):
     """
     Create a new shop (Admin only)
@@ -30,28 +32,44 @@ async def create_shop(
 
 @router.get("/", response_model=List[ShopResponse])
 async def get_shops(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Get list of all shops
+    Get list of all shops (supports If-None-Match)
     """
-    shops = await ShopController.get_shops(db, skip, limit, is_active)
+    etag = await aggregate_etag(db, request, *ShopController.shop_stamps(is_active=is_active))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    shops = await ShopController.get_shops(db, skip, limit, is_active, cursor)
+    set_next_cursor(response, shops)
     return shops
 
 
 @router.get("/{shop_id}", response_model=ShopResponse)
 async def get_shop(
     shop_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Get shop details by ID
+    Get shop details by ID (supports If-None-Match)
     """
+    etag = await aggregate_etag(db, request, *ShopController.shop_stamps(shop_id=shop_id))
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
     shop = await ShopController.get_shop(db, shop_id)
     return shop
 
@@ -61,7 +79,7 @@ async def update_shop(
     shop_id: int,
     shop_data: ShopUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsAdmin())
+    current_user: Principal = Depends(IsAdmin())
 ):
     """
     Update shop details (Admin only)
@@ -74,7 +92,7 @@ async def update_shop(
 async def delete_shop(
     shop_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsAdmin())
+    current_user: Principal = Depends(IsAdmin())
 ):
     """
     Delete shop (Admin only)
@@ -87,7 +105,7 @@ async def delete_shop(
 async def assign_staff_to_shop(
     staff_data: ShopStaffCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Assign staff to shop (Manager+)
@@ -101,7 +119,7 @@ async def remove_staff_from_shop(
     user_id: int,
     shop_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(IsManager())
+    current_user: Principal = Depends(IsManager())
 ):
     """
     Remove staff from shop (Manager+)
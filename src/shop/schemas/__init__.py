@@ -3,13 +3,22 @@ from .shop import (
     ShopStaffBase, ShopStaffCreate, ShopStaffResponse
 )
 from .category import CategoryBase, CategoryCreate, CategoryUpdate, CategoryResponse
-from .product import ProductBase, ProductCreate, ProductUpdate, ProductResponse
-from .inventory import InventoryBase, InventoryCreate, InventoryUpdate, InventoryResponse,StockAdjustment
+from .product import ProductBase, ProductCreate, ProductUpdate, ProductData, ProductResponse, InventoryInProductResponse, ImageVariants
+from .inventory import (
+    InventoryBase, InventoryCreate, InventoryUpdate, InventoryResponse,StockAdjustment,
+    StockMovementResponse, StockAtResponse
+)
 from .sales import (
     SaleBase, SaleCreate, SaleResponse,
     SaleItemBase, SaleItemCreate, SaleItemResponse,
-    ReturnBase, ReturnCreate, ReturnUpdate, ReturnResponse, TodaysSalesResponse
+    ReturnBase, ReturnCreate, ReturnUpdate, ReturnResponse, TodaysSalesResponse,
+    PaymentMethodTotal, ShopSalesTotal
+)
+from .reservation import (
+    ReservationCreate, ReservationItemCreate,
+    ReservationResponse, ReservationItemResponse
 )
+from .report import SalesSummaryRequest, LowStockReportRequest, ReportJobResponse
 
 __all__ = [
     # Shop
@@ -18,11 +27,18 @@ __all__ = [
     # Category
     "CategoryBase", "CategoryCreate", "CategoryUpdate", "CategoryResponse",
     # Product
-    "ProductBase", "ProductCreate", "ProductUpdate", "ProductResponse",
+    "ProductBase", "ProductCreate", "ProductUpdate", "ProductData", "ProductResponse", "InventoryInProductResponse", "ImageVariants",
     # Inventory
     "InventoryBase", "InventoryCreate", "InventoryUpdate", "InventoryResponse","StockAdjustment",
+    "StockMovementResponse", "StockAtResponse",
     # Sales
     "SaleBase", "SaleCreate", "SaleResponse",
     "SaleItemBase", "SaleItemCreate", "SaleItemResponse",
     "ReturnBase", "ReturnCreate", "ReturnUpdate", "ReturnResponse",
+    "TodaysSalesResponse", "PaymentMethodTotal", "ShopSalesTotal",
+    # Reservations
+    "ReservationCreate", "ReservationItemCreate",
+    "ReservationResponse", "ReservationItemResponse",
+    # Reports
+    "SalesSummaryRequest", "LowStockReportRequest", "ReportJobResponse",
 ]
@@ -40,3 +40,27 @@ class StockAdjustment(BaseModel):
     """Schema for adjusting stock quantity"""
     adjustment: int = Field(..., description="Positive for adding stock, negative for removing")
     reason: Optional[str] = Field(None, max_length=255)
+
+
+class StockMovementResponse(BaseModel):
+    """One ledger entry"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    shop_id: int
+    product_id: int
+    inventory_id: Optional[int] = None
+    quantity_change: int
+    reason: str
+    note: Optional[str] = None
+    sale_id: Optional[int] = None
+    return_id: Optional[int] = None
+    created_at: datetime
+
+
+class StockAtResponse(BaseModel):
+    """Quantity of a product in a shop at a point in time (from the ledger)"""
+    shop_id: int
+    product_id: int
+    at: datetime
+    quantity: int
@@ -43,6 +43,13 @@ class ProductUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+# Resized WebP copies of a stored image_url (generated after upload)
+class ImageVariants(BaseModel):
+    thumbnail: str
+    medium: str
+    large: str
+
+
 # ✅ Simple Inventory Response for nested use
 class InventoryInProductResponse(BaseModel):
     """Simplified inventory response for use in ProductResponse"""
@@ -56,14 +63,18 @@ class InventoryInProductResponse(BaseModel):
     max_stock_level: int
 
 
-# ✅ FIXED - NOW INCLUDES INVENTORY
-class ProductResponse(ProductBase):
+# Catalog fields only (what the catalog cache stores; stock is always read live)
+class ProductData(ProductBase):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
     is_active: bool
+    image_variants: Optional[ImageVariants] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
-    
+
+
+# ✅ FIXED - NOW INCLUDES INVENTORY
+class ProductResponse(ProductData):
     # ✅ ADD THIS - Include inventory list
     inventory: List[InventoryInProductResponse] = []
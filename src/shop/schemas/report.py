@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Any, Dict, Optional
+
+
+class SalesSummaryRequest(BaseModel):
+    """Daily totals from start_date through end_date (business days, inclusive)"""
+    start_date: date
+    end_date: date
+    shop_id: Optional[int] = None
+
+
+class LowStockReportRequest(BaseModel):
+    shop_id: Optional[int] = None
+
+
+class ReportJobResponse(BaseModel):
+    """A queued report: poll GET /reports/{task_id} until status is SUCCESS or FAILURE"""
+    task_id: str
+    status: str  # PENDING, STARTED, RETRY, SUCCESS, FAILURE
+    result: Optional[Dict[str, Any]] = None
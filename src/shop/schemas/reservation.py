@@ -0,0 +1,38 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Optional, List
+
+from src.core.config import settings
+
+
+class ReservationItemCreate(BaseModel):
+    product_id: int
+    quantity: int = Field(..., gt=0)
+
+
+class ReservationCreate(BaseModel):
+    """Hold a whole basket in one shop"""
+    shop_id: int
+    items: List[ReservationItemCreate] = Field(..., min_length=1)
+    ttl_seconds: Optional[int] = Field(
+        None, ge=1, le=settings.RESERVATION_MAX_TTL_SECONDS,
+        description="Hold lifetime (default RESERVATION_TTL_SECONDS)"
+    )
+
+
+class ReservationItemResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    inventory_id: int
+    product_id: int
+    quantity: int
+
+
+class ReservationResponse(BaseModel):
+    """All lines held under one token (pass it to POST /sales/ as hold_token)"""
+    hold_token: str
+    shop_id: int
+    status: str
+    expires_at: datetime
+    items: List[ReservationItemResponse] = []
@@ -56,6 +56,7 @@ class SaleBase(BaseModel):
 
 class SaleCreate(SaleBase):
     items: List[SaleItemCreate] = Field(..., min_length=1)
+    hold_token: Optional[str] = Field(None, max_length=32, description="Reservation to convert into this sale")
 
 
 class SaleResponse(BaseModel):
@@ -102,13 +103,29 @@ class SaleSummary(BaseModel):
     updated_at: Optional[datetime]
 
 
+class PaymentMethodTotal(BaseModel):
+    """Today's sales for one payment method"""
+    payment_method: PaymentMethodEnum
+    sales_count: int
+    total_amount: Decimal
+
+
+class ShopSalesTotal(BaseModel):
+    """Today's sales for one shop"""
+    shop_id: int
+    sales_count: int
+    total_amount: Decimal
+
+
 # ✅ UPDATE THIS - Change to use SaleSummary
 class TodaysSalesResponse(BaseModel):
-    """Today's sales summary with full details"""
+    """Today's sales summary, optionally with one page of the sales themselves"""
     date: DateType = Field(..., description="Today's date")
     total_sales_count: int = Field(..., description="Number of sales today")
     total_amount: Decimal = Field(..., description="Total revenue today")
-    sales: List[SaleSummary] = Field(default_factory=list, description="All sales today")  # ✅ Changed here
+    by_payment_method: List[PaymentMethodTotal] = Field(default_factory=list, description="Totals per payment method")
+    by_shop: List[ShopSalesTotal] = Field(default_factory=list, description="Totals per shop")
+    sales: Optional[List[SaleSummary]] = Field(None, description="One page of today's sales (only with include_sales=true)")
     
     class Config:
         from_attributes = True
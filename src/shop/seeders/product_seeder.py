@@ -2,7 +2,8 @@ from sqlalchemy import select
 from decimal import Decimal
 
 from src.core.seeders.base import BaseSeeder
-from src.shop.models import Product, Category, Inventory, Shop
+from src.shop.models import Product, Category, Inventory, Shop, MovementReason
+from src.shop.controllers.ledger_controller import StockLedgerController
 
 
 class ProductSeeder(BaseSeeder):
@@ -173,9 +174,9 @@ class ProductSeeder(BaseSeeder):
                 self.db.add(product)
                 await self.db.flush()
                 
-                # Create inventory for each shop
-                for shop in shops:
-                    inventory = Inventory(
+                # Create inventory for each shop, with the initial stock in the ledger
+                inventories = [
+                    Inventory(
                         product_id=product.id,
                         shop_id=shop.id,
                         quantity=50,  # Initial stock
@@ -183,7 +184,17 @@ class ProductSeeder(BaseSeeder):
                         min_stock_level=10,
                         max_stock_level=500
                     )
-                    self.db.add(inventory)
+                    for shop in shops
+                ]
+                self.db.add_all(inventories)
+                await self.db.flush()
+                await StockLedgerController.record(self.db, [
+                    StockLedgerController.entry(
+                        inventory.id, inventory.shop_id, inventory.product_id,
+                        inventory.quantity, MovementReason.INITIAL
+                    )
+                    for inventory in inventories
+                ])
                 
                 print(f"  ✅ Created product: {prod_data['name']}")
             else:
@@ -0,0 +1,76 @@
+from datetime import date
+from typing import Optional
+
+from src.core.celery_app import celery, RETRY
+from src.core.bg_logging import get_bg_logger
+from src.core.config import settings
+from src.core.db import task_session
+from src.core.image_variants import generate_variants
+from src.shop.controllers.reservation_controller import ReservationController
+from src.shop.controllers.ledger_controller import StockLedgerController
+from src.shop.controllers.media_controller import MediaController
+from src.shop.controllers.report_controller import ReportController
+
+logger = get_bg_logger(__name__)
+
+
+# ==================== MAINTENANCE ====================
+
+@celery.task(name="shop.expire_reservations", **RETRY)
+def expire_reservations(batch_size: int = settings.RESERVATION_SWEEP_BATCH_SIZE) -> int:
+    """Give back stock held by reservations past their expiry (scheduled by beat)"""
+    with task_session() as session:
+        expired = ReservationController.expire_stale(session, batch_size)
+    if expired:
+        logger.info("Expired %s stock reservation holds", expired)
+    return expired
+
+
+@celery.task(name="shop.snapshot_stock", **RETRY)
+def snapshot_stock() -> int:
+    """Fold recent stock movements into per-(shop, product) snapshots (scheduled by beat)"""
+    with task_session() as session:
+        written = StockLedgerController.take_snapshots(session)
+    if written:
+        logger.info("Wrote %s stock snapshots", written)
+    return written
+
+
+@celery.task(name="shop.collect_media_garbage", **RETRY)
+def collect_media_garbage() -> int:
+    """Delete stored images no product or category has used for the grace period (scheduled by beat)"""
+    with task_session() as session:
+        deleted = MediaController.collect_garbage(session)
+    if deleted:
+        logger.info("Deleted %s unreferenced media objects", deleted)
+    return deleted
+
+
+# ==================== MEDIA ====================
+
+@celery.task(name="shop.generate_image_variants", **RETRY)
+def generate_image_variants(relative_path: str) -> int:
+    """Write the WebP variants of a newly stored image (sent by MediaController.request_variants)"""
+    written = generate_variants(relative_path)
+    if written:
+        logger.info("Generated %s variants of %s", len(written), relative_path)
+    return len(written)
+
+
+# ==================== REPORTS ====================
+# Queued by ReportController.request_report; results are polled from the backend
+
+@celery.task(name="reports.sales_summary", ignore_result=False, **RETRY)
+def sales_summary(start_date: str, end_date: str, shop_id: Optional[int] = None) -> dict:
+    """Daily sales totals over a date range (ISO dates, inclusive)"""
+    with task_session() as session:
+        return ReportController.sales_summary(
+            session, date.fromisoformat(start_date), date.fromisoformat(end_date), shop_id
+        )
+
+
+@celery.task(name="reports.low_stock", ignore_result=False, **RETRY)
+def low_stock(shop_id: Optional[int] = None) -> dict:
+    """Inventory at or below its minimum stock level"""
+    with task_session() as session:
+        return ReportController.low_stock(session, shop_id)
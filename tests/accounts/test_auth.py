@@ -214,3 +214,85 @@ class TestAuthToken:
         )
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+class TestPrincipalCache:
+    """Test the authenticated-principal cache used by get_current_user"""
+
+    async def test_principal_is_cached_per_token(self, client, test_user, auth_headers_user):
+        """Test repeated requests with the same token reuse one cached principal"""
+        from src.accounts.principal import principal_cache
+
+        token = auth_headers_user["Authorization"].split(" ", 1)[1]
+
+        response = await client.get("/api/users/roles", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+
+        principal = principal_cache.get(token)
+        assert principal is not None
+        assert principal.id == test_user.id
+        assert principal.role_names == ("staff",)
+
+        response = await client.get("/api/users/roles", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+        assert principal_cache.get(token) is principal
+
+    async def test_role_change_invalidates_cached_principal(
+        self, client, db_session, test_user, auth_headers_user, auth_headers_superadmin
+    ):
+        """Test a role assigned through the API applies to an already-cached token"""
+        from sqlalchemy import select
+        from src.accounts.models import Role
+
+        response = await client.get("/api/users/", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        result = await db_session.execute(select(Role).where(Role.name == "admin"))
+        admin_role = result.scalar_one()
+
+        response = await client.post(
+            f"/api/users/{test_user.id}/roles/{admin_role.id}",
+            headers=auth_headers_superadmin
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = await client.get("/api/users/", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+class TestPasswordHasher:
+    """Test the pooled async password hasher"""
+
+    async def test_async_hash_roundtrip(self):
+        """Test hashes from the pool verify with both sync and async helpers"""
+        from src.accounts.security import hash_password_async, verify_password_async, verify_password
+
+        hashed = await hash_password_async("Secret@123")
+
+        assert await verify_password_async("Secret@123", hashed) is True
+        assert await verify_password_async("wrong", hashed) is False
+        assert verify_password("Secret@123", hashed) is True
+
+    async def test_queue_limit_rejects_with_503(self):
+        """Test calls beyond workers + max_queue are rejected instead of queued"""
+        import asyncio
+        from fastapi import HTTPException
+        from src.accounts.security import PasswordHasher
+
+        hasher = PasswordHasher(workers=1, max_queue=0)
+        try:
+            results = await asyncio.gather(
+                hasher.hash("first"),
+                hasher.hash("second"),
+                return_exceptions=True
+            )
+        finally:
+            hasher.shutdown()
+
+        errors = [r for r in results if isinstance(r, HTTPException)]
+        assert len(errors) == 1
+        assert errors[0].status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert hasher.stats()["completed"] == 1
+        assert hasher.stats()["rejected"] == 1
@@ -9,6 +9,9 @@ from sqlalchemy.pool import StaticPool
 
 from src.main import app
 from src.core.db import Base, get_db
+from src.core.access_log import instrument_engine
+from src.accounts.principal import principal_cache
+from src.shop.cache import catalog_cache
 
 # API Base URL Configuration
 API_PREFIX = "/api"
@@ -23,6 +26,7 @@ test_engine = create_async_engine(
     poolclass=StaticPool,
     echo=False,
 )
+instrument_engine(test_engine.sync_engine)
 
 # Create test session factory
 TestSessionLocal = async_sessionmaker(
@@ -83,3 +87,24 @@ def api_url():
     def _build_url(*parts):
         return f"{API_PREFIX}/{'/'.join(parts)}"
     return _build_url
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    """Authenticated principals must not leak between tests"""
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+# Tests get a fresh database each time, so ids repeat: keep the catalog cache
+# local-only and empty between tests
+catalog_cache.disable_redis()
+
+
+@pytest.fixture(autouse=True)
+def clear_catalog_cache():
+    """Cached catalog documents must not leak between tests"""
+    catalog_cache.clear_local()
+    yield
+    catalog_cache.clear_local()
@@ -1,5 +1,9 @@
 import pytest
 from fastapi import status
+from sqlalchemy import update
+
+from src.shop.models import Inventory
+from src.shop.controllers import StockLedgerController
 
 
 @pytest.mark.asyncio
@@ -114,6 +118,14 @@ class TestInventoryRetrieval:
         assert data["id"] == test_inventory.id
         assert data["quantity"] == 100
 
+    async def test_inventory_list_matches_detail_shape(self, client, test_shop, test_inventory, auth_headers_user, seed_roles):
+        """Test list rows carry the same fields (incl. computed ones) as the detail response"""
+        listed = (await client.get(f"/api/inventory/shop/{test_shop.id}", headers=auth_headers_user)).json()
+        detail = (await client.get(f"/api/inventory/{test_inventory.id}", headers=auth_headers_user)).json()
+
+        assert listed == [detail]
+        assert detail["available_quantity"] == 100 - detail["reserved_quantity"]
+
 
 @pytest.mark.asyncio
 class TestInventoryUpdate:
@@ -239,3 +251,188 @@ class TestStockReservation:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["reserved_quantity"] == 10
+
+
+@pytest.mark.asyncio
+class TestAtomicStockMutations:
+    """Test guarded single-statement stock updates"""
+
+    async def test_decrement_available_takes_stock(self, db_session, test_inventory):
+        """Test a decrement within the available stock returns the updated row"""
+        from src.shop.controllers import InventoryController
+
+        inventory = await InventoryController.decrement_available(db_session, test_inventory.id, 40)
+        await db_session.commit()
+
+        assert inventory.id == test_inventory.id
+        assert inventory.quantity == 60
+
+    async def test_decrement_available_short_changes_nothing(self, db_session, test_inventory_2):
+        """Test a decrement past the unreserved stock returns None and leaves the row as it was"""
+        from src.shop.controllers import InventoryController
+
+        # 50 units with 5 reserved -> 45 available
+        inventory = await InventoryController.decrement_available(db_session, test_inventory_2.id, 46)
+        await db_session.commit()
+        await db_session.refresh(test_inventory_2)
+
+        assert inventory is None
+        assert test_inventory_2.quantity == 50
+        assert test_inventory_2.reserved_quantity == 5
+
+    async def test_decrement_available_many_reports_short_lines(self, db_session, test_inventory, test_inventory_2):
+        """Test that lines without enough available stock are reported and left untouched"""
+        from src.shop.controllers import InventoryController
+
+        # test_inventory_2 has 50 units with 5 reserved -> 45 available
+        short = await InventoryController.decrement_available_many(
+            db_session,
+            {test_inventory.id: 30, test_inventory_2.id: 46}
+        )
+        await db_session.commit()
+        await db_session.refresh(test_inventory)
+        await db_session.refresh(test_inventory_2)
+
+        assert short == [test_inventory_2.id]
+        assert test_inventory.quantity == 70
+        assert test_inventory_2.quantity == 50
+
+    async def test_cancel_sale_restores_stock(self, client, test_shop, test_product, test_inventory, auth_headers_manager, seed_roles):
+        """Test that cancelling a sale puts its quantities back"""
+        create_response = await client.post(
+            "/api/sales/",
+            headers=auth_headers_manager,
+            json={
+                "shop_id": test_shop.id,
+                "payment_method": "cash",
+                "items": [{"product_id": test_product.id, "quantity": 4, "unit_price": "27999.00", "discount": "0.00"}]
+            }
+        )
+        sale_id = create_response.json()["id"]
+
+        await client.post(f"/api/sales/{sale_id}/cancel", headers=auth_headers_manager)
+
+        response = await client.get(f"/api/inventory/{test_inventory.id}", headers=auth_headers_manager)
+        assert response.json()["quantity"] == 100
+
+
+@pytest.mark.asyncio
+class TestInventoryCursorPagination:
+    """Test keyset pagination of inventory lists"""
+
+    async def test_shop_inventory_cursor_pages(self, client, test_shop, test_inventory, test_inventory_2, auth_headers_user, seed_roles):
+        """Test walking shop inventory one row at a time with X-Next-Cursor"""
+        url = f"/api/inventory/shop/{test_shop.id}"
+
+        first = await client.get(url, params={"sort_by": "quantity", "limit": 1}, headers=auth_headers_user)
+        assert first.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in first.json()] == [test_inventory_2.id]
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = await client.get(
+            url, params={"sort_by": "quantity", "limit": 1, "cursor": cursor}, headers=auth_headers_user
+        )
+        assert second.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in second.json()] == [test_inventory.id]
+        assert "X-Next-Cursor" not in second.headers
+
+    async def test_cursor_from_other_sort_is_rejected(self, client, test_shop, test_inventory, test_inventory_2, auth_headers_user, seed_roles):
+        """Test a cursor can't be replayed against a different sort order"""
+        url = f"/api/inventory/shop/{test_shop.id}"
+
+        first = await client.get(url, params={"sort_by": "quantity", "limit": 1}, headers=auth_headers_user)
+        cursor = first.headers["X-Next-Cursor"]
+
+        response = await client.get(
+            url, params={"sort_by": "product_id", "limit": 1, "cursor": cursor}, headers=auth_headers_user
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = await client.get(url, params={"cursor": "not-a-cursor"}, headers=auth_headers_user)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+class TestStockLedger:
+    """Test the stock movement ledger"""
+
+    async def create_inventory(self, client, shop_id, product_id, headers, quantity):
+        response = await client.post(
+            "/api/inventory/",
+            headers=headers,
+            json={"product_id": product_id, "shop_id": shop_id, "quantity": quantity}
+        )
+        return response.json()["id"]
+
+    async def test_adjustments_are_recorded_with_reason(self, client, test_shop, test_product, auth_headers_manager, seed_roles):
+        """Test each quantity change appends a movement and stock-at sums them"""
+        inventory_id = await self.create_inventory(client, test_shop.id, test_product.id, auth_headers_manager, 20)
+        await client.post(f"/api/inventory/{inventory_id}/adjust", headers=auth_headers_manager, json={"adjustment": 5, "reason": "Delivery"})
+        await client.post(f"/api/inventory/{inventory_id}/adjust", headers=auth_headers_manager, json={"adjustment": -3, "reason": "Damaged"})
+
+        response = await client.get(
+            f"/api/inventory/movements?shop_id={test_shop.id}&product_id={test_product.id}",
+            headers=auth_headers_manager
+        )
+        assert response.status_code == status.HTTP_200_OK
+        movements = response.json()
+        assert [(m["reason"], m["quantity_change"], m["note"]) for m in movements] == [
+            ("adjustment", -3, "Damaged"),
+            ("adjustment", 5, "Delivery"),
+            ("initial", 20, None),
+        ]
+
+        params = f"shop_id={test_shop.id}&product_id={test_product.id}"
+        response = await client.get(f"/api/inventory/stock-at?{params}&at=2000-01-01T00:00:00", headers=auth_headers_manager)
+        assert response.json()["quantity"] == 0
+        response = await client.get(f"/api/inventory/stock-at?{params}&at=2999-01-01T00:00:00", headers=auth_headers_manager)
+        assert response.json()["quantity"] == 22
+
+    async def test_snapshot_and_rebuild(self, client, db_session, test_shop, test_product, auth_headers_manager, seed_roles):
+        """Test snapshot + later movements give the quantity, and rebuild restores a corrupted row"""
+        inventory_id = await self.create_inventory(client, test_shop.id, test_product.id, auth_headers_manager, 10)
+        await client.post(f"/api/inventory/{inventory_id}/adjust", headers=auth_headers_manager, json={"adjustment": 5})
+
+        written = await db_session.run_sync(lambda session: StockLedgerController.take_snapshots(session, settle_seconds=0))
+        assert written == 1
+        await client.post(f"/api/inventory/{inventory_id}/adjust", headers=auth_headers_manager, json={"adjustment": -4})
+
+        at = "2999-01-01T00:00:00"
+        response = await client.get(
+            f"/api/inventory/stock-at?shop_id={test_shop.id}&product_id={test_product.id}&at={at}",
+            headers=auth_headers_manager
+        )
+        assert response.json()["quantity"] == 11
+
+        await db_session.execute(update(Inventory).where(Inventory.id == inventory_id).values(quantity=999))
+        await db_session.commit()
+
+        corrected = await db_session.run_sync(lambda session: StockLedgerController.rebuild_inventory(session))
+        assert corrected == [inventory_id]
+        response = await client.get(f"/api/inventory/{inventory_id}", headers=auth_headers_manager)
+        assert response.json()["quantity"] == 11
+
+    async def test_rebuild_skips_rows_without_a_baseline(self, client, db_session, test_inventory, auth_headers_manager, seed_roles):
+        """Test rebuild leaves rows alone whose ledger has only deltas (no opening/initial entry)"""
+        await client.post(f"/api/inventory/{test_inventory.id}/adjust", headers=auth_headers_manager, json={"adjustment": -2})
+
+        corrected = await db_session.run_sync(lambda session: StockLedgerController.rebuild_inventory(session))
+        assert corrected == []
+        response = await client.get(f"/api/inventory/{test_inventory.id}", headers=auth_headers_manager)
+        assert response.json()["quantity"] == 98
+
+    async def test_correction_is_measured_against_current_stock(self, client, db_session, test_inventory, auth_headers_manager, seed_roles):
+        """Test an overwrite records its change from the row as stored, not a stale copy"""
+        # A sale elsewhere, behind the back of the already-loaded test_inventory
+        await db_session.execute(
+            update(Inventory)
+            .where(Inventory.id == test_inventory.id)
+            .values(quantity=Inventory.quantity - 10)
+            .execution_options(synchronize_session=False)
+        )
+        await db_session.commit()
+
+        await client.put(f"/api/inventory/{test_inventory.id}", headers=auth_headers_manager, json={"quantity": 120})
+
+        movements = (await client.get(f"/api/inventory/movements?shop_id={test_inventory.shop_id}", headers=auth_headers_manager)).json()
+        assert [(m["reason"], m["quantity_change"]) for m in movements] == [("correction", 30)]
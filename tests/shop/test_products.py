@@ -135,6 +135,22 @@ class TestCategoryUpdate:
         assert data["description"] == "Updated description"
 
 
+@pytest.mark.asyncio
+class TestCategoryDeletion:
+    """Test category deletion"""
+
+    async def test_delete_category_deletes_its_products(self, client, db_session, test_category, test_product, auth_headers_user, seed_roles):
+        """Test the category's products are deleted with it (not just uncategorised)"""
+        from src.shop.controllers import ProductController
+
+        await ProductController.delete_category(db_session, test_category.id)
+
+        response = await client.get(f"/api/products/{test_product.id}", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.get(f"/api/products/categories/{test_category.id}", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.asyncio
 class TestProductCreation:
     """Test product creation"""
@@ -240,6 +256,22 @@ class TestProductRetrieval:
         data = response.json()
         assert len(data) >= 1
     
+    async def test_search_products_ranked_prefix(self, client, test_category, test_product, auth_headers_user, seed_roles, db_session):
+        """Test word-prefix search ranks name matches above description-only matches"""
+        from src.shop.models import Product
+        db_session.add(Product(
+            name="Phone Case", slug="phone-case", sku="ACC-CASE-001", price=499,
+            description="Fits the Test phone", category_id=test_category.id
+        ))
+        await db_session.commit()
+
+        response = await client.get("/api/products/?search=tes", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+        assert [p["sku"] for p in response.json()] == ["TEST-PHONE-001", "ACC-CASE-001"]
+
+        response = await client.get("/api/products/?search=acc-case", headers=auth_headers_user)
+        assert [p["sku"] for p in response.json()] == ["ACC-CASE-001"]
+    
     async def test_get_product_by_id(self, client, test_product, auth_headers_user, seed_roles):
         """Test getting product by ID"""
         response = await client.get(
@@ -325,3 +357,422 @@ class TestProductDeletion:
         )
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+class TestProductLoadingProfiles:
+    """Test products only load the relationships their profile asks for"""
+
+    async def test_get_product_does_not_load_sales_history(self, db_session, test_product, test_inventory):
+        """Test the detail profile loads inventory and leaves sale_items unloaded"""
+        from sqlalchemy.exc import InvalidRequestError
+        from src.shop.controllers import ProductController
+
+        db_session.expunge_all()
+        product = await ProductController.get_product(db_session, test_product.id)
+
+        assert [inv.id for inv in product.inventory] == [test_inventory.id]
+        with pytest.raises(InvalidRequestError):
+            product.sale_items
+
+
+@pytest.mark.asyncio
+class TestAccessLog:
+    """Test the per-request access log record"""
+
+    async def test_access_log_reports_route_and_queries(self, client, test_product, auth_headers_user, seed_roles, monkeypatch):
+        """Test the record carries the route template and the request's DB statements"""
+        import json
+        import logging
+
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        access_logger = logging.getLogger("app.access")
+        access_logger.addHandler(handler)
+        monkeypatch.setattr("src.core.access_log.random.random", lambda: 0.0)
+        try:
+            response = await client.get(f"/api/products/{test_product.id}", headers=auth_headers_user)
+        finally:
+            access_logger.removeHandler(handler)
+
+        assert response.status_code == status.HTTP_200_OK
+        entry = json.loads(records[-1].getMessage())
+        assert entry["route"] == "/api/products/{product_id}"
+        assert entry["status"] == 200
+        assert entry["db_statements"] >= 1
+        assert entry["db_ms"] >= 0
+
+
+@pytest.mark.asyncio
+class TestReadReplicaRouting:
+    """Test read-only routes fall back to the primary after a write"""
+
+    async def test_write_makes_user_sticky(self, client, test_manager, auth_headers_manager, seed_roles):
+        """Test a successful write keeps that user on the primary, other users aren't affected"""
+        from httpx import AsyncClient, ASGITransport
+        from src.main import app
+        from src.core.replica import ReadAfterWriteMiddleware, ReadAfterWriteTracker
+
+        tracker = ReadAfterWriteTracker(ttl=60)
+        transport = ASGITransport(app=ReadAfterWriteMiddleware(app, tracker))
+        async with AsyncClient(transport=transport, base_url="http://test") as replica_client:
+            await replica_client.get("/api/products/", headers=auth_headers_manager)
+            assert not tracker.is_sticky(str(test_manager.id))
+
+            response = await replica_client.post(
+                "/api/products/categories",
+                headers=auth_headers_manager,
+                json={"name": "Tablets", "slug": "tablets"}
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        assert tracker.is_sticky(str(test_manager.id))
+        assert not tracker.is_sticky("0")
+
+    async def test_read_db_prefers_primary_for_sticky_requests(self, db_session, monkeypatch):
+        """Test get_read_db hands out the replica session unless the request is flagged"""
+        from starlette.requests import Request
+        from src.core import db as core_db
+        from tests.conftest import TestSessionLocal
+
+        monkeypatch.setattr(core_db, "ReadSessionLocal", TestSessionLocal)
+
+        sticky = Request({"type": "http", "state": {"read_primary": True}})
+        async for session in core_db.get_read_db(sticky, db_session):
+            assert session is db_session
+
+        fresh = Request({"type": "http", "state": {}})
+        async for session in core_db.get_read_db(fresh, db_session):
+            assert session is not db_session
+
+
+@pytest.mark.asyncio
+class TestCatalogCache:
+    """Test cached catalog reads"""
+
+    async def test_cached_product_keeps_stock_live_and_invalidates_on_update(self, client, db_session, test_product, test_inventory, auth_headers_user, auth_headers_manager, seed_roles):
+        """Test a cached product still shows current stock, and an API update is visible at once"""
+        response = await client.get(f"/api/products/{test_product.id}", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+
+        # Direct writes bypass invalidation: catalog fields stay cached, stock is read live
+        test_product.name = "Renamed Behind The Cache"
+        test_inventory.quantity = 7
+        await db_session.commit()
+
+        data = (await client.get(f"/api/products/{test_product.id}", headers=auth_headers_user)).json()
+        assert data["name"] == "Test Smartphone"
+        assert data["inventory"][0]["quantity"] == 7
+
+        await client.put(
+            f"/api/products/{test_product.id}",
+            headers=auth_headers_manager,
+            json={"name": "Updated Through API"}
+        )
+        data = (await client.get(f"/api/products/{test_product.id}", headers=auth_headers_user)).json()
+        assert data["name"] == "Updated Through API"
+
+        page = (await client.get("/api/products/", headers=auth_headers_user)).json()
+        assert page[0]["name"] == "Updated Through API"
+        assert page[0]["inventory"][0]["quantity"] == 7
+
+    async def test_replica_reads_fill_cache_from_primary(self, db_session, test_product, monkeypatch):
+        """Test a cache miss on a replica session loads the document from the primary"""
+        from src.core import db as core_db
+        from src.shop.controllers import CatalogController
+        from tests.conftest import TestSessionLocal, test_engine
+
+        opened = []
+
+        def primary_factory():
+            opened.append(True)
+            return TestSessionLocal()
+
+        monkeypatch.setattr(core_db, "read_engine", test_engine)
+        monkeypatch.setattr(core_db, "AsyncSessionLocal", primary_factory)
+
+        async with TestSessionLocal() as replica:
+            product = await CatalogController.get_product(replica, test_product.id)
+            assert product.name == test_product.name
+            assert len(opened) == 1
+
+            await CatalogController.get_product(replica, test_product.id)
+            await CatalogController.get_products_by_ids(replica, [test_product.id])
+            assert len(opened) == 2  # second read was a hit; checkout keys are separate
+
+
+@pytest.mark.asyncio
+class TestConditionalGet:
+    """Test ETag / If-None-Match on catalog reads"""
+
+    async def test_product_not_modified_until_stock_changes(self, client, db_session, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test a matching If-None-Match gets 304, and a stock change issues a new ETag"""
+        response = await client.get(f"/api/products/{test_product.id}", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["etag"]
+        assert "must-revalidate" in response.headers["cache-control"]
+
+        response = await client.get(
+            f"/api/products/{test_product.id}",
+            headers={**auth_headers_user, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+        test_inventory.quantity += 1
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/products/{test_product.id}",
+            headers={**auth_headers_user, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+
+    async def test_cached_body_keeps_the_etag_it_was_cached_under(self, client, db_session, test_product, auth_headers_user, auth_headers_manager, seed_roles):
+        """Test the ETag follows the cached document, not rows the cache hasn't seen yet"""
+        url = f"/api/products/{test_product.id}"
+        response = await client.get(url, headers=auth_headers_user)
+        etag = response.headers["etag"]
+
+        # A write this worker's cache versions don't reflect yet: the body stays
+        # the cached one, so the ETag must too
+        test_product.name = "Renamed Behind The Cache"
+        await db_session.commit()
+
+        response = await client.get(url, headers=auth_headers_user)
+        assert response.headers["etag"] == etag
+        assert response.json()["name"] == "Test Smartphone"
+
+        await client.put(url, headers=auth_headers_manager, json={"name": "Updated Through API"})
+        response = await client.get(url, headers={**auth_headers_user, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Updated Through API"
+        assert response.headers["etag"] != etag
+
+    async def test_category_not_modified_until_categories_change(self, client, test_category, auth_headers_user, auth_headers_manager, seed_roles):
+        """Test category ETags come from the catalog cache versions"""
+        url = f"/api/products/categories/{test_category.id}"
+        etag = (await client.get(url, headers=auth_headers_user)).headers["etag"]
+
+        response = await client.get(url, headers={**auth_headers_user, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        await client.put(url, headers=auth_headers_manager, json={"name": "Renamed"})
+        response = await client.get(url, headers={**auth_headers_user, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Renamed"
+
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.mark.asyncio
+class TestImageUpload:
+    """Test streamed product image uploads"""
+
+    @pytest.fixture(autouse=True)
+    def media_dir(self, tmp_path, monkeypatch):
+        from src.core import file_upload
+        monkeypatch.setattr(file_upload, "MEDIA_DIR", tmp_path)
+        return tmp_path
+
+    @pytest.fixture(autouse=True)
+    def sent_tasks(self, monkeypatch):
+        """Celery messages the API sends (no broker in tests)"""
+        from src.core.celery_app import celery
+        sent = []
+        monkeypatch.setattr(celery, "send_task", lambda name, args=None, **kwargs: sent.append((name, args)))
+        return sent
+
+    async def test_upload_uses_sniffed_extension(self, client, auth_headers_user, media_dir, seed_roles):
+        """Test the stored name takes its extension from the content, not the filename"""
+        response = await client.post(
+            "/api/products/upload-image",
+            headers=auth_headers_user,
+            files={"file": ("photo.jpg", PNG_BYTES, "image/jpeg")}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        url = response.json()["file_url"]
+        assert url.startswith("/media/objects/") and url.endswith(".png")
+        assert (media_dir / url.removeprefix("/media/")).read_bytes() == PNG_BYTES
+
+    async def test_upload_rejects_non_image(self, client, auth_headers_user, media_dir, seed_roles):
+        """Test a file that is not an image is rejected whatever its name"""
+        response = await client.post(
+            "/api/products/upload-image",
+            headers=auth_headers_user,
+            files={"file": ("photo.jpg", b"<?php echo 1; ?>", "image/jpeg")}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [path for path in media_dir.rglob("*") if path.is_file()] == []
+
+    async def test_upload_over_limit_is_aborted(self, client, auth_headers_user, media_dir, monkeypatch, seed_roles):
+        """Test an oversized upload gets 413 and leaves no partial file behind"""
+        from src.core import file_upload
+        monkeypatch.setattr(file_upload, "CHUNK_SIZE", 16)
+        monkeypatch.setattr(file_upload, "MAX_FILE_SIZE", 32)
+
+        response = await client.post(
+            "/api/products/upload-image",
+            headers=auth_headers_user,
+            files={"file": ("big.png", PNG_BYTES, "image/png")}
+        )
+        assert response.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+        assert [path for path in media_dir.rglob("*") if path.is_file()] == []
+
+    async def test_identical_uploads_share_one_object(self, client, auth_headers_user, media_dir, seed_roles):
+        """Test the same bytes uploaded twice are stored once, and can be found by hash"""
+        first = (await client.post(
+            "/api/products/upload-image",
+            headers=auth_headers_user,
+            files={"file": ("front.png", PNG_BYTES, "image/png")}
+        )).json()
+        second = (await client.post(
+            "/api/products/upload-image",
+            headers=auth_headers_user,
+            files={"file": ("copy.png", PNG_BYTES, "image/png")}
+        )).json()
+        assert second["file_url"] == first["file_url"]
+        assert len([path for path in media_dir.rglob("*") if path.is_file()]) == 1
+
+        response = await client.get(f"/api/products/media/{first['sha256']}", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["file_url"] == first["file_url"]
+
+    async def test_unreferenced_media_is_collected(self, client, db_session, test_product, auth_headers_user, auth_headers_manager, media_dir, seed_roles):
+        """Test products keep their image alive, and the collector deletes it once none does"""
+        from src.shop.controllers import MediaController
+
+        product_id = test_product.id
+        uploaded = (await client.post(
+            "/api/products/upload-image",
+            headers=auth_headers_user,
+            files={"file": ("front.png", PNG_BYTES, "image/png")}
+        )).json()
+        stored = media_dir / uploaded["file_url"].removeprefix("/media/")
+
+        response = await client.put(
+            f"/api/products/{product_id}",
+            headers=auth_headers_manager,
+            json={"image_url": uploaded["file_url"]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert await db_session.run_sync(lambda session: MediaController.collect_garbage(session, grace_seconds=-60)) == 0
+        assert stored.exists()
+
+        await client.put(f"/api/products/{product_id}", headers=auth_headers_manager, json={"image_url": None})
+        assert await db_session.run_sync(lambda session: MediaController.collect_garbage(session, grace_seconds=-60)) == 1
+        assert not stored.exists()
+
+    async def test_reupload_restores_collected_or_missing_file(self, client, db_session, auth_headers_user, media_dir, seed_roles):
+        """Test the same bytes uploaded after collection, or onto a row whose file is gone, are stored again"""
+        from src.shop.controllers import MediaController
+
+        async def upload():
+            return (await client.post(
+                "/api/products/upload-image",
+                headers=auth_headers_user,
+                files={"file": ("front.png", PNG_BYTES, "image/png")}
+            )).json()
+
+        stored = media_dir / (await upload())["file_url"].removeprefix("/media/")
+        assert await db_session.run_sync(lambda session: MediaController.collect_garbage(session, grace_seconds=-60)) == 1
+
+        await upload()
+        assert stored.read_bytes() == PNG_BYTES
+
+        stored.unlink()
+        await upload()
+        assert stored.read_bytes() == PNG_BYTES
+
+    async def test_upload_queues_variants_for_product_response(self, client, test_product, auth_headers_user, auth_headers_manager, sent_tasks, seed_roles):
+        """Test an upload queues WebP variant generation and products expose the variant URLs"""
+        product_id = test_product.id
+        uploaded = (await client.post(
+            "/api/products/upload-image",
+            headers=auth_headers_user,
+            files={"file": ("front.png", PNG_BYTES, "image/png")}
+        )).json()
+        stem = uploaded["file_url"].removesuffix(".png")
+        assert uploaded["variants"]["thumbnail"] == f"{stem}_thumbnail.webp"
+        assert sent_tasks == [("shop.generate_image_variants", [uploaded["file_url"].removeprefix("/media/")])]
+
+        response = await client.put(
+            f"/api/products/{product_id}",
+            headers=auth_headers_manager,
+            json={"image_url": uploaded["file_url"]}
+        )
+        assert response.json()["image_variants"] == uploaded["variants"]
+
+        response = await client.get(f"/api/products/{product_id}", headers=auth_headers_user)
+        assert response.json()["image_variants"]["large"] == f"{stem}_large.webp"
+
+    async def test_generate_variants_writes_bounded_webp(self, media_dir):
+        """Test the worker writes each variant within its size, without upscaling"""
+        Image = pytest.importorskip("PIL.Image")
+        from src.core.file_upload import object_path, variant_path
+        from src.core.image_variants import generate_variants
+
+        relative_path = object_path("ab" * 32, ".png")
+        (media_dir / relative_path).parent.mkdir(parents=True)
+        Image.new("RGB", (1000, 500), "red").save(media_dir / relative_path)
+
+        assert len(generate_variants(relative_path)) == 3
+        assert generate_variants(relative_path) == []
+        with Image.open(media_dir / variant_path(relative_path, "thumbnail")) as thumbnail:
+            assert thumbnail.format == "WEBP" and thumbnail.size == (160, 80)
+        with Image.open(media_dir / variant_path(relative_path, "large")) as large:
+            assert large.size == (1000, 500)
+
+
+@pytest.mark.asyncio
+class TestMediaServing:
+    """Test /media caching headers, ranges and offload"""
+
+    SHA = "ab" * 32
+
+    @pytest.fixture(autouse=True)
+    def media_files(self, tmp_path, monkeypatch):
+        from src.main import app
+        media_files = next(route.app for route in app.routes if getattr(route, "name", None) == "media")
+        monkeypatch.setattr(media_files, "directory", str(tmp_path))
+        monkeypatch.setattr(media_files, "all_directories", [str(tmp_path)])
+        (tmp_path / "objects" / "ab" / "ab").mkdir(parents=True)
+        (tmp_path / "objects" / "ab" / "ab" / f"{self.SHA}.png").write_bytes(PNG_BYTES)
+        return media_files
+
+    async def test_stored_object_is_immutable_with_ranges(self, client):
+        """Test content-addressed files are immutable, hash-tagged and range-capable"""
+        url = f"/media/objects/ab/ab/{self.SHA}.png"
+        response = await client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert response.headers["etag"] == f'"{self.SHA}"'
+
+        response = await client.get(url, headers={"If-None-Match": f'"{self.SHA}"'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = await client.get(url, headers={"Range": "bytes=0-7"})
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.content == PNG_BYTES[:8]
+
+    async def test_missing_variant_falls_back_to_original(self, client):
+        """Test a variant the worker hasn't written yet serves the original, uncached"""
+        response = await client.get(f"/media/objects/ab/ab/{self.SHA}_thumbnail.webp")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == PNG_BYTES
+        assert response.headers["cache-control"] == "no-cache"
+
+        response = await client.get(f"/media/objects/ab/ab/.upload-{self.SHA}.part")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_accel_redirect_hands_file_to_proxy(self, client, media_files, monkeypatch):
+        """Test X-Accel-Redirect mode sends headers only"""
+        monkeypatch.setattr(media_files, "accel", "x-accel")
+        response = await client.get(f"/media/objects/ab/ab/{self.SHA}.png")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["x-accel-redirect"] == f"/protected-media/objects/ab/ab/{self.SHA}.png"
+        assert response.headers["content-type"] == "image/png"
+        assert response.content == b""
@@ -0,0 +1,99 @@
+import pytest
+from fastapi import status
+
+from src.core.dates import business_today
+from src.shop.controllers import ReportController
+
+
+@pytest.fixture
+def sent_tasks(monkeypatch):
+    """Celery messages the API sends (no broker in tests)"""
+    from src.core.celery_app import celery
+
+    class Sent:
+        id = "job-1"
+
+    sent = []
+
+    def send_task(name, args=None, kwargs=None, **options):
+        sent.append((name, kwargs))
+        return Sent()
+
+    monkeypatch.setattr(celery, "send_task", send_task)
+    return sent
+
+
+@pytest.mark.asyncio
+class TestReportJobs:
+    """Test queueing report jobs"""
+
+    async def test_sales_summary_is_queued(self, client, auth_headers_manager, sent_tasks, seed_roles):
+        """Test the API queues the report and answers 202 with the job id"""
+        response = await client.post(
+            "/api/reports/sales-summary",
+            headers=auth_headers_manager,
+            json={"start_date": "2026-10-01", "end_date": "2026-10-16", "shop_id": 1}
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json() == {"task_id": "job-1", "status": "PENDING", "result": None}
+        assert sent_tasks == [
+            ("reports.sales_summary", {"start_date": "2026-10-01", "end_date": "2026-10-16", "shop_id": 1})
+        ]
+
+    async def test_sales_summary_rejects_bad_range(self, client, auth_headers_manager, sent_tasks, seed_roles):
+        """Test an inverted date range is rejected before anything is queued"""
+        response = await client.post(
+            "/api/reports/sales-summary",
+            headers=auth_headers_manager,
+            json={"start_date": "2026-10-16", "end_date": "2026-10-01"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert sent_tasks == []
+
+    async def test_reports_require_manager(self, client, auth_headers_user, sent_tasks, seed_roles):
+        """Test staff cannot queue reports"""
+        response = await client.post("/api/reports/low-stock", headers=auth_headers_user, json={})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert sent_tasks == []
+
+
+@pytest.mark.asyncio
+class TestReportBuilders:
+    """Test the reports the worker builds"""
+
+    async def test_sales_summary_totals_by_shop_and_payment_method(self, client, db_session, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test one day's sales are totalled per shop and per payment method"""
+        shop_id = test_shop.id
+        for payment_method in ("cash", "card"):
+            response = await client.post(
+                "/api/sales/",
+                headers=auth_headers_user,
+                json={
+                    "shop_id": shop_id,
+                    "payment_method": payment_method,
+                    "items": [{"product_id": test_product.id, "quantity": 1, "unit_price": "100.00", "discount": "0.00"}]
+                }
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        today = business_today()
+        report = await db_session.run_sync(lambda session: ReportController.sales_summary(session, today, today))
+        assert report["total_sales_count"] == 2
+        assert sum(day["sales_count"] for day in report["days"]) == 2
+        by_method = {
+            method["payment_method"]: method["sales_count"]
+            for day in report["days"] for method in day["by_payment_method"]
+        }
+        assert by_method == {"cash": 1, "card": 1}
+        assert {shop["shop_id"] for day in report["days"] for shop in day["by_shop"]} == {shop_id}
+
+    async def test_low_stock_uses_each_rows_minimum(self, db_session, test_shop, test_inventory, test_inventory_2, seed_roles):
+        """Test rows at or below their own min_stock_level are reported"""
+        test_inventory_2.quantity = 5
+        await db_session.commit()
+        inventory_id = test_inventory_2.id
+
+        report = await db_session.run_sync(lambda session: ReportController.low_stock(session))
+        assert report["count"] == 1
+        assert report["items"][0]["inventory_id"] == inventory_id
+        assert report["items"][0]["shop_name"] == "Test Shop"
@@ -0,0 +1,111 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import status
+from sqlalchemy import update
+
+from src.shop.models import StockReservation
+from src.shop.controllers import ReservationController
+
+
+async def get_stock(client, inventory_id, headers):
+    response = await client.get(f"/api/inventory/{inventory_id}", headers=headers)
+    return response.json()
+
+
+@pytest.mark.asyncio
+class TestReservationHolds:
+    """Test stock reservation holds"""
+
+    async def test_hold_converts_into_sale(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test held stock is unavailable to others but sellable with the hold token"""
+        response = await client.post(
+            "/api/reservations/",
+            headers=auth_headers_user,
+            json={"shop_id": test_shop.id, "items": [{"product_id": test_product.id, "quantity": 100}]}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        hold_token = response.json()["hold_token"]
+        assert (await get_stock(client, test_inventory.id, auth_headers_user))["reserved_quantity"] == 100
+
+        sale = {
+            "shop_id": test_shop.id,
+            "payment_method": "cash",
+            "items": [{"product_id": test_product.id, "quantity": 60, "unit_price": "27999.00", "discount": "0.00"}]
+        }
+        response = await client.post("/api/sales/", headers=auth_headers_user, json=sale)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = await client.post("/api/sales/", headers=auth_headers_user, json={**sale, "hold_token": hold_token})
+        assert response.status_code == status.HTTP_201_CREATED
+
+        # The unbought 40 are released along with the converted 60
+        stock = await get_stock(client, test_inventory.id, auth_headers_user)
+        assert stock["quantity"] == 40
+        assert stock["reserved_quantity"] == 0
+
+        hold = (await client.get(f"/api/reservations/{hold_token}", headers=auth_headers_user)).json()
+        assert hold["status"] == "converted"
+
+        response = await client.delete(f"/api/reservations/{hold_token}", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_hold_is_all_or_nothing(self, client, test_shop, test_product, test_product_2, test_inventory, test_inventory_2, auth_headers_user, seed_roles):
+        """Test a basket with one short line reserves nothing"""
+        inventory_ids = (test_inventory.id, test_inventory_2.id)  # the failed request rolls the session back
+        response = await client.post(
+            "/api/reservations/",
+            headers=auth_headers_user,
+            json={
+                "shop_id": test_shop.id,
+                "items": [
+                    {"product_id": test_product.id, "quantity": 10},
+                    {"product_id": test_product_2.id, "quantity": 46}
+                ]
+            }
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert (await get_stock(client, inventory_ids[0], auth_headers_user))["reserved_quantity"] == 0
+        assert (await get_stock(client, inventory_ids[1], auth_headers_user))["reserved_quantity"] == 5
+
+    async def test_release_hold(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test releasing a hold gives the stock back"""
+        response = await client.post(
+            "/api/reservations/",
+            headers=auth_headers_user,
+            json={"shop_id": test_shop.id, "items": [{"product_id": test_product.id, "quantity": 3}]}
+        )
+        hold_token = response.json()["hold_token"]
+
+        response = await client.delete(f"/api/reservations/{hold_token}", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert (await get_stock(client, test_inventory.id, auth_headers_user))["reserved_quantity"] == 0
+
+    async def test_sweeper_expires_stale_holds_in_batches(self, client, db_session, test_shop, test_product, test_product_2, test_inventory, test_inventory_2, auth_headers_user, seed_roles):
+        """Test expired holds are given back, one batch per transaction"""
+        response = await client.post(
+            "/api/reservations/",
+            headers=auth_headers_user,
+            json={
+                "shop_id": test_shop.id,
+                "items": [
+                    {"product_id": test_product.id, "quantity": 7},
+                    {"product_id": test_product_2.id, "quantity": 4}
+                ]
+            }
+        )
+        hold_token = response.json()["hold_token"]
+
+        await db_session.execute(
+            update(StockReservation)
+            .where(StockReservation.hold_token == hold_token)
+            .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        await db_session.commit()
+
+        expired = await db_session.run_sync(lambda session: ReservationController.expire_stale(session, batch_size=1))
+        assert expired == 2
+
+        assert (await get_stock(client, test_inventory.id, auth_headers_user))["reserved_quantity"] == 0
+        assert (await get_stock(client, test_inventory_2.id, auth_headers_user))["reserved_quantity"] == 5
+        hold = (await client.get(f"/api/reservations/{hold_token}", headers=auth_headers_user)).json()
+        assert hold["status"] == "expired"
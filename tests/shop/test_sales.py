@@ -84,7 +84,67 @@ class TestSaleCreation:
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "insufficient stock" in response.json()["detail"].lower()
-    
+
+    async def test_create_sale_duplicate_lines_insufficient_stock(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test that repeated lines for one product are checked against stock together"""
+        line = {"product_id": test_product.id, "quantity": 60, "unit_price": "27999.00", "discount": "0.00"}
+        response = await client.post(
+            "/api/sales/",
+            headers=auth_headers_user,
+            json={
+                "shop_id": test_shop.id,
+                "payment_method": "cash",
+                "items": [line, line]  # 120 in total, only 100 in stock
+            }
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "insufficient stock" in response.json()["detail"].lower()
+
+    async def test_create_sale_decrements_inventory(self, client, test_shop, test_product, test_product_2, test_inventory, test_inventory_2, auth_headers_user, seed_roles):
+        """Test that every basket line decrements its inventory row"""
+        response = await client.post(
+            "/api/sales/",
+            headers=auth_headers_user,
+            json={
+                "shop_id": test_shop.id,
+                "payment_method": "cash",
+                "items": [
+                    {"product_id": test_product.id, "quantity": 2, "unit_price": "27999.00", "discount": "0.00"},
+                    {"product_id": test_product_2.id, "quantity": 3, "unit_price": "54999.00", "discount": "0.00"},
+                    {"product_id": test_product.id, "quantity": 1, "unit_price": "27999.00", "discount": "0.00"}
+                ]
+            }
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.json()["items"]) == 3
+
+        invoice_number = response.json()["invoice_number"]
+        assert invoice_number.startswith("INV-") and invoice_number.endswith("-000001")
+
+        inventory_1 = await client.get(f"/api/inventory/{test_inventory.id}", headers=auth_headers_user)
+        inventory_2 = await client.get(f"/api/inventory/{test_inventory_2.id}", headers=auth_headers_user)
+        assert inventory_1.json()["quantity"] == 97
+        assert inventory_2.json()["quantity"] == 47
+
+    async def test_invoice_numbers_are_sequential(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test that each sale gets the next number from today's counter"""
+        invoice_numbers = []
+        for _ in range(3):
+            response = await client.post(
+                "/api/sales/",
+                headers=auth_headers_user,
+                json={
+                    "shop_id": test_shop.id,
+                    "payment_method": "cash",
+                    "items": [{"product_id": test_product.id, "quantity": 1, "unit_price": "27999.00", "discount": "0.00"}]
+                }
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            invoice_numbers.append(response.json()["invoice_number"])
+
+        assert [number[-6:] for number in invoice_numbers] == ["000001", "000002", "000003"]
+
     async def test_create_sale_with_customer(self, client, test_shop, test_product, test_inventory, test_user, auth_headers_user, seed_roles, db_session):
         """Test creating sale with customer"""
         # Create customer profile
@@ -203,6 +263,93 @@ class TestSaleRetrieval:
         data = response.json()
         assert data["id"] == sale_id
 
+    async def test_sales_list_matches_detail_shape(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test the fast list path renders sales exactly like the validated detail response"""
+        create_response = await client.post(
+            "/api/sales/",
+            headers=auth_headers_user,
+            json={
+                "shop_id": test_shop.id,
+                "payment_method": "cash",
+                "items": [{"product_id": test_product.id, "quantity": 2, "unit_price": "27999.00", "discount": "10.50"}]
+            }
+        )
+        sale_id = create_response.json()["id"]
+
+        listed = (await client.get("/api/sales/", headers=auth_headers_user)).json()
+        detail = (await client.get(f"/api/sales/{sale_id}", headers=auth_headers_user)).json()
+
+        assert [sale for sale in listed if sale["id"] == sale_id] == [detail]
+        assert isinstance(detail["total_amount"], str)
+        assert detail["payment_method"] == "cash"
+
+    async def test_sales_date_filters_cover_whole_days(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test end_date includes sales made later on that day, and today's summary sees them"""
+        from datetime import timedelta
+        from src.core.dates import business_today
+
+        await client.post(
+            "/api/sales/",
+            headers=auth_headers_user,
+            json={
+                "shop_id": test_shop.id,
+                "payment_method": "cash",
+                "items": [{"product_id": test_product.id, "quantity": 1, "unit_price": "27999.00", "discount": "0.00"}]
+            }
+        )
+        today = business_today()
+
+        response = await client.get(
+            "/api/sales/",
+            params={"start_date": today.isoformat(), "end_date": today.isoformat()},
+            headers=auth_headers_user
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 1
+
+        response = await client.get(
+            "/api/sales/",
+            params={"end_date": (today - timedelta(days=1)).isoformat()},
+            headers=auth_headers_user
+        )
+        assert response.json() == []
+
+        response = await client.get("/api/sales/today", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total_sales_count"] == 1
+
+    async def test_todays_sales_breakdowns(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test today's summary groups totals by payment method and shop, and pages sales on request"""
+        for payment_method in ("cash", "card"):
+            await client.post(
+                "/api/sales/",
+                headers=auth_headers_user,
+                json={
+                    "shop_id": test_shop.id,
+                    "payment_method": payment_method,
+                    "items": [{"product_id": test_product.id, "quantity": 1, "unit_price": "27999.00", "discount": "0.00"}]
+                }
+            )
+
+        response = await client.get("/api/sales/today", headers=auth_headers_user)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total_sales_count"] == 2
+        assert data["sales"] is None
+        methods = {row["payment_method"]: row["sales_count"] for row in data["by_payment_method"]}
+        assert methods == {"cash": 1, "card": 1}
+        assert data["by_shop"] == [
+            {"shop_id": test_shop.id, "sales_count": 2, "total_amount": data["total_amount"]}
+        ]
+
+        response = await client.get(
+            "/api/sales/today",
+            params={"include_sales": "true", "limit": 1},
+            headers=auth_headers_user
+        )
+        assert len(response.json()["sales"]) == 1
+        assert "X-Next-Cursor" in response.headers
+
 
 @pytest.mark.asyncio
 class TestSaleCancellation:
@@ -402,3 +549,37 @@ class TestReturns:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert isinstance(data, list)
+
+
+@pytest.mark.asyncio
+class TestOperationalEndpoints:
+    """Test /metrics and /health"""
+
+    async def test_metrics_include_checkout_histogram(self, client, test_shop, test_product, test_inventory, auth_headers_user, seed_roles):
+        """Test a sale is counted in the checkout histogram"""
+        await client.post(
+            "/api/sales/",
+            headers=auth_headers_user,
+            json={
+                "shop_id": test_shop.id,
+                "payment_method": "cash",
+                "items": [{"product_id": test_product.id, "quantity": 1, "unit_price": "27999.00", "discount": "0.00"}]
+            }
+        )
+
+        response = await client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'shop_checkout_seconds_count{outcome="ok"}' in response.text
+        assert "db_pool_checkouts_total" in response.text
+
+    async def test_health_reports_pool_stats(self, client):
+        """Test /health reports the pool sized from settings"""
+        from src.core.config import settings
+
+        response = await client.get("/health")
+        assert response.status_code == status.HTTP_200_OK
+        pool = response.json()["db_pool"]
+        assert pool["pool_size"] == settings.DB_POOL_SIZE
+        assert pool["max_overflow"] == settings.DB_MAX_OVERFLOW
+        assert pool["checked_out"] >= 0